@@ -0,0 +1,226 @@
+"""
+Benchmarks for scryfall-py, run against a mock Scryfall so results are reproducible.
+
+Usage:
+    python benchmarks/run.py [--output results.json] [--compare baseline.json] [--only NAME ...]
+
+Every benchmark reports a few metrics. Results are printed and can be written as JSON, then compared to the
+results of another release with `--compare`.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scryfall import Scryfall  # noqa: E402
+from scryfall.client.cache import ResponseCache  # noqa: E402
+from scryfall.client.ratelimit import TokenBucket  # noqa: E402
+from scryfall.const import __version__  # noqa: E402
+from scryfall.local import CardCorpus  # noqa: E402
+from scryfall.models.api import APIList  # noqa: E402
+from scryfall.models.cards import Card  # noqa: E402
+from scryfall.testing import MockScryfall, make_cards  # noqa: E402
+
+TEMPLATE = json.loads((ROOT / "tests" / "data" / "card.json").read_text())
+
+Metrics = dict[str, float]
+BENCHMARKS: dict[str, Callable[[argparse.Namespace], Awaitable[Metrics]]] = {}
+
+
+def benchmark(
+    func: Callable[[argparse.Namespace], Awaitable[Metrics]],
+) -> Callable[[argparse.Namespace], Awaitable[Metrics]]:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    """Median seconds per call"""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+async def throughput(args: argparse.Namespace, **faults: Any) -> Metrics:
+    cards = make_cards(TEMPLATE, args.requests)
+    transport = MockScryfall(cards, latency=(0.02, 0.08), seed=0, **faults)
+    client = Scryfall(transport=transport, rate_limiter=TokenBucket(rate=args.rate, burst=1))
+    start = time.perf_counter()
+    results = [r async for r in client.map(client.get_card_by_id, [card["id"] for card in cards])]
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return {
+        "requests_per_second": len(results) / elapsed,
+        "rate_limit_utilization": len(results) / elapsed / args.rate,
+        "failed": sum(not r.ok for r in results),
+        "responses_429": transport.statuses[429],
+        "responses_5xx": transport.statuses[503],
+    }
+
+
+@benchmark
+async def request_throughput(args: argparse.Namespace) -> Metrics:
+    """Requests per second through the rate limiter against a server with 20-80ms of latency"""
+    return await throughput(args)
+
+
+@benchmark
+async def request_throughput_faults(args: argparse.Namespace) -> Metrics:
+    """Like `request_throughput`, with 2% of requests answered with a 429 and 2% with a 503"""
+    return await throughput(args, rate_limit_rate=0.02, error_rate=0.02, retry_after=0.5)
+
+
+@benchmark
+async def page_parse(args: argparse.Namespace) -> Metrics:
+    """Time to decode and build a page of 175 cards in every model mode"""
+    content = json.dumps({"object": "list", "has_more": False, "data": make_cards(TEMPLATE, 175)}).encode()
+    client = Scryfall()
+    metrics = {"decode_ms": timed(lambda: client.json_decoder.loads(content), args.repeat) * 1000}
+    for mode in ("validated", "lazy", "raw"):
+        client.model_mode = mode  # type: ignore
+        seconds = timed(lambda: client._build(APIList[Card], client.json_decoder.loads(content)), args.repeat)
+        metrics[f"{mode}_ms"] = seconds * 1000
+    return metrics
+
+
+def held_bytes(build: Callable[..., Any], *args: Any) -> tuple[Any, int]:
+    """What `build` returns, and the memory it still holds"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(*args)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def build_corpus(cards: list[dict[str, Any]]) -> CardCorpus:
+    corpus = CardCorpus()
+    corpus.extend(cards)
+    return corpus
+
+
+@benchmark
+async def card_memory(args: argparse.Namespace) -> Metrics:
+    """
+    Memory held per card in every model mode, on top of its raw data, and in a `CardCorpus`.
+
+    Cards have their own IDs, prices and URLs, like in bulk data, so values that differ between real cards aren't
+    shared. Copies sharing every value but their ID and name are also stored in a corpus, to show how much sharing
+    matters to it.
+    """
+    cards = make_cards(TEMPLATE, 1000, vary=True)
+    metrics = {}
+    for mode in ("validated", "lazy", "raw"):
+        client = Scryfall(model_mode=mode)  # type: ignore
+        data = json.loads(json.dumps(cards))
+        built, held = held_bytes(lambda client, data: [client._build(Card, card) for card in data], client, data)
+        metrics[f"{mode}_bytes_per_card"] = held / len(built)
+    for name, corpus_cards in (("corpus", cards), ("corpus_copies", make_cards(TEMPLATE, 1000))):
+        corpus, held = held_bytes(build_corpus, corpus_cards)
+        metrics[f"{name}_bytes_per_card"] = held / len(corpus)
+    return metrics
+
+
+@benchmark
+async def bulk_ingest(args: argparse.Namespace) -> Metrics:
+    """Cards per second streamed from a bulk data file, as raw data and as models"""
+    client = Scryfall(transport=MockScryfall(make_cards(TEMPLATE, args.bulk_cards)))
+    metrics = {}
+    for name, stream in (("raw", client.stream_bulk_data), ("cards", client.stream_bulk_cards)):
+        start = time.perf_counter()
+        count = 0
+        async for _ in stream("default_cards"):
+            count += 1
+        metrics[f"{name}_per_second"] = count / (time.perf_counter() - start)
+    await client.close()
+    return metrics
+
+
+@benchmark
+async def cache_hit(args: argparse.Namespace) -> Metrics:
+    """Time to get a card that is already cached"""
+    card = make_cards(TEMPLATE, 1)[0]
+    client = Scryfall(cache=ResponseCache(), transport=MockScryfall([card]))
+    await client.get_card_by_id(card["id"])
+    start = time.perf_counter()
+    for _ in range(args.repeat * 10):
+        await client.get_card_by_id(card["id"])
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return {"get_card_us": elapsed / (args.repeat * 10) * 1_000_000, "hit_ratio": client.cache.stats.hit_ratio}  # type: ignore
+
+
+@benchmark
+async def image_download(args: argparse.Namespace) -> Metrics:
+    """Images per second downloaded to disk, and checked again once they are there"""
+    cards = make_cards(TEMPLATE, args.requests)
+    client = Scryfall(transport=MockScryfall(cards), image_rate_limiter=TokenBucket(rate=1000, burst=100))
+    metrics = {}
+    with tempfile.TemporaryDirectory() as dest:
+        for name in ("download", "verify"):
+            start = time.perf_counter()
+            results = [r async for r in client.download_images(cards, dest)]
+            metrics[f"{name}_per_second"] = len(results) / (time.perf_counter() - start)
+    await client.close()
+    return metrics
+
+
+def compare(results: dict[str, Metrics], baseline: dict[str, Metrics]) -> None:
+    print("\nChange from baseline:")
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            previous = baseline.get(name, {}).get(metric)
+            if previous:
+                print(f"  {name}.{metric}: {previous:.4g} -> {value:.4g} ({(value / previous - 1) * 100:+.1f}%)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Compare the results to those in this JSON file")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, help="Only run these benchmarks")
+    parser.add_argument("--rate", type=float, default=50.0, help="Rate limit for the throughput benchmarks")
+    parser.add_argument("--requests", type=int, default=200, help="Requests made by the throughput benchmarks")
+    parser.add_argument("--bulk-cards", type=int, default=5000, help="Cards in the bulk data file")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetitions of timed operations")
+    args = parser.parse_args()
+
+    results: dict[str, Metrics] = {}
+    for name, func in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = metrics = await func(args)
+        print(f"{name}: " + ", ".join(f"{k}={v:.4g}" for k, v in metrics.items()))
+
+    if args.output:
+        report = {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text())["results"])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
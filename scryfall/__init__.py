@@ -1,3 +1,4 @@
 from scryfall.client import Scryfall
+from scryfall.client.sync import SyncScryfall
 
-__all__ = ["Scryfall"]
+__all__ = ["Scryfall", "SyncScryfall"]
@@ -1,66 +1,129 @@
-from typing import Any
+from typing import Any, Literal, TYPE_CHECKING, TypeVar
 
 from scryfall.const import __version__
 
 import asyncio
 import logging
+import math
+import os
 import time
+from importlib.util import find_spec
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
 
-from httpx import AsyncClient
+from httpx import URL, AsyncBaseTransport, AsyncClient, Limits, Response, Timeout
+from pydantic import BaseModel
 
 from scryfall.const import get_logger
-from scryfall.client.error import LibraryException, HTTPException, ScryfallError, Forbidden, NotFound
+from scryfall.client.batch import BatchResult, _run
+from scryfall.client.cache import CacheEntry, ResponseCache
+from scryfall.client.decoder import DecoderName, JSONDecoder, get_decoder
+from scryfall.client.images import DEFAULT_IMAGE_RATE, IMAGE_SIZES, ImageSize, download_image, image_files
+from scryfall.client.instrumentation import Instrumentation, RequestInfo
+from scryfall.client.error import (
+    CircuitOpenError,
+    LibraryException,
+    HTTPException,
+    ScryfallError,
+    Forbidden,
+    NotFound,
+)
+from scryfall.client.http.bulk import BulkRequests
 from scryfall.client.http.card import CardRequests
+from scryfall.client.http.catalog import CatalogRequests
 from scryfall.client.http.set import SetRequests
+from scryfall.client.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+from scryfall.client.retry import RetryPolicy
 from scryfall.client.route import Route
+from scryfall.models.api import CLASS_LOOKUP
+from scryfall.models.base import BaseAPIModel
+from scryfall.models.lazy import LazyModel
 
+if TYPE_CHECKING:
+    from scryfall.local.names import NameIndex
+    from scryfall.local.store import CardStore
 
-class GlobalLock:
-    def __init__(self) -> None:
-        self._lock = asyncio.Lock()
-        self.max_requests = 10
-        self._calls = self.max_requests
-        self._reset_time = 0
+T = TypeVar("T", bound=BaseModel)
+R = TypeVar("R")
 
-    def reset_calls(self) -> None:
-        """Resets the calls to the max amount."""
-        self._calls = self.max_requests
-        self._reset_time = time.perf_counter() + 1
+ModelMode = Literal["validated", "lazy", "raw"]
 
-    def set_reset_time(self, delta: float) -> None:
-        """
-        Sets the reset time to the current time + delta.
+DEFAULT_LIMITS = Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+"""Connection pool limits, keeping connections open long enough to be reused between bursts of requests"""
 
-        To be called if a 429 is received.
+DEFAULT_TIMEOUT = Timeout(connect=5.0, read=30.0, write=10.0, pool=10.0)
+"""Timeouts for every phase of a request, generous enough for slow bulk data chunks"""
 
-        Args:
-            delta: The time to wait before resetting the calls.
 
-        """
-        self._reset_time = time.perf_counter() + delta
-        self._calls = 0
-
-    async def wait(self) -> None:
-        """Throttles calls to prevent hitting the global rate limit."""
-        async with self._lock:
-            if self._reset_time <= time.perf_counter():
-                self.reset_calls()
-            elif self._calls <= 0:
-                await asyncio.sleep(self._reset_time - time.perf_counter())
-                self.reset_calls()
-        self._calls -= 1
-
-
-class Scryfall(CardRequests, SetRequests):
-    def __init__(self, logger: logging.Logger | None = None):
+class Scryfall(BulkRequests, CardRequests, CatalogRequests, SetRequests):
+    """
+    Async client for the Scryfall API.
+
+    Args:
+        logger: Logger to use. Defaults to the library's logger
+        store: Local card store to look cards up in before requesting them
+        cache: Cache for API responses
+        rate_limiter: Rate limiter shared by all requests. Defaults to a `TokenBucket` at 10 requests per second
+        model_mode: How API data is turned into models, `validated`, `lazy` or `raw`. Default `validated`
+        name_index: Local name index to autocomplete and resolve fuzzy names with
+        limits: Connection pool size and keep-alive settings. Default `DEFAULT_LIMITS`
+        timeout: Timeouts for every phase of a request, in seconds or as a `httpx.Timeout`. Default `DEFAULT_TIMEOUT`
+        http2: If true, multiplex requests over HTTP/2 connections. Requires the `http2` extra. Default False
+        transport: Transport to send requests with instead of the network, such as `httpx.MockTransport`
+        json_decoder: Decoder for responses, by name or as a `JSONDecoder`. Default `auto`, the fastest one installed
+        instrumentation: Receivers of events about every phase of requests, such as a `MetricsCollector`
+        retry_policy: When and how failed requests are retried. Defaults to a `RetryPolicy` with its defaults
+        image_rate_limiter: Rate limiter for image downloads. Defaults to a `TokenBucket` at 50 requests per second
+
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        store: "CardStore | None" = None,
+        cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        model_mode: ModelMode = "validated",
+        name_index: "NameIndex | None" = None,
+        limits: Limits = DEFAULT_LIMITS,
+        timeout: Timeout | float | None = DEFAULT_TIMEOUT,
+        http2: bool = False,
+        transport: AsyncBaseTransport | None = None,
+        json_decoder: DecoderName | JSONDecoder = "auto",
+        instrumentation: Iterable[Instrumentation] = (),
+        retry_policy: RetryPolicy | None = None,
+        image_rate_limiter: RateLimiter | None = None,
+    ):
         self.__headers = {
             "Content-Type": "application/json",
             "UserAgent": f"scryfall/{__version__}",
             "Accept": "application/json",
         }
+        if http2 and find_spec("h2") is None:
+            raise ImportError("HTTP/2 requires h2, install it with `pip install scryfall-py[http2]`")
         self.__client: AsyncClient = None  # type: ignore
-        self.global_lock: GlobalLock = GlobalLock()
-        self._max_attempts: int = 3
+        self.limits = limits
+        self.timeout = timeout
+        self.http2 = http2
+        self.transport = transport
+        self.json_decoder: JSONDecoder = (
+            json_decoder if isinstance(json_decoder, JSONDecoder) else get_decoder(json_decoder)
+        )
+        self.instrumentation: list[Instrumentation] = list(instrumentation)
+        self.rate_limiter: RateLimiter = rate_limiter if rate_limiter is not None else TokenBucket()
+        self.retry_policy: RetryPolicy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.image_rate_limiter: RateLimiter = (
+            image_rate_limiter if image_rate_limiter is not None else TokenBucket(rate=DEFAULT_IMAGE_RATE, burst=20)
+        )
+        self.store: "CardStore | None" = store
+        self.name_index: "NameIndex | None" = name_index
+        self.cache: ResponseCache | None = cache
+        self._in_flight: dict[str, asyncio.Future[bytes]] = {}
+        if model_mode not in ("validated", "lazy", "raw"):
+            raise ValueError(f"Invalid model mode: {model_mode}")
+        self.model_mode: ModelMode = model_mode
 
         self.logger: logging.Logger = logger  # type: ignore
         if self.logger is None:
@@ -78,35 +141,357 @@ class Scryfall(CardRequests, SetRequests):
             dict[str, Any]: Raw result
 
         """
+        if not self.instrumentation:
+            return await self._request(route, params, None, **kwargs)
+
+        info = RequestInfo(route, params)
+        self._emit("on_request_start", info)
+        error = None
+        try:
+            return await self._request(route, params, info, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._emit("on_request_end", info, time.perf_counter() - info.started_at, error)
+            info.ended = True
+
+    async def get_page(self, url: str, model: type[T]) -> T:
+        """
+        Get a page of a paginated list by its URL, such as the `next_page` of an `APIList`.
+
+        Args:
+            url: URL of the page
+            model: Model of the page, such as `APIList[Card]`
+
+        """
+        page = URL(url)
+        params = dict(page.params)
+        params.pop("format", None)
+        result = await self.request(Route("GET", page.path), params=params)
+        return self._build(model, result)
+
+    def _emit(self, event: str, *args: Any) -> None:
+        # A shared in-flight request may outlive the caller it reports to, which was cancelled
+        if args and isinstance(args[0], RequestInfo) and args[0].ended:
+            return
+        for instrumentation in self.instrumentation:
+            try:
+                getattr(instrumentation, event)(*args)
+            except Exception:
+                self.logger.exception(f"{type(instrumentation).__name__}.{event} failed")
+
+    async def _request(
+        self, route: Route, params: dict | None, info: RequestInfo | None, **kwargs: Any
+    ) -> dict[str, Any]:
         if params is not None:
             kwargs["params"] = params
-        if not self.__client:
-            self.__client = AsyncClient(headers=self.__headers)
-        for attempt in range(self._max_attempts):
-            await self.global_lock.wait()
 
-            response = await self.__client.request(route.method, route.url, **kwargs)  # type: ignore
+        key = route.key(params, kwargs.get("json"))
+        cache_key = None
+        entry = None
+        if self.cache is not None and self.cache.is_cacheable(route):
+            cache_key = self.cache.key(route, params)
+            entry = await self.cache.lookup(cache_key)
+            if entry is not None and entry.fresh:
+                if info is not None:
+                    info.cached = True
+                return self.json_decoder.loads(entry.content)
+            if entry is not None and self.cache.can_serve_stale(entry):
+                # Answer right away, and refresh the entry in the background
+                self._start_send(key, route, cache_key, entry, None, **kwargs)
+                return self._stale_response(entry, info)
+
+        if info is not None and route.coalesce and key in self._in_flight:
+            info.coalesced = True
+        task = self._start_send(key, route, cache_key, entry, info, **kwargs)
+        try:
+            content = await asyncio.shield(task)
+        except (HTTPException, CircuitOpenError, *self.retry_policy.transport_errors) as e:
+            if entry is None or not self.cache.can_fall_back(entry) or not self._is_outage(e):  # type: ignore
+                raise
+            self.logger.warning(f"{route.resolved_endpoint} Failed with {e!r}, using stale cached response")
+            return self._stale_response(entry, info)
+        return self.json_decoder.loads(content)
 
-            if response.status_code == 429:
-                self.logger.warning("Too many requests, waiting 5 seconds")
-                self.global_lock.set_reset_time(5)
+    def _start_send(
+        self,
+        key: str,
+        route: Route,
+        cache_key: str | None,
+        entry: CacheEntry | None,
+        info: RequestInfo | None,
+        **kwargs: Any,
+    ) -> "asyncio.Future[bytes]":
+        # Identical requests already in flight share a single response, unless each one gets a different answer
+        if not route.coalesce:
+            return asyncio.ensure_future(self._send(route, cache_key, entry, info, **kwargs))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(route, cache_key, entry, info, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish_in_flight(key, t))
+        return task
+
+    @staticmethod
+    def _is_outage(error: Exception) -> bool:
+        """If an error means Scryfall is unreachable or failing, rather than that the request is wrong"""
+        if isinstance(error, HTTPException):
+            return isinstance(error, ScryfallError) or error.status == 429
+        return True
+
+    def _stale_response(self, entry: CacheEntry, info: RequestInfo | None) -> dict[str, Any]:
+        if info is not None:
+            info.cached = info.stale = True
+        result = self.json_decoder.loads(entry.content)
+        result["_stale"] = True
+        return result
+
+    async def _send(
+        self,
+        route: Route,
+        cache_key: str | None = None,
+        entry: CacheEntry | None = None,
+        info: RequestInfo | None = None,
+        **kwargs: Any,
+    ) -> bytes:
+        client = self._get_client()
+        if entry is not None:
+            # Revalidate an expired entry instead of downloading it again
+            kwargs["headers"] = kwargs.get("headers", {}) | entry.validators
+        policy = self.retry_policy
+        policy.start()
+        rate_limited = errors = 0
+        while True:
+            policy.before_attempt()
+            start = time.perf_counter()
+            await self.rate_limiter.wait()
+
+            if info is not None:
+                info.attempts += 1
+                sent = time.perf_counter()
+                self._emit("on_rate_limit_wait", info, sent - start)
+            try:
+                response = await client.request(route.method, route.url, **kwargs)  # type: ignore
+            except policy.transport_errors as e:
+                if not policy.should_retry_error(errors):
+                    raise
+                errors += 1
+                await self._retry(route, info, "transport_error", policy.get_delay(errors), repr(e))
                 continue
+            if info is not None:
+                self._emit("on_response", info, response, time.perf_counter() - sent)
 
-            if response.status_code >= 500:
-                self.logger.warning(
-                    f"{route.resolved_endpoint} Received {response.status_code}... retrying in {1 + attempt * 2} seconds"
-                )
-                await asyncio.sleep(1 + attempt * 2)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if response.status_code == 429 and rate_limited < policy.rate_limit_retries:
+                policy.record_success()
+                rate_limited += 1
+                await self.rate_limiter.on_rate_limited(retry_after)
+                await self._retry(route, info, "rate_limited", retry_after, "429 Too Many Requests")
                 continue
 
-            result = response.json()
+            if response.status_code != 429:
+                await self.rate_limiter.on_success()
 
-            if not 300 > response.status_code >= 200:
-                await self._raise_exception(response, route, result)
+            if response.status_code in policy.retry_statuses:
+                if policy.should_retry_error(errors):
+                    errors += 1
+                    delay = policy.get_delay(errors, retry_after)
+                    await self._retry(route, info, "server_error", delay, str(response.status_code))
+                    continue
+            else:
+                policy.record_success()
+
+            return await self._handle_response(response, route, cache_key, entry)
+
+    async def _handle_response(
+        self, response: Response, route: Route, cache_key: str | None, entry: CacheEntry | None
+    ) -> bytes:
+        if response.status_code == 304 and entry is not None:
+            self.logger.debug(f"{route.resolved_endpoint} Not modified, using cached response")
+            await self.cache.revalidated(cache_key, route, entry)  # type: ignore
+            return entry.content
+
+        if not 300 > response.status_code >= 200:
+            await self._raise_exception(response, route, None)
+
+        if cache_key is not None:
+            await self.cache.set(  # type: ignore
+                cache_key,
+                route,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+        return response.content
+
+    async def _retry(
+        self, route: Route, info: RequestInfo | None, reason: str, delay: float | None, cause: str
+    ) -> None:
+        self.logger.warning(
+            f"{route.resolved_endpoint} Received {cause}... retrying in {'default' if delay is None else f'{delay:.2f}'} seconds"
+        )
+        if info is not None:
+            self._emit("on_retry", info, reason, delay)
+        # Rate limited requests wait for the rate limiter instead
+        if reason != "rate_limited" and delay:
+            await asyncio.sleep(delay)
+
+    def _finish_in_flight(self, key: str, task: "asyncio.Future[bytes]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception so it isn't logged as unhandled when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def map(
+        self,
+        func: Callable[..., Awaitable[R]],
+        *iterables: Iterable[Any],
+        concurrency: int | None = None,
+        ordered: bool = False,
+    ) -> AsyncIterator[BatchResult[R]]:
+        """
+        Call a request method for every item and yield the results as they complete, like `map`.
+
+        Calls are run with bounded concurrency, so they keep the rate limiter busy without piling up behind it, and
+        errors are captured per item instead of failing the whole batch.
+
+        Args:
+            func: Method to call, such as `get_card_by_id`
+            iterables: Arguments to call it with, one iterable per positional argument
+            concurrency: Max requests in flight at once. Defaults to enough to saturate the rate limiter
+            ordered: If true, yield results in the order of the items instead of as they complete. Default False
+
+        Returns:
+            AsyncIterator[BatchResult]: The result of every call, with the argument (or tuple of arguments) as `item`
+
+        """
+        calls = ((args[0] if len(args) == 1 else args, partial(func, *args)) for args in zip(*iterables, strict=True))
+        return _run(calls, concurrency or self._default_concurrency(), ordered)
+
+    def download_images(
+        self,
+        cards: Iterable[Any],
+        dest: str | os.PathLike[str],
+        size: ImageSize = "normal",
+        dedupe: bool = False,
+        verify: bool = True,
+        concurrency: int | None = None,
+        ordered: bool = False,
+        chunk_size: int = 65536,
+    ) -> AsyncIterator[BatchResult[bool]]:
+        """
+        Download the images of cards to a directory, and yield the results as they complete.
+
+        Images are downloaded concurrently through the shared connection pool, under `image_rate_limiter` instead of
+        the API's rate limiter, and streamed to disk. Cards with an image per face get one image per face. Images
+        already on disk are skipped if their size or ETag matches the one on the server.
+
+        Args:
+            cards: Cards, as models or raw API data
+            dest: Directory to save the images in, created if needed
+            size: Size of the images, `small`, `normal`, `large`, `png`, `art_crop` or `border_crop`. Default `normal`
+            dedupe: If true, download every illustration only once, named after its illustration ID. Default False
+            verify: If true, check images already on disk with a HEAD request, otherwise always skip them. Default True
+            concurrency: Max downloads in flight at once. Defaults to enough to saturate the image rate limiter
+            ordered: If true, yield results in the order of the images instead of as they complete. Default False
+            chunk_size: Size of the downloaded chunks in bytes. Default 64KiB
+
+        Returns:
+            AsyncIterator[BatchResult]: The result of every image, with the `ImageFile` as `item`, and True as `value`
+            if it was downloaded or False if it was skipped
+
+        """
+        if size not in IMAGE_SIZES:
+            raise ValueError(f"Invalid image size: {size}")
+        path = Path(dest)
+        path.mkdir(parents=True, exist_ok=True)
+        calls = (
+            (file, partial(download_image, self, file, verify, chunk_size))
+            for file in image_files(cards, size, path, dedupe)
+        )
+        return _run(calls, concurrency or self._default_concurrency(self.image_rate_limiter), ordered)
+
+    def _default_concurrency(self, rate_limiter: RateLimiter | None = None) -> int:
+        # Enough requests in flight to keep up with the rate limit with up to two seconds of latency each
+        concurrency = math.ceil(getattr(rate_limiter or self.rate_limiter, "rate", 10) * 2)
+        if self.limits.max_connections is not None:
+            concurrency = min(concurrency, self.limits.max_connections)
+        return max(1, concurrency)
+
+    def _build(self, model: type[T], data: dict[str, Any]) -> T:
+        """
+        Build a model from raw API data, according to `model_mode`.
 
+        `validated` fully validates the data, `lazy` returns a `LazyModel` that validates fields when they are
+        accessed, and `raw` skips validation altogether with `model_construct`.
+        """
+        stale = data.pop("_stale", False)
+        if not self.instrumentation:
+            result = self._build_model(model, data)
+        else:
+            start = time.perf_counter()
+            result = self._build_model(model, data)
+            self._emit("on_parse_complete", model, time.perf_counter() - start)
+        if stale:
+            for item in (result, *(getattr(result, "data", None) or ())):
+                if isinstance(item, BaseAPIModel | LazyModel):
+                    item._stale = True
+        return result
+
+    def _build_model(self, model: type[T], data: dict[str, Any]) -> T:
+        if self.model_mode == "validated":
+            if issubclass(model, BaseAPIModel):
+                data["_client"] = self
+            return model(**data)
+
+        if data.get("object") == "list":
+            # Validate the list itself, but build its items according to the model mode
+            items = [self._build_model(CLASS_LOOKUP[item["object"]], item) for item in data["data"]]
+            result = model(**(data | {"data": [], "_client": self}))
+            result.data = items  # type: ignore
             return result
 
-        raise LibraryException(f"Failed to get endpoint {route.endpoint}")
+        if self.model_mode == "lazy":
+            return LazyModel(model, data, self)  # type: ignore
+
+        result = model.model_construct(**data)
+        if isinstance(result, BaseAPIModel):
+            result._client = self
+        return result
+
+    @asynccontextmanager
+    async def stream(self, url: str, **kwargs: dict) -> AsyncIterator[Response]:
+        """
+        Stream a download through the shared HTTP client.
+
+        Meant for files hosted outside of the API, such as bulk data, which are not rate limited.
+
+        Args:
+            url: URL to download
+
+        Returns:
+            Response: The response, with the body not yet read
+
+        """
+        async with self._get_client().stream("GET", url, **kwargs) as response:  # type: ignore
+            if not 300 > response.status_code >= 200:
+                self.logger.error(f"GET::{url}: {response.status_code}")
+                raise LibraryException(f"Failed to download {url}: {response.status_code}")
+            yield response
+
+    def _get_client(self) -> AsyncClient:
+        if not self.__client:
+            self.__client = AsyncClient(
+                headers=self.__headers,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+                transport=self.transport,
+            )
+        return self.__client
 
     async def _raise_exception(self, response, route, result) -> None:
         self.logger.error(f"{route.method}::{route.url}: {response.status_code}")
@@ -0,0 +1,108 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 10
+"""Requests in flight at once when no concurrency is given"""
+
+_DONE = object()
+
+
+@dataclass
+class BatchResult(Generic[T]):
+    """The outcome of one call in a batch"""
+
+    index: int
+    """Position of the call in the batch"""
+
+    item: Any
+    """What the call was made with, the arguments for `Scryfall.map` or the call itself for `gather_requests`"""
+
+    value: T | None = None
+    """What the call returned, if it succeeded"""
+
+    error: Exception | None = None
+    """What the call raised, if it failed"""
+
+    @property
+    def ok(self) -> bool:
+        """True if the call succeeded"""
+        return self.error is None
+
+    def result(self) -> T:
+        """Get the value of the call, raising its error if it failed."""
+        if self.error is not None:
+            raise self.error
+        return self.value  # type: ignore
+
+
+async def _run(
+    calls: Iterable[tuple[Any, Callable[[], Awaitable[T]]]],
+    concurrency: int,
+    ordered: bool,
+) -> AsyncIterator[BatchResult[T]]:
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1")
+    numbered = enumerate(calls)
+    results: asyncio.Queue[Any] = asyncio.Queue()
+
+    async def worker() -> None:
+        try:
+            # Workers share the iterator, so calls are only created once there is room for them
+            for index, (item, call) in numbered:
+                try:
+                    result = BatchResult(index, item, await call())
+                except Exception as e:
+                    result = BatchResult(index, item, error=e)
+                results.put_nowait(result)
+        finally:
+            results.put_nowait(_DONE)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    running = len(workers)
+    pending: dict[int, BatchResult[T]] = {}
+    next_index = 0
+    try:
+        while running:
+            result = await results.get()
+            if result is _DONE:
+                running -= 1
+                continue
+            if not ordered:
+                yield result
+                continue
+            pending[result.index] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+        # Raises if iterating over the calls failed
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+def gather_requests(
+    calls: Iterable[Callable[[], Awaitable[T]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = False,
+) -> AsyncIterator[BatchResult[T]]:
+    """
+    Run calls with bounded concurrency and yield their results as they complete.
+
+    At most `concurrency` calls are awaited at once, and calls are only made once there is room for them, so the
+    iterable can be lazy and arbitrarily long. Errors are captured per call instead of failing the whole batch.
+
+    Args:
+        calls: Functions taking no arguments that return an awaitable, such as `functools.partial` objects
+        concurrency: Max calls awaited at once. Default 10
+        ordered: If true, yield results in the order of the calls instead of as they complete. Default False
+
+    Returns:
+        AsyncIterator[BatchResult]: The result of every call
+
+    """
+    return _run(((call, call) for call in calls), concurrency, ordered)
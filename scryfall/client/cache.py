@@ -0,0 +1,349 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from scryfall.client.route import Route
+
+DEFAULT_TTL = 24 * 60 * 60
+"""Scryfall card data is updated roughly once a day"""
+
+DEFAULT_ROUTE_TTLS: dict[str, float] = {
+    "/cards/random": 0,
+    "/bulk-data": 60 * 60,
+}
+"""TTLs for routes whose data changes more, or less, often than the default"""
+
+DEFAULT_REVALIDATION_TTL = 7 * 24 * 60 * 60
+"""How long entries with validators are kept after expiring, to be revalidated with a conditional request"""
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body."""
+
+    content: bytes
+    """The raw response body"""
+
+    expires_at: float
+    """Unix timestamp after which the entry is no longer fresh"""
+
+    etag: str | None = None
+    """The response's `ETag` header"""
+
+    last_modified: str | None = None
+    """The response's `Last-Modified` header"""
+
+    @property
+    def fresh(self) -> bool:
+        """If the entry has not yet expired"""
+        return time.time() < self.expires_at
+
+    @property
+    def stale_for(self) -> float:
+        """Seconds since the entry expired, 0 if it is fresh"""
+        return max(0.0, time.time() - self.expires_at)
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Headers to revalidate the entry with a conditional request"""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class CacheStats:
+    """Cache hit and miss counters."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of lookups that were served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached responses.
+
+    Implement this to keep responses somewhere other than process memory, such as on disk or in Redis.
+    Entries may be dropped at any time, but should be kept no longer than their `ttl`.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> CacheEntry | None:
+        """
+        Get an entry.
+
+        Args:
+            key: Cache key
+
+        """
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """
+        Store an entry.
+
+        Args:
+            key: Cache key
+            entry: Entry to store
+            ttl: How long to keep the entry, in seconds
+
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Delete an entry.
+
+        Args:
+            key: Cache key
+
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Delete all entries."""
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-memory LRU cache backend.
+
+    Args:
+        maxsize: Max number of entries to keep. Default 4096
+
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, CacheEntry]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        """
+        Get an entry, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        """
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        if item[0] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return item[1]
+
+    async def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """
+        Store an entry, evicting the least recently used entries when full.
+
+        Args:
+            key: Cache key
+            entry: Entry to store
+            ttl: How long to keep the entry, in seconds
+
+        """
+        self._entries[key] = (time.time() + ttl, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete an entry.
+
+        Args:
+            key: Cache key
+
+        """
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        """Delete all entries."""
+        self._entries.clear()
+
+
+class ResponseCache:
+    """
+    Response caching policy for `Scryfall.request`.
+
+    Only `GET` requests are cached, keyed on their URL and query string parameters. Responses with an `ETag` or
+    `Last-Modified` header are kept for `revalidation_ttl` after expiring, and revalidated with a conditional
+    request instead of being downloaded again.
+
+    Expired entries can also be served right away while they are refreshed in the background
+    (`stale_while_revalidate`), or instead of an error while Scryfall is unreachable or failing (`stale_if_error`).
+    Models built from them are marked as `stale`.
+
+    Args:
+        backend: Where to store responses. Defaults to a `MemoryCache`
+        ttl: Default TTL in seconds. Defaults to 24 hours
+        route_ttls: TTLs by path prefix, overriding the default. `0` disables caching for a route
+        revalidation_ttl: Seconds to keep expired entries with validators for. Defaults to 7 days
+        stale_while_revalidate: Seconds after expiring during which an entry is served while it is refreshed. Default 0
+        stale_if_error: Seconds after expiring during which an entry is served if refreshing it fails. Default 0
+
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttl: float = DEFAULT_TTL,
+        route_ttls: dict[str, float] | None = None,
+        revalidation_ttl: float = DEFAULT_REVALIDATION_TTL,
+        stale_while_revalidate: float = 0,
+        stale_if_error: float = 0,
+    ) -> None:
+        self.backend: CacheBackend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.revalidation_ttl = revalidation_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.route_ttls = DEFAULT_ROUTE_TTLS | (route_ttls or {})
+        self.stats = CacheStats()
+
+    def key(self, route: Route, params: dict[str, Any] | None = None) -> str:
+        """
+        Get the cache key of a request.
+
+        Args:
+            route: Route of the request
+            params: Query string parameters
+
+        """
+        return route.key(params)
+
+    def get_ttl(self, route: Route) -> float:
+        """
+        Get the TTL of a route, by its longest matching path prefix.
+
+        Args:
+            route: Route of the request
+
+        """
+        path = route.resolved_path
+        matches = [prefix for prefix in self.route_ttls if path.startswith(prefix)]
+        if not matches:
+            return self.ttl
+        return self.route_ttls[max(matches, key=len)]
+
+    def is_cacheable(self, route: Route) -> bool:
+        """
+        If responses of a route can be cached.
+
+        Args:
+            route: Route of the request
+
+        """
+        return route.method == "GET" and self.get_ttl(route) > 0
+
+    async def lookup(self, key: str) -> CacheEntry | None:
+        """
+        Get a cached entry, fresh or expired, counting a hit if it is fresh or a miss otherwise.
+
+        Args:
+            key: Cache key
+
+        """
+        entry = await self.backend.get(key)
+        if entry is None or not entry.fresh:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return entry
+
+    async def get(self, key: str) -> bytes | None:
+        """
+        Get a fresh cached response body, counting the hit or miss.
+
+        Args:
+            key: Cache key
+
+        """
+        entry = await self.lookup(key)
+        return entry.content if entry is not None and entry.fresh else None
+
+    async def set(
+        self,
+        key: str,
+        route: Route,
+        content: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry:
+        """
+        Cache a response body.
+
+        Args:
+            key: Cache key
+            route: Route of the request
+            content: Raw response body
+            etag: The response's `ETag` header
+            last_modified: The response's `Last-Modified` header
+
+        Returns:
+            CacheEntry: The new entry
+
+        """
+        ttl = self.get_ttl(route)
+        entry = CacheEntry(content, time.time() + ttl, etag, last_modified)
+        # Keep expired entries for as long as they may still be used
+        keep = max(self.stale_while_revalidate, self.stale_if_error)
+        if etag is not None or last_modified is not None:
+            keep = max(keep, self.revalidation_ttl)
+        await self.backend.set(key, entry, ttl + keep)
+        return entry
+
+    def can_serve_stale(self, entry: CacheEntry) -> bool:
+        """
+        If an expired entry may be served while it is refreshed in the background.
+
+        Args:
+            entry: The expired entry
+
+        """
+        return entry.stale_for < self.stale_while_revalidate
+
+    def can_fall_back(self, entry: CacheEntry) -> bool:
+        """
+        If an expired entry may be served because refreshing it failed.
+
+        Args:
+            entry: The expired entry
+
+        """
+        return entry.stale_for < self.stale_if_error
+
+    async def revalidated(self, key: str, route: Route, entry: CacheEntry) -> CacheEntry:
+        """
+        Refresh an entry after the server confirmed it didn't change.
+
+        Args:
+            key: Cache key
+            route: Route of the request
+            entry: The revalidated entry
+
+        Returns:
+            CacheEntry: The refreshed entry
+
+        """
+        return await self.set(key, route, entry.content, entry.etag, entry.last_modified)
+
+    async def clear(self) -> None:
+        """Delete all cached responses."""
+        await self.backend.clear()
@@ -10,6 +10,20 @@ class LibraryException(Exception):
     """Base Exception of scryfall-py."""
 
 
+class CircuitOpenError(LibraryException):
+    """
+    A request was not sent, because Scryfall failed too often recently.
+
+    Attributes:
+        retry_in float: Seconds until a request will be let through to check if Scryfall is back
+
+    """
+
+    def __init__(self, retry_in: float) -> None:
+        self.retry_in: float = max(0.0, retry_in)
+        super().__init__(f"Circuit open after repeated failures, retrying in {self.retry_in:.1f} seconds")
+
+
 class HTTPException(LibraryException):
     """
     An HTTP request resulted in an exception.
@@ -26,7 +40,11 @@ class HTTPException(LibraryException):
         self.response: httpx.Response = response
         self.route: "Route" = route
 
-        data = response.json()
+        try:
+            data = response.json()
+        except ValueError:
+            # Proxies in front of Scryfall can answer errors with HTML
+            data = {"status": response.status_code, "details": response.text}
 
         self.status: int = data.get("status")
         self.code: str = data.get("code")
@@ -0,0 +1,86 @@
+import codecs
+import zlib
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+from scryfall.client.route import Route
+from scryfall.models.bulk import BulkData
+from scryfall.models.cards import Card
+from scryfall.models.internal.protocols import CanRequest
+from scryfall.utils import JSONArrayDecoder
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class BulkRequests(CanRequest):
+    async def get_bulk_data(self) -> list[BulkData]:
+        """Get all bulk data files."""
+        result = await self.request(Route("GET", "/bulk-data"))
+        return [self._build(BulkData, x) for x in result["data"]]
+
+    async def get_bulk_data_by_id(self, id: str | UUID) -> BulkData:
+        """
+        Get a bulk data file by ID.
+
+        Args:
+            id: UUID of the bulk data
+
+        """
+        result = await self.request(Route("GET", "/bulk-data/{id}", id=id))
+        return self._build(BulkData, result)
+
+    async def get_bulk_data_by_type(self, type: str) -> BulkData:
+        """
+        Get a bulk data file by type.
+
+        Args:
+            type: The bulk data type, such as `oracle_cards`, `default_cards` or `all_cards`
+
+        """
+        result = await self.request(Route("GET", "/bulk-data/{type}", type=type))
+        return self._build(BulkData, result)
+
+    async def stream_bulk_data(self, type: str, chunk_size: int = 65536) -> AsyncIterator[dict[str, Any]]:
+        """
+        Download a bulk data file and yield its items as they are decoded.
+
+        The file is downloaded and parsed chunk by chunk, so it is never held in memory as a whole.
+
+        Args:
+            type: The bulk data type, such as `oracle_cards`, `default_cards` or `all_cards`
+            chunk_size: Size of the downloaded chunks in bytes. Default 64KiB
+
+        """
+        bulk_data = await self.get_bulk_data_by_type(type)
+
+        decoder = JSONArrayDecoder()
+        text = codecs.getincrementaldecoder("utf-8")()
+        decompressor = None
+        first = True
+        async with self.stream(str(bulk_data.download_uri)) as response:
+            async for chunk in response.aiter_bytes(chunk_size):
+                # httpx handles the Content-Encoding, but the file itself may still be gzipped
+                if first and chunk.startswith(GZIP_MAGIC):
+                    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+                first = False
+                if decompressor is not None:
+                    chunk = decompressor.decompress(chunk)
+                for item in decoder.feed(text.decode(chunk)):
+                    yield item
+        tail = decompressor.flush() if decompressor is not None else b""
+        for item in decoder.feed(text.decode(tail, final=True)):
+            yield item
+        decoder.close()
+
+    async def stream_bulk_cards(self, type: str = "default_cards", chunk_size: int = 65536) -> AsyncIterator[Card]:
+        """
+        Download a card bulk data file and yield its cards as they are decoded.
+
+        Args:
+            type: The bulk data type, one of `oracle_cards`, `unique_artwork`, `default_cards` or `all_cards`. Default `default_cards`
+            chunk_size: Size of the downloaded chunks in bytes. Default 64KiB
+
+        """
+        async for item in self.stream_bulk_data(type, chunk_size=chunk_size):
+            yield self._build(Card, item)
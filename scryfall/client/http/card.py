@@ -1,15 +1,46 @@
-from typing import Any, Literal
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Literal, TYPE_CHECKING
 from uuid import UUID
 
 from scryfall.models.catalogs import Catalog
 from scryfall.client.route import Route
 from scryfall.models.cards import Card
-from scryfall.models.api import APIList
+from scryfall.models.api import APIList, CardCollection
 from scryfall.models.rulings import Ruling
 from scryfall.models.internal.protocols import CanRequest
 
+if TYPE_CHECKING:
+    from scryfall.local.names import NameIndex
+    from scryfall.local.store import CardStore
+
+COLLECTION_BATCH_SIZE = 75
+"""Max number of identifiers Scryfall accepts in a single `/cards/collection` request"""
+
+COLLECTION_IDENTIFIERS = (
+    frozenset({"id"}),
+    frozenset({"mtgo_id"}),
+    frozenset({"multiverse_id"}),
+    frozenset({"oracle_id"}),
+    frozenset({"illustration_id"}),
+    frozenset({"name"}),
+    frozenset({"name", "set"}),
+    frozenset({"collector_number", "set"}),
+)
+"""Valid combinations of card identifier keys"""
+
 
 class CardRequests(CanRequest):
+    store: "CardStore | None" = None
+    """Local card store to look cards up in before requesting them"""
+    name_index: "NameIndex | None" = None
+    """Local name index to autocomplete and resolve fuzzy names with"""
+
+    def _get_stored_card(self, data: dict[str, Any] | None) -> Card | None:
+        if data is None:
+            return None
+        return self._build(Card, data)
+
     async def get_card_by_id(self, id: str | UUID) -> Card:
         """
         Get a card by ID.
@@ -18,9 +49,11 @@ class CardRequests(CanRequest):
             id: UUID of card
 
         """
-        result = await self.request(Route("GET", f"/cards/{id}"))
-        result["_client"] = self
-        return Card(**result)
+        if self.store is not None and (card := self._get_stored_card(self.store.get_by_id(id))) is not None:
+            return card
+
+        result = await self.request(Route("GET", "/cards/{id}", id=id))
+        return self._build(Card, result)
 
     async def get_card_by_tcgplayer_id(self, id: int) -> Card:
         """
@@ -30,9 +63,11 @@ class CardRequests(CanRequest):
             id: TCGPlayer ID
 
         """
-        result = await self.request(Route("GET", f"/cards/tcgplayer/{id}"))
-        result["_client"] = self
-        return Card(**result)
+        if self.store is not None and (card := self._get_stored_card(self.store.get_by_tcgplayer_id(id))) is not None:
+            return card
+
+        result = await self.request(Route("GET", "/cards/tcgplayer/{id}", id=id))
+        return self._build(Card, result)
 
     async def get_card_by_multiverse_id(self, id: int) -> Card:
         """
@@ -42,9 +77,11 @@ class CardRequests(CanRequest):
             id: Multiverse ID
 
         """
-        result = await self.request(Route("GET", f"/cards/multiverse/{id}"))
-        result["_client"] = self
-        return Card(**result)
+        if self.store is not None and (card := self._get_stored_card(self.store.get_by_multiverse_id(id))) is not None:
+            return card
+
+        result = await self.request(Route("GET", "/cards/multiverse/{id}", id=id))
+        return self._build(Card, result)
 
     async def get_card_by_mtgo_id(self, id: int) -> Card:
         """
@@ -54,9 +91,11 @@ class CardRequests(CanRequest):
             id: MTGO ID
 
         """
-        result = await self.request(Route("GET", f"/cards/mtgo/{id}"))
-        result["_client"] = self
-        return Card(**result)
+        if self.store is not None and (card := self._get_stored_card(self.store.get_by_mtgo_id(id))) is not None:
+            return card
+
+        result = await self.request(Route("GET", "/cards/mtgo/{id}", id=id))
+        return self._build(Card, result)
 
     async def get_card_by_arena_id(self, id: int) -> Card:
         """
@@ -66,9 +105,11 @@ class CardRequests(CanRequest):
             id: MTG Arena ID
 
         """
-        result = await self.request(Route("GET", f"/cards/arena/{id}"))
-        result["_client"] = self
-        return Card(**result)
+        if self.store is not None and (card := self._get_stored_card(self.store.get_by_arena_id(id))) is not None:
+            return card
+
+        result = await self.request(Route("GET", "/cards/arena/{id}", id=id))
+        return self._build(Card, result)
 
     async def get_card_by_cardmarket_id(self, id: int) -> Card:
         """
@@ -78,9 +119,11 @@ class CardRequests(CanRequest):
             id: Cardmarket ID
 
         """
-        result = await self.request(Route("GET", f"/cards/cardmarket/{id}"))
-        result["_client"] = self
-        return Card(**result)
+        if self.store is not None and (card := self._get_stored_card(self.store.get_by_cardmarket_id(id))) is not None:
+            return card
+
+        result = await self.request(Route("GET", "/cards/cardmarket/{id}", id=id))
+        return self._build(Card, result)
 
     async def get_rulings_by_card_id(self, id: str | UUID) -> list[Ruling]:
         """
@@ -90,8 +133,8 @@ class CardRequests(CanRequest):
             id: UUID of card
 
         """
-        result = await self.request(Route("GET", f"/cards/{id}/rulings"))
-        return [Ruling(**x) for x in result["data"]]
+        result = await self.request(Route("GET", "/cards/{id}/rulings", id=id))
+        return [self._build(Ruling, x) for x in result["data"]]
 
     async def search_cards(
         self,
@@ -119,7 +162,7 @@ class CardRequests(CanRequest):
         include_multilingual: bool = False,
         include_variations: bool = False,
         page: int = 1,
-    ) -> APIList:
+    ) -> APIList[Card]:
         """
         Search for a card using a fulltext string search.
 
@@ -156,8 +199,65 @@ class CardRequests(CanRequest):
             params=params,
         )
 
-        result["_client"] = self
-        return APIList(**result)
+        return self._build(APIList[Card], result)
+
+    async def iter_search_cards(
+        self,
+        q: str,
+        unique: Literal["cards", "art", "prints"] = "cards",
+        order: Literal[
+            "name",
+            "set",
+            "released",
+            "rarity",
+            "color",
+            "usd",
+            "tix",
+            "eur",
+            "cmc",
+            "power",
+            "toughness",
+            "edhrec",
+            "penny",
+            "artist",
+            "review",
+        ] = "name",
+        dir: Literal["auto", "asc", "desc"] = "auto",
+        include_extras: bool = False,
+        include_multilingual: bool = False,
+        include_variations: bool = False,
+        limit: int | None = None,
+    ) -> AsyncIterator[Card]:
+        """
+        Iterate over every card matching a fulltext string search.
+
+        Pages are requested as needed, with the next page prefetched while the current one is consumed.
+
+        Args:
+            q: A fulltext search query. Max length: 1000 Unicode characters
+            unique: The strategy for omitting cards. Default `cards`
+            order: The method to sort returned cards. Default `name`
+            dir: Direction to sort cards. Default `auto`
+            include_extras: If true, extra cards (tokens, planes, etc) will be included. Equivalent to adding `include:extras` to the fulltext search. Default `false`
+            include_multilingual: If true, cards in every language supported by Scryfall will be included. Default `false`
+            include_variations: If true, rare card variants will by included. Default `false`
+            limit: Max number of cards to yield. Defaults to all matching cards
+
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        cards = await self.search_cards(
+            q=q,
+            unique=unique,
+            order=order,
+            dir=dir,
+            include_extras=include_extras,
+            include_multilingual=include_multilingual,
+            include_variations=include_variations,
+        )
+        async for card in cards.iter_all(limit=limit):
+            yield card
 
     async def search_cards_named(
         self, exact: str | None = None, fuzzy: str | None = None, set: str | None = None
@@ -174,6 +274,13 @@ class CardRequests(CanRequest):
         if (not exact and not fuzzy) or (exact and fuzzy):
             raise ValueError("Either exact or fuzzy needs provided")
 
+        if fuzzy and self.name_index is not None and (name := self.name_index.fuzzy(fuzzy)) is not None:
+            exact, fuzzy = name, None
+
+        if exact and self.store is not None:
+            if (card := self._get_stored_card(self.store.get_by_name(exact, set))) is not None:
+                return card
+
         params = {"set": set}
         if exact:
             params["exact"] = exact
@@ -188,18 +295,22 @@ class CardRequests(CanRequest):
             params=params,
         )
 
-        result["_client"] = self
-        return Card(**result)
+        return self._build(Card, result)
 
     async def cards_autocomplete(self, q: str, include_extras: bool = False) -> Catalog:
         """
         Returns a Catalog containing up to 20 full English card names for autocomplete purposes.
 
+        Answered locally if a `name_index` is set.
+
         Args:
             q: The string to autocomplete
             include_extras: If true, extra cards (tokens, planes, vanguards, etc) will be included. Default False
 
         """
+        if self.name_index is not None:
+            return self.name_index.autocomplete(q, include_extras)
+
         params = {"q": q, "include_extras": include_extras}
 
         result = await self.request(
@@ -207,7 +318,7 @@ class CardRequests(CanRequest):
             params=params,
         )
 
-        return Catalog(**result)
+        return self._build(Catalog, result)
 
     async def get_random_card(
         self,
@@ -216,18 +327,63 @@ class CardRequests(CanRequest):
         params = {"q": q}
 
         result = await self.request(
-            Route("GET", "/cards/random"),
+            Route("GET", "/cards/random", coalesce=False),
             params=params,
         )
 
-        result["_client"] = self
-        return Card(**result)
+        return self._build(Card, result)
+
+    async def get_card_collection(self, identifiers: list[dict[str, Any]]) -> CardCollection:
+        """
+        Get a collection of cards by a list of identifiers.
 
-    async def get_card_collection(self, identifiers: list[dict[str, Any]]):
-        raise NotImplementedError("This endpoint has not been implemented")
+        Identifiers are split into batches of 75, which are requested concurrently. Cards are returned in the order
+        of their identifiers, without the ones that weren't found, so they don't line up with the identifiers if any
+        are in `not_found`.
+
+        Args:
+            identifiers: Card identifiers, each one of `id`, `mtgo_id`, `multiverse_id`, `oracle_id`, `illustration_id`, `name`, `name` and `set`, or `collector_number` and `set`
+
+        """
+        normalized: list[dict[str, Any]] = []
+        for identifier in identifiers:
+            if frozenset(identifier) not in COLLECTION_IDENTIFIERS:
+                raise ValueError(f"Invalid card identifier: {identifier}")
+            normalized.append({k: str(v) if isinstance(v, UUID) else v for k, v in identifier.items()})
+
+        results = await asyncio.gather(
+            *(
+                self.request(
+                    Route("POST", "/cards/collection"),
+                    json={"identifiers": normalized[i : i + COLLECTION_BATCH_SIZE]},  # type: ignore
+                )
+                for i in range(0, len(normalized), COLLECTION_BATCH_SIZE)
+            )
+        )
+
+        result: dict[str, Any] = {"object": "list", "data": [], "not_found": []}
+        for page in results:
+            result["data"].extend(page["data"])
+            result["not_found"].extend(page.get("not_found", []))
+            if page.get("warnings"):
+                result.setdefault("warnings", []).extend(page["warnings"])
+
+        return self._build(CardCollection, result)
 
     async def get_card_by_set_code_and_collector_number(self, code: str, number: str, lang: str | None = None) -> Card:
-        result = await self.request(Route("GET", f"/cards/{code}/{number}{f'/{lang}' if lang else ''}"))
+        if self.store is not None:
+            data = self.store.get_by_set_code_and_collector_number(code, number, lang)
+            if (card := self._get_stored_card(data)) is not None:
+                return card
+
+        result = await self.request(
+            Route(
+                "GET",
+                "/cards/{code}/{number}/{lang}" if lang else "/cards/{code}/{number}",
+                code=code,
+                number=number,
+                lang=lang,
+            )
+        )
 
-        result["_client"] = self
-        return Card(**result)
+        return self._build(Card, result)
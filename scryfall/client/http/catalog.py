@@ -0,0 +1,42 @@
+from typing import Literal
+
+from scryfall.client.route import Route
+from scryfall.models.catalogs import Catalog
+from scryfall.models.internal.protocols import CanRequest
+
+CatalogName = Literal[
+    "card-names",
+    "artist-names",
+    "word-bank",
+    "supertypes",
+    "card-types",
+    "artifact-types",
+    "battle-types",
+    "creature-types",
+    "enchantment-types",
+    "land-types",
+    "planeswalker-types",
+    "spell-types",
+    "powers",
+    "toughnesses",
+    "loyalties",
+    "watermarks",
+    "keyword-abilities",
+    "keyword-actions",
+    "ability-words",
+    "flavor-words",
+]
+
+
+class CatalogRequests(CanRequest):
+    async def get_catalog(self, name: CatalogName) -> Catalog:
+        """
+        Get a catalog of Magic datapoints, such as all card names.
+
+        Args:
+            name: Name of the catalog, such as `card-names`
+
+        """
+        result = await self.request(Route("GET", "/catalog/{name}", name=name))
+
+        return self._build(Catalog, result)
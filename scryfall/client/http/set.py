@@ -7,12 +7,11 @@ from scryfall.models.internal.protocols import CanRequest
 
 
 class SetRequests(CanRequest):
-    async def get_all_sets(self) -> APIList:
+    async def get_all_sets(self) -> APIList[Set]:
         """Get all MTG sets."""
         result = await self.request(Route("GET", "/sets"))
 
-        result["_client"] = self
-        return APIList(**result)
+        return self._build(APIList[Set], result)
 
     async def get_set_by_id(self, id: str | UUID) -> Set:
         """
@@ -22,10 +21,9 @@ class SetRequests(CanRequest):
             id: UUID of set
 
         """
-        result = await self.request(Route("GET", f"/sets/{id}"))
+        result = await self.request(Route("GET", "/sets/{id}", id=id))
 
-        result["_client"] = self
-        return Set(**result)
+        return self._build(Set, result)
 
     async def get_set_by_code(self, code: str) -> Set:
         """
@@ -35,10 +33,9 @@ class SetRequests(CanRequest):
             code: Set code
 
         """
-        result = await self.request(Route("GET", f"/sets/{code}"))
+        result = await self.request(Route("GET", "/sets/{code}", code=code))
 
-        result["_client"] = self
-        return Set(**result)
+        return self._build(Set, result)
 
     async def get_set_by_tcgplayer_id(self, id: int) -> Set:
         """
@@ -48,7 +45,6 @@ class SetRequests(CanRequest):
             id: TCGPlayer ID of set
 
         """
-        result = await self.request(Route("GET", f"/sets/tcgplayer/{id}"))
+        result = await self.request(Route("GET", "/sets/tcgplayer/{id}", id=id))
 
-        result["_client"] = self
-        return Set(**result)
+        return self._build(Set, result)
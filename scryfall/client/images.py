@@ -0,0 +1,220 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Any, Literal
+from urllib.parse import urlsplit
+
+from httpx import Response
+
+from scryfall.client.error import LibraryException
+from scryfall.client.ratelimit import parse_retry_after
+
+if TYPE_CHECKING:
+    from scryfall.client import Scryfall
+
+ImageSize = Literal["small", "normal", "large", "png", "art_crop", "border_crop"]
+
+IMAGE_SIZES: tuple[ImageSize, ...] = ("small", "normal", "large", "png", "art_crop", "border_crop")
+
+DEFAULT_IMAGE_RATE = 50.0
+"""Image requests per second, as the image CDN isn't held to the API's rate limit"""
+
+IMAGE_HEADERS = {"Accept": "image/png,image/jpeg,image/*;q=0.8"}
+"""Headers of image requests, instead of the API's JSON ones"""
+
+
+@dataclass
+class ImageFile:
+    """An image of a card to download, the `item` of every result of `Scryfall.download_images`"""
+
+    card_id: str
+    """ID of the card"""
+
+    url: str
+    """URL of the image"""
+
+    path: Path
+    """Where the image is saved"""
+
+    face: int | None = None
+    """Index of the card face, for multi-faced cards with an image per face"""
+
+    illustration_id: str | None = None
+    """ID of the illustration, if known"""
+
+    @property
+    def etag_path(self) -> Path:
+        """Where the ETag of the image is saved, to check if it is up to date"""
+        return self.path.with_name(f"{self.path.name}.etag")
+
+
+def _get(obj: Any, name: str) -> Any:
+    # Cards may be validated models, lazy models, models built in raw mode or plain API data
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def image_files(cards: Iterable[Any], size: ImageSize, dest: Path, dedupe: bool = False) -> Iterator[ImageFile]:
+    """
+    List the images of cards.
+
+    Cards with a single image, including split and flip cards, get one image named after the card ID, and cards
+    with an image per face, such as transform cards, one per face named after the card ID and the face index.
+
+    Args:
+        cards: Cards, as models or raw API data
+        size: Size of the images
+        dest: Directory to save the images in
+        dedupe: If true, list every illustration only once, and name images after their illustration ID
+
+    Returns:
+        Iterator[ImageFile]: The images, skipping cards without images
+
+    """
+    seen: set[Path] = set()
+    for card in cards:
+        card_id = str(_get(card, "id"))
+        if (uris := _get(card, "image_uris")) is not None:
+            faces = [(None, _get(card, "illustration_id"), uris)]
+        else:
+            faces = [
+                (i, _get(face, "illustration_id"), _get(face, "image_uris"))
+                for i, face in enumerate(_get(card, "card_faces") or ())
+            ]
+        for face, illustration_id, uris in faces:
+            if not uris or not uris.get(size):
+                continue
+            url = str(uris[size])
+            suffix = PurePosixPath(urlsplit(url).path).suffix or ".jpg"
+            if dedupe and illustration_id is not None:
+                name = str(illustration_id)
+            else:
+                name = card_id if face is None else f"{card_id}-{face}"
+            path = dest / f"{name}{suffix}"
+            if path in seen:
+                continue
+            seen.add(path)
+            yield ImageFile(card_id, url, path, face, None if illustration_id is None else str(illustration_id))
+
+
+async def _open(client: "Scryfall", file: ImageFile, method: str) -> Response:
+    # Images are requested under the image rate limiter, and retried like API requests, but without taking retries
+    # out of the budget or tripping the circuit breaker, which are about the API
+    http = client._get_client()
+    policy = client.retry_policy
+    limiter = client.image_rate_limiter
+    rate_limited = errors = 0
+    while True:
+        await limiter.wait()
+        request = http.build_request(method, file.url, headers=IMAGE_HEADERS)
+        request.headers.pop("Content-Type", None)
+        try:
+            response = await http.send(request, stream=True)
+        except policy.transport_errors as e:
+            if errors >= policy.error_retries:
+                raise
+            errors += 1
+            delay = policy.get_delay(errors)
+            client.logger.warning(f"{method}::{file.url} Received {e!r}... retrying in {delay:.2f} seconds")
+            await asyncio.sleep(delay)
+            continue
+
+        status = response.status_code
+        if status == 429 and rate_limited < policy.rate_limit_retries:
+            await response.aclose()
+            rate_limited += 1
+            await limiter.on_rate_limited(parse_retry_after(response.headers.get("Retry-After")))
+            continue
+        if status != 429:
+            await limiter.on_success()
+        if status in policy.retry_statuses and errors < policy.error_retries:
+            await response.aclose()
+            errors += 1
+            delay = policy.get_delay(errors, parse_retry_after(response.headers.get("Retry-After")))
+            client.logger.warning(f"{method}::{file.url} Received {status}... retrying in {delay:.2f} seconds")
+            await asyncio.sleep(delay)
+            continue
+
+        if not 300 > status >= 200:
+            await response.aclose()
+            client.logger.error(f"{method}::{file.url}: {status}")
+            raise LibraryException(f"Failed to download {file.url}: {status}")
+        return response
+
+
+def _is_up_to_date(file: ImageFile, response: Response) -> bool:
+    etag = response.headers.get("ETag")
+    length = response.headers.get("Content-Length")
+    if length is not None and int(length) != file.path.stat().st_size:
+        return False
+    if etag is not None and file.etag_path.exists():
+        return file.etag_path.read_text() == etag
+    if length is None:
+        return False
+    # A file of the right size from before ETags were saved, save it to check it faster next time
+    if etag is not None:
+        _write_text(file.etag_path, etag)
+    return True
+
+
+def _write_text(path: Path, text: str) -> None:
+    temp = path.with_name(f".{path.name}.part")
+    temp.write_text(text)
+    os.replace(temp, path)
+
+
+def _replace(file: ImageFile, temp: str, etag: str | None) -> None:
+    # The old ETag goes first, so it is never left next to a newer image
+    file.etag_path.unlink(missing_ok=True)
+    os.replace(temp, file.path)
+    if etag is not None:
+        _write_text(file.etag_path, etag)
+
+
+async def download_image(client: "Scryfall", file: ImageFile, verify: bool = True, chunk_size: int = 65536) -> bool:
+    """
+    Download an image to disk, unless it is already there.
+
+    The image is streamed to a temporary file next to its destination, which is only renamed once the download is
+    complete, so an interrupted download never leaves a partial image behind. Files are written in a worker thread,
+    to keep the event loop free.
+
+    Args:
+        client: Client to download the image with
+        file: The image
+        verify: If true, check existing files against the size and ETag of the image, otherwise trust them
+        chunk_size: Size of the downloaded chunks in bytes. Default 64KiB
+
+    Returns:
+        bool: True if the image was downloaded, False if it was skipped as it was up to date
+
+    """
+    if await asyncio.to_thread(file.path.exists):
+        if not verify:
+            return False
+        response = await _open(client, file, "HEAD")
+        await response.aclose()
+        if await asyncio.to_thread(_is_up_to_date, file, response):
+            return False
+
+    response = await _open(client, file, "GET")
+    try:
+        fd, temp = await asyncio.to_thread(
+            tempfile.mkstemp, dir=file.path.parent, prefix=f".{file.path.name}.", suffix=".part"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    await asyncio.to_thread(f.write, chunk)
+            await asyncio.to_thread(_replace, file, temp, response.headers.get("ETag"))
+        except BaseException:
+            # Already gone if a cancelled rename finished in its thread regardless
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(temp)
+            raise
+    finally:
+        await response.aclose()
+    return True
@@ -0,0 +1,336 @@
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, ClassVar
+
+from httpx import Response
+
+from scryfall.client.route import Route
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover
+    trace = None
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+"""Upper bounds of histogram buckets in seconds, from cache hits to long backoffs"""
+
+
+@dataclass
+class RequestInfo:
+    """A request made through `Scryfall.request`, passed to every instrumentation event about it"""
+
+    route: Route
+    """Route of the request, whose `path` is the route template, such as `/cards/{id}`"""
+
+    params: dict[str, Any] | None = None
+    """Query string parameters"""
+
+    started_at: float = field(default_factory=time.perf_counter)
+    """When the request was started, from `time.perf_counter`"""
+
+    attempts: int = 0
+    """Number of times the request was sent"""
+
+    cached: bool = False
+    """True if the response came from the cache without sending a request"""
+
+    stale: bool = False
+    """True if the response came from an expired cache entry, while refreshing it or because refreshing it failed"""
+
+    coalesced: bool = False
+    """True if the request shared the response of an identical request already in flight, without being sent"""
+
+    ended: bool = False
+    """True once `on_request_end` was called, after which the request gets no more events"""
+
+    data: dict[str, Any] = field(default_factory=dict)
+    """Free space for instrumentation to keep per-request state in"""
+
+
+class Instrumentation:
+    """
+    Receives events about every phase of requests.
+
+    Subclass it and override the events you need, then pass it to the client. Events are called synchronously,
+    so they should be quick.
+    """
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        """
+        A request was started, before looking it up in the cache.
+
+        Args:
+            info: The request
+
+        """
+
+    def on_rate_limit_wait(self, info: RequestInfo, seconds: float) -> None:
+        """
+        The rate limiter let a request through.
+
+        Args:
+            info: The request
+            seconds: How long the request waited for the rate limiter
+
+        """
+
+    def on_response(self, info: RequestInfo, response: Response, seconds: float) -> None:
+        """
+        A response was received.
+
+        Args:
+            info: The request
+            response: The response
+            seconds: How long the request took on the network
+
+        """
+
+    def on_retry(self, info: RequestInfo, reason: str, delay: float | None) -> None:
+        """
+        A request is going to be retried.
+
+        Args:
+            info: The request
+            reason: Why, such as `rate_limited` or `server_error`
+            delay: Seconds waited before retrying, if known
+
+        """
+
+    def on_request_end(self, info: RequestInfo, seconds: float, error: BaseException | None) -> None:
+        """
+        A request finished, successfully or not.
+
+        Args:
+            info: The request
+            seconds: How long the whole request took, including waits and retries
+            error: What the request raised, if it failed
+
+        """
+
+    def on_parse_complete(self, model: type, seconds: float) -> None:
+        """
+        API data was turned into a model.
+
+        Args:
+            model: Type of the model
+            seconds: How long building it took
+
+        """
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: tuple[tuple[str, Any], ...], extra: str = "") -> str:
+    items = [f'{k}="{_escape(v)}"' for k, v in labels]
+    if extra:
+        items.append(extra)
+    return "{" + ",".join(items) + "}" if items else ""
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsCollector(Instrumentation):
+    """
+    Collects counters and histograms of requests by route template, and renders them in the Prometheus text format.
+
+    Metrics:
+        - `scryfall_requests_total`: Requests started
+        - `scryfall_requests_in_flight`: Requests not finished yet
+        - `scryfall_cache_hits_total`: Requests answered by the cache
+        - `scryfall_stale_responses_total`: Requests answered by an expired cache entry
+        - `scryfall_coalesced_requests_total`: Requests answered by an identical request already in flight
+        - `scryfall_responses_total`: Responses received, by status code
+        - `scryfall_retries_total`: Retries, by reason
+        - `scryfall_errors_total`: Failed requests, by exception type
+        - `scryfall_request_duration_seconds`: Time spent on whole requests
+        - `scryfall_rate_limit_wait_seconds`: Time spent waiting on the rate limiter
+        - `scryfall_network_duration_seconds`: Time spent on the network, per attempt
+        - `scryfall_parse_duration_seconds`: Time spent building models, by model
+
+    Args:
+        buckets: Upper bounds of histogram buckets in seconds. Default `DEFAULT_BUCKETS`
+
+    """
+
+    HELP: ClassVar[dict[str, tuple[str, str]]] = {
+        "scryfall_requests_total": ("counter", "Requests started"),
+        "scryfall_requests_in_flight": ("gauge", "Requests not finished yet"),
+        "scryfall_cache_hits_total": ("counter", "Requests answered by the cache"),
+        "scryfall_stale_responses_total": ("counter", "Requests answered by an expired cache entry"),
+        "scryfall_coalesced_requests_total": ("counter", "Requests answered by an identical request in flight"),
+        "scryfall_responses_total": ("counter", "Responses received"),
+        "scryfall_retries_total": ("counter", "Retries"),
+        "scryfall_errors_total": ("counter", "Failed requests"),
+        "scryfall_request_duration_seconds": ("histogram", "Time spent on whole requests"),
+        "scryfall_rate_limit_wait_seconds": ("histogram", "Time spent waiting on the rate limiter"),
+        "scryfall_network_duration_seconds": ("histogram", "Time spent on the network, per attempt"),
+        "scryfall_parse_duration_seconds": ("histogram", "Time spent building models"),
+    }
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.values: dict[str, dict[tuple[tuple[str, Any], ...], float]] = {}
+        self.histograms: dict[str, dict[tuple[tuple[str, Any], ...], _Histogram]] = {}
+
+    @staticmethod
+    def _route(info: RequestInfo) -> tuple[tuple[str, Any], ...]:
+        return (("method", info.route.method), ("route", info.route.path))
+
+    def _add(self, name: str, labels: tuple[tuple[str, Any], ...], amount: float = 1) -> None:
+        values = self.values.setdefault(name, {})
+        values[labels] = values.get(labels, 0) + amount
+
+    def _observe(self, name: str, labels: tuple[tuple[str, Any], ...], value: float) -> None:
+        histograms = self.histograms.setdefault(name, {})
+        if labels not in histograms:
+            histograms[labels] = _Histogram(self.buckets)
+        histograms[labels].observe(value)
+
+    def get(self, name: str, **labels: Any) -> float:
+        """
+        Get the current value of a counter or gauge, summed over the labels that aren't given.
+
+        Args:
+            name: Name of the metric, such as `scryfall_requests_total`
+            labels: Labels to match, such as `route="/cards/{id}"`
+
+        """
+        return sum(
+            value
+            for key, value in self.values.get(name, {}).items()
+            if all(dict(key).get(k) == v for k, v in labels.items())
+        )
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        self._add("scryfall_requests_total", self._route(info))
+        self._add("scryfall_requests_in_flight", self._route(info))
+
+    def on_rate_limit_wait(self, info: RequestInfo, seconds: float) -> None:
+        self._observe("scryfall_rate_limit_wait_seconds", self._route(info), seconds)
+
+    def on_response(self, info: RequestInfo, response: Response, seconds: float) -> None:
+        self._add("scryfall_responses_total", (*self._route(info), ("status", response.status_code)))
+        self._observe("scryfall_network_duration_seconds", self._route(info), seconds)
+
+    def on_retry(self, info: RequestInfo, reason: str, delay: float | None) -> None:
+        self._add("scryfall_retries_total", (*self._route(info), ("reason", reason)))
+
+    def on_request_end(self, info: RequestInfo, seconds: float, error: BaseException | None) -> None:
+        self._add("scryfall_requests_in_flight", self._route(info), -1)
+        if info.cached:
+            self._add("scryfall_cache_hits_total", self._route(info))
+        if info.stale:
+            self._add("scryfall_stale_responses_total", self._route(info))
+        if info.coalesced:
+            self._add("scryfall_coalesced_requests_total", self._route(info))
+        if error is not None:
+            self._add("scryfall_errors_total", (*self._route(info), ("error", type(error).__name__)))
+        self._observe("scryfall_request_duration_seconds", self._route(info), seconds)
+
+    def on_parse_complete(self, model: type, seconds: float) -> None:
+        self._observe("scryfall_parse_duration_seconds", (("model", model.__name__),), seconds)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, ready to be served on a `/metrics` endpoint
+
+        """
+        lines = []
+        for name, (type, help) in self.HELP.items():
+            values = self.values.get(name)
+            histograms = self.histograms.get(name)
+            if not values and not histograms:
+                continue
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+            for labels, value in (values or {}).items():
+                lines.append(f"{name}{_labels(labels)} {value:g}")
+            for labels, histogram in (histograms or {}).items():
+                total = 0
+                for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts, strict=True):
+                    total += count
+                    lines.append(f"{name}_bucket{_labels(labels, f'le="{bound}"')} {total}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.sum:g}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Traces every request as an OpenTelemetry client span, named after its route template.
+
+    Rate limiter waits, responses and retries are recorded as span events, and model building as its own spans.
+    Requires the `opentelemetry` extra.
+
+    Args:
+        tracer: Tracer to create spans with. Defaults to the global tracer provider's `scryfall` tracer
+
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        if trace is None:
+            raise ImportError(
+                "OpenTelemetryInstrumentation requires opentelemetry-api, "
+                "install it with `pip install scryfall-py[opentelemetry]`"
+            )
+        self.tracer = tracer if tracer is not None else trace.get_tracer("scryfall")
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        info.data["span"] = self.tracer.start_span(
+            f"{info.route.method} {info.route.path}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "http.request.method": info.route.method,
+                "url.template": info.route.path,
+                "url.full": info.route.url,
+            },
+        )
+
+    def on_rate_limit_wait(self, info: RequestInfo, seconds: float) -> None:
+        if (span := info.data.get("span")) is not None:
+            span.add_event("rate_limit_wait", {"seconds": seconds})
+
+    def on_response(self, info: RequestInfo, response: Response, seconds: float) -> None:
+        if (span := info.data.get("span")) is None:
+            return
+        span.set_attribute("http.response.status_code", response.status_code)
+        span.add_event("response", {"http.response.status_code": response.status_code, "seconds": seconds})
+
+    def on_retry(self, info: RequestInfo, reason: str, delay: float | None) -> None:
+        if (span := info.data.get("span")) is None:
+            return
+        span.set_attribute("http.request.resend_count", info.attempts)
+        span.add_event("retry", {"reason": reason} | ({"delay": delay} if delay is not None else {}))
+
+    def on_request_end(self, info: RequestInfo, seconds: float, error: BaseException | None) -> None:
+        if (span := info.data.pop("span", None)) is None:
+            return
+        span.set_attribute("scryfall.cache_hit", info.cached)
+        span.set_attribute("scryfall.coalesced", info.coalesced)
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, type(error).__name__))
+        span.end()
+
+    def on_parse_complete(self, model: type, seconds: float) -> None:
+        end = time.time_ns()
+        span = self.tracer.start_span(f"parse {model.__name__}", start_time=end - int(seconds * 1e9))
+        span.end(end_time=end)
@@ -0,0 +1,345 @@
+import asyncio
+import math
+import os
+import struct
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Protocol
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a `Retry-After` header.
+
+    Args:
+        value: Header value, either a number of seconds or an HTTP date
+
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or invalid
+
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def reserve(tat: float, now: float, interval: float, burst: int) -> tuple[float, float]:
+    """
+    Reserve the next free request slot (GCRA).
+
+    Args:
+        tat: Theoretical arrival time of the next request, once the burst is used up
+        now: Current time
+        interval: Seconds between requests
+        burst: Max requests that can be sent at once
+
+    Returns:
+        tuple[float, float]: The new theoretical arrival time, and how long to wait for the reserved slot
+
+    """
+    tat = max(tat, now)
+    return tat + interval, tat - (burst - 1) * interval - now
+
+
+class RateLimiter(ABC):
+    """Throttles requests to stay within Scryfall's rate limit."""
+
+    @abstractmethod
+    async def wait(self) -> None:
+        """Wait until a request may be sent."""
+
+    @abstractmethod
+    async def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """
+        Back off after a 429 was received.
+
+        Args:
+            retry_after: Seconds to wait, from the `Retry-After` header, if any
+
+        """
+
+    async def on_success(self) -> None:  # noqa: B027
+        """Called after a request went through without being rate limited."""
+
+
+class TokenBucket(RateLimiter):
+    """
+    Token bucket rate limiter.
+
+    Every call reserves the next free slot at the time it is made, so waiters are served in FIFO order
+    without holding a lock while sleeping. Up to `burst` requests can go through at once after idling.
+
+    Args:
+        rate: Max requests per second. Default 10
+        burst: Max requests that can be sent at once. Default 10
+        adaptive: If true, halve the rate on every 429 and slowly recover it on success. Default False
+        min_rate: Lowest rate to back off to in adaptive mode. Default 1
+        recovery: Requests per second to recover per successful request in adaptive mode. Default 0.05
+        default_retry_after: Seconds to back off on a 429 without a `Retry-After` header. Default 2
+
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 10,
+        adaptive: bool = False,
+        min_rate: float = 1.0,
+        recovery: float = 0.05,
+        default_retry_after: float = 2.0,
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.adaptive = adaptive
+        self.min_rate = min(min_rate, rate)
+        self.recovery = recovery
+        self.default_retry_after = default_retry_after
+
+        self._tat = 0.0
+        """Theoretical arrival time of the next request, once the burst is used up"""
+        self._generation = 0
+        """Incremented on every 429, invalidating all outstanding reservations"""
+
+    async def wait(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            generation = self._generation
+            self._tat, delay = reserve(self._tat, time.monotonic(), 1 / self.rate, self.burst)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if generation == self._generation:
+                return
+
+    async def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """
+        Block all requests for `retry_after` seconds, then resume at the allowed rate without a burst.
+
+        Args:
+            retry_after: Seconds to wait, from the `Retry-After` header, if any
+
+        """
+        if retry_after is None:
+            retry_after = self.default_retry_after
+        if self.adaptive:
+            self.rate = max(self.min_rate, self.rate / 2)
+        self._generation += 1
+        self._tat = time.monotonic() + retry_after + (self.burst - 1) / self.rate
+
+    async def on_success(self) -> None:
+        """Recover the rate in adaptive mode."""
+        if self.adaptive and self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.recovery)
+
+
+class FileRateLimiter(RateLimiter):
+    """
+    Rate limiter shared by all processes on the same host through a lock file.
+
+    Works like `TokenBucket`, but keeps its state in a small file guarded by `flock`, so every process using
+    the same path shares a single budget. The lock is only held for the few microseconds it takes to reserve
+    a slot, never while sleeping.
+
+    Args:
+        path: Path of the state file, created if it doesn't exist
+        rate: Max requests per second across all processes. Default 10
+        burst: Max requests that can be sent at once. Default 10
+        default_retry_after: Seconds to back off on a 429 without a `Retry-After` header. Default 2
+
+    """
+
+    _state = struct.Struct("<dq")
+    """Theoretical arrival time and generation"""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        rate: float = 10.0,
+        burst: int = 10,
+        default_retry_after: float = 2.0,
+    ) -> None:
+        if fcntl is None:
+            raise RuntimeError("FileRateLimiter requires fcntl, which is not available on this platform")
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self.default_retry_after = default_retry_after
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the state file."""
+        if getattr(self, "_fd", None) is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read(self) -> tuple[float, int]:
+        data = os.pread(self._fd, self._state.size, 0)
+        if len(data) < self._state.size:
+            return 0.0, 0
+        return self._state.unpack(data)
+
+    def _write(self, tat: float, generation: int) -> None:
+        os.pwrite(self._fd, self._state.pack(tat, generation), 0)
+
+    def _reserve(self) -> tuple[float, int]:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)  # type: ignore
+        try:
+            tat, generation = self._read()
+            tat, delay = reserve(tat, time.time(), 1 / self.rate, self.burst)
+            self._write(tat, generation)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)  # type: ignore
+        return delay, generation
+
+    def _generation(self) -> int:
+        fcntl.flock(self._fd, fcntl.LOCK_SH)  # type: ignore
+        try:
+            return self._read()[1]
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)  # type: ignore
+
+    async def wait(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            delay, generation = self._reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if generation == self._generation():
+                return
+
+    async def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """
+        Block all processes for `retry_after` seconds, then resume at the allowed rate without a burst.
+
+        Args:
+            retry_after: Seconds to wait, from the `Retry-After` header, if any
+
+        """
+        if retry_after is None:
+            retry_after = self.default_retry_after
+        fcntl.flock(self._fd, fcntl.LOCK_EX)  # type: ignore
+        try:
+            _, generation = self._read()
+            self._write(time.time() + retry_after + (self.burst - 1) / self.rate, generation + 1)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)  # type: ignore
+
+
+class RedisClient(Protocol):
+    """The subset of the `redis.asyncio.Redis` interface used by `RedisRateLimiter`."""
+
+    async def incr(self, name: str, amount: int = 1) -> int: ...
+
+    async def pexpire(self, name: str, time: int) -> Any: ...
+
+    async def pttl(self, name: str) -> int: ...
+
+    async def set(self, name: str, value: Any, px: int | None = None) -> Any: ...
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Rate limiter shared by any number of processes and hosts through a Redis-protocol server.
+
+    Time is split into slots of `burst / rate` seconds, each allowing `burst` requests. Every request claims
+    the first slot that still has room with `INCR`, then sleeps until that slot starts, so no scripting support
+    is needed on the server. Waiters within one process take turns claiming slots, so only one of them talks to the
+    server at a time, but sleep until their slot concurrently.
+
+    Args:
+        redis: Client for the server, such as `redis.asyncio.Redis`
+        rate: Max requests per second across all clients. Default 10
+        burst: Max requests per slot. Default 1
+        prefix: Prefix of the keys used. Default `scryfall:ratelimit`
+        default_retry_after: Seconds to back off on a 429 without a `Retry-After` header. Default 2
+
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        rate: float = 10.0,
+        burst: int = 1,
+        prefix: str = "scryfall:ratelimit",
+        default_retry_after: float = 2.0,
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.redis = redis
+        self.rate = rate
+        self.burst = burst
+        self.prefix = prefix
+        self.default_retry_after = default_retry_after
+        self._lock = asyncio.Lock()
+        self._next_slot = 0
+        """The earliest slot that may still have room, as far as this process knows"""
+
+    @property
+    def slot_width(self) -> float:
+        """Length of a slot in seconds"""
+        return self.burst / self.rate
+
+    async def _claim(self) -> int:
+        width = self.slot_width
+        slot = max(self._next_slot, int(time.time() / width))
+        while True:
+            key = f"{self.prefix}:{slot}"
+            count = await self.redis.incr(key)
+            if count == 1:
+                # Keep the key long enough for every client to see it, whatever their clock skew
+                await self.redis.pexpire(key, math.ceil((slot + 2) * width * 1000 - time.time() * 1000) + 10000)
+            if count <= self.burst:
+                self._next_slot = slot
+                return slot
+            slot += 1
+
+    async def wait(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            blocked = await self.redis.pttl(f"{self.prefix}:blocked")
+            if blocked > 0:
+                await asyncio.sleep(blocked / 1000)
+            # Only claiming a slot is done in turns, waiting for it isn't
+            async with self._lock:
+                slot = await self._claim()
+            delay = slot * self.slot_width - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if await self.redis.pttl(f"{self.prefix}:blocked") <= 0:
+                return
+
+    async def on_rate_limited(self, retry_after: float | None = None) -> None:
+        """
+        Block all clients for `retry_after` seconds.
+
+        Args:
+            retry_after: Seconds to wait, from the `Retry-After` header, if any
+
+        """
+        if retry_after is None:
+            retry_after = self.default_retry_after
+        await self.redis.set(f"{self.prefix}:blocked", 1, px=max(1, math.ceil(retry_after * 1000)))
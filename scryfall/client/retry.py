@@ -0,0 +1,200 @@
+import random
+import time
+from collections import deque
+
+import httpx
+
+from scryfall.client.error import CircuitOpenError
+
+DEFAULT_TRANSPORT_ERRORS: tuple[type[Exception], ...] = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+"""Transport errors that are worth retrying, as the request may not have reached Scryfall at all"""
+
+DEFAULT_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+"""Server error statuses that are retried"""
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of the requests made recently, so retries can't multiply the load on a failing server.
+
+    Args:
+        ratio: Retries allowed per request made within the window. Default 0.2
+        min_retries: Retries always allowed within the window, so rarely used clients can still retry. Default 10
+        window: Length of the sliding window in seconds. Default 10
+
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 10.0) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+    def _prune(self, now: float) -> None:
+        for times in (self._requests, self._retries):
+            while times and times[0] <= now - self.window:
+                times.popleft()
+
+    def record_request(self) -> None:
+        """Count a new request."""
+        now = time.monotonic()
+        self._prune(now)
+        self._requests.append(now)
+
+    def try_retry(self) -> bool:
+        """
+        Take a retry out of the budget.
+
+        Returns:
+            bool: False if the budget is used up, and the request should not be retried
+
+        """
+        now = time.monotonic()
+        self._prune(now)
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+            return False
+        self._retries.append(now)
+        return True
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while Scryfall is down, instead of having every caller wait through its retries.
+
+    The circuit opens after `failure_threshold` consecutive server or transport errors. While it is open, requests
+    raise `CircuitOpenError` without being sent. After `reset_timeout` seconds a single trial request is let through,
+    which closes the circuit if it succeeds or opens it again if it fails.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit. Default 5
+        reset_timeout: Seconds to wait before a trial request. Default 30
+
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_at: float | None = None
+        """When the current trial request was let through, if any"""
+
+    @property
+    def state(self) -> str:
+        """`closed`, `open` or `half_open`"""
+        if self.opened_at is None:
+            return "closed"
+        # A trial that never finished, such as a cancelled request, allows another one after the timeout
+        if time.monotonic() - (self._trial_at or self.opened_at) < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def check(self) -> None:
+        """Raise `CircuitOpenError` if a request may not be sent right now."""
+        state = self.state
+        if state == "open":
+            raise CircuitOpenError((self._trial_at or self.opened_at) + self.reset_timeout - time.monotonic())  # type: ignore
+        if state == "half_open":
+            self._trial_at = time.monotonic()
+
+    def record_success(self) -> None:
+        """Close the circuit after a request reached a healthy server."""
+        self.failures = 0
+        self.opened_at = None
+        self._trial_at = None
+
+    def record_failure(self) -> None:
+        """Count a server or transport error, opening the circuit once there are too many in a row."""
+        self.failures += 1
+        if self._trial_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._trial_at = None
+
+
+class RetryPolicy:
+    """
+    When and how requests are retried.
+
+    Rate limited requests (429) are retried once the rate limiter allows it, and server errors and transport errors
+    (timeouts, connection resets) after a jittered exponential backoff, each with their own per-request limit.
+    Retries of errors are also taken out of a shared `RetryBudget`, and errors are reported to an optional
+    `CircuitBreaker`.
+
+    Args:
+        rate_limit_retries: Max retries of a request after a 429. Default 3
+        error_retries: Max retries of a request after a server or transport error. Default 2
+        backoff: Base delay before retrying an error in seconds, doubled on every retry. Default 0.5
+        max_backoff: Max delay before retrying an error in seconds. Default 30
+        retry_statuses: Server error statuses to retry. Default `DEFAULT_RETRY_STATUSES`
+        transport_errors: httpx exceptions to retry. Default `DEFAULT_TRANSPORT_ERRORS`
+        budget: Budget for retries of errors, as a `RetryBudget` or the ratio of one. Default 0.2, None for no budget
+        circuit_breaker: Circuit breaker to report errors to, if any
+
+    """
+
+    def __init__(
+        self,
+        rate_limit_retries: int = 3,
+        error_retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        retry_statuses: frozenset[int] = DEFAULT_RETRY_STATUSES,
+        transport_errors: tuple[type[Exception], ...] = DEFAULT_TRANSPORT_ERRORS,
+        budget: RetryBudget | float | None = 0.2,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.rate_limit_retries = rate_limit_retries
+        self.error_retries = error_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self.transport_errors = transport_errors
+        self.budget: RetryBudget | None = RetryBudget(budget) if isinstance(budget, int | float) else budget
+        self.circuit_breaker = circuit_breaker
+
+    def get_delay(self, retry: int, retry_after: float | None = None) -> float:
+        """
+        Get the delay before retrying an error, with full jitter.
+
+        Args:
+            retry: Number of the retry, starting at 1
+            retry_after: Seconds to wait asked for by the server, which take precedence
+
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (retry - 1)))
+
+    def start(self) -> None:
+        """Called before sending a request for the first time."""
+        if self.budget is not None:
+            self.budget.record_request()
+
+    def before_attempt(self) -> None:
+        """Called before every attempt, raising `CircuitOpenError` if it may not be sent."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check()
+
+    def should_retry_error(self, retries: int) -> bool:
+        """
+        Check if a request may be retried after a server or transport error, and report the error.
+
+        Args:
+            retries: Number of times the request was already retried after an error
+
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+        if retries >= self.error_retries:
+            return False
+        return self.budget is None or self.budget.try_retry()
+
+    def record_success(self) -> None:
+        """Called after any response other than a server error, as the server is up."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
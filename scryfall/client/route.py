@@ -1,5 +1,6 @@
+import json
 from typing import Any, ClassVar
-from urllib.parse import quote as _uriquote
+from urllib.parse import quote as _uriquote, urlencode
 
 PAYLOAD_TYPE = dict[str, int | str | bool | list | None]
 
@@ -8,11 +9,14 @@ class Route:
     BASE: ClassVar[str] = "https://api.scryfall.com"
     path: str
     params: dict[str, str | int | bool]
+    coalesce: bool
+    """If identical concurrent requests may share one response, which is only safe for GET requests with a fixed answer"""
 
-    def __init__(self, method: str, path: str, **params: Any) -> None:
+    def __init__(self, method: str, path: str, coalesce: bool | None = None, **params: Any) -> None:
         self.path: str = path
         self.method: str = method
         self.params = params
+        self.coalesce = method == "GET" if coalesce is None else coalesce
 
     def __repr__(self) -> str:
         return f"<Route {self.endpoint}>"
@@ -33,9 +37,25 @@ class Route:
     @property
     def resolved_endpoint(self) -> str:
         """The endpoint for this route, with all major parameters resolved"""
-        return f"{self.method} {self.path}"
+        return f"{self.method} {self.resolved_path}"
 
     @property
     def url(self) -> str:
         """The full url for this route"""
         return f"{self.BASE}{self.resolved_path}"
+
+    def key(self, params: dict[str, Any] | None = None, body: Any = None) -> str:
+        """
+        A key identifying a request on this route.
+
+        Args:
+            params: Query string parameters
+            body: JSON body
+
+        """
+        key = f"{self.method} {self.url}"
+        if params:
+            key += "?" + urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+        if body is not None:
+            key += " " + json.dumps(body, sort_keys=True, default=str)
+        return key
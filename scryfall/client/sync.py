@@ -0,0 +1,164 @@
+import asyncio
+import functools
+import inspect
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine, Iterable, Iterator
+from typing import Any, TypeVar
+
+from scryfall.client import Scryfall
+from scryfall.client.batch import BatchResult
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def _blocking(method: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., T]:
+    @functools.wraps(method)
+    def wrapper(self: "SyncScryfall", *args: Any, **kwargs: Any) -> T:
+        return self.run(getattr(self.client, method.__name__)(*args, **kwargs))
+
+    return wrapper
+
+
+def _iterating(method: Callable[..., AsyncIterator[T]]) -> Callable[..., Iterator[T]]:
+    @functools.wraps(method)
+    def wrapper(self: "SyncScryfall", *args: Any, **kwargs: Any) -> Iterator[T]:
+        return self.iterate(getattr(self.client, method.__name__)(*args, **kwargs))
+
+    return wrapper
+
+
+class SyncScryfall:
+    """
+    Blocking client for the Scryfall API, for code that doesn't run an event loop.
+
+    Every call is run on a single background event loop thread owned by the client, so all calls share one
+    `Scryfall` client, with its connection pool, rate limiter and cache, no matter how many threads make them.
+    Request methods block until their result is ready, and streaming methods return regular iterators.
+
+    Models are the same as those of `Scryfall`, so their own request methods, such as `Card.get_set`, are coroutines
+    that can be run with `run`.
+
+    Args:
+        client: Async client to wrap. Defaults to a new `Scryfall` client built with the other arguments
+        kwargs: Arguments for the new `Scryfall` client
+
+    """
+
+    def __init__(self, client: Scryfall | None = None, **kwargs: Any) -> None:
+        self.client: Scryfall = client if client is not None else Scryfall(**kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="scryfall", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "SyncScryfall":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Run an awaitable on the client's event loop and wait for its result.
+
+        Args:
+            awaitable: Awaitable to run, such as `card.get_set()`
+
+        Returns:
+            The result of the awaitable
+
+        """
+        if threading.current_thread() is self._thread or self._loop.is_closed():
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            if self._loop.is_closed():
+                raise RuntimeError("Client is closed")
+            raise RuntimeError("Cannot block on the client's own event loop")
+
+        async def wait() -> T:
+            return await awaitable
+
+        return asyncio.run_coroutine_threadsafe(wait(), self._loop).result()
+
+    def iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """
+        Iterate over an async iterator on the client's event loop.
+
+        Args:
+            iterator: Async iterator, such as `page.iter_all()`
+
+        Returns:
+            Iterator: The items of the iterator, fetched as they are needed
+
+        """
+        try:
+            while (item := self.run(anext(iterator, _DONE))) is not _DONE:
+                yield item  # type: ignore
+        finally:
+            if hasattr(iterator, "aclose") and not self._loop.is_closed():
+                self.run(iterator.aclose())  # type: ignore
+
+    def map(
+        self,
+        func: Callable[..., Any],
+        *iterables: Iterable[Any],
+        concurrency: int | None = None,
+        ordered: bool = False,
+    ) -> Iterator[BatchResult[Any]]:
+        """
+        Call a request method for every item with bounded concurrency, like `Scryfall.map`.
+
+        Args:
+            func: Method to call, of this client or of the async client, such as `get_card_by_id`
+            iterables: Arguments to call it with, one iterable per positional argument
+            concurrency: Max requests in flight at once. Defaults to enough to saturate the rate limiter
+            ordered: If true, yield results in the order of the items instead of as they complete. Default False
+
+        Returns:
+            Iterator[BatchResult]: The result of every call
+
+        """
+        if getattr(func, "__self__", None) is self:
+            func = getattr(self.client, func.__name__)
+        return self.iterate(self.client.map(func, *iterables, concurrency=concurrency, ordered=ordered))
+
+    def close(self) -> None:
+        """Close the session and stop the event loop thread."""
+        if self._loop.is_closed():
+            return
+        self.run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    get_bulk_data = _blocking(Scryfall.get_bulk_data)
+    get_bulk_data_by_id = _blocking(Scryfall.get_bulk_data_by_id)
+    get_bulk_data_by_type = _blocking(Scryfall.get_bulk_data_by_type)
+    stream_bulk_data = _iterating(Scryfall.stream_bulk_data)
+    stream_bulk_cards = _iterating(Scryfall.stream_bulk_cards)
+
+    download_images = _iterating(Scryfall.download_images)
+    get_page = _blocking(Scryfall.get_page)
+
+    get_card_by_id = _blocking(Scryfall.get_card_by_id)
+    get_card_by_tcgplayer_id = _blocking(Scryfall.get_card_by_tcgplayer_id)
+    get_card_by_multiverse_id = _blocking(Scryfall.get_card_by_multiverse_id)
+    get_card_by_mtgo_id = _blocking(Scryfall.get_card_by_mtgo_id)
+    get_card_by_arena_id = _blocking(Scryfall.get_card_by_arena_id)
+    get_card_by_cardmarket_id = _blocking(Scryfall.get_card_by_cardmarket_id)
+    get_card_by_set_code_and_collector_number = _blocking(Scryfall.get_card_by_set_code_and_collector_number)
+    get_rulings_by_card_id = _blocking(Scryfall.get_rulings_by_card_id)
+    search_cards = _blocking(Scryfall.search_cards)
+    iter_search_cards = _iterating(Scryfall.iter_search_cards)
+    search_cards_named = _blocking(Scryfall.search_cards_named)
+    cards_autocomplete = _blocking(Scryfall.cards_autocomplete)
+    get_random_card = _blocking(Scryfall.get_random_card)
+    get_card_collection = _blocking(Scryfall.get_card_collection)
+
+    get_catalog = _blocking(Scryfall.get_catalog)
+
+    get_all_sets = _blocking(Scryfall.get_all_sets)
+    get_set_by_id = _blocking(Scryfall.get_set_by_id)
+    get_set_by_code = _blocking(Scryfall.get_set_by_code)
+    get_set_by_tcgplayer_id = _blocking(Scryfall.get_set_by_tcgplayer_id)
@@ -0,0 +1,20 @@
+from .corpus import CardCorpus, CardView
+from .names import NameIndex
+from .query import CardQuery
+from .search import SearchPlan, compile_search, search
+from .store import CardStore
+from .sync import CardChange, SyncResult, sync_bulk_data
+
+__all__ = [
+    "CardChange",
+    "CardCorpus",
+    "CardQuery",
+    "CardStore",
+    "CardView",
+    "NameIndex",
+    "SearchPlan",
+    "SyncResult",
+    "compile_search",
+    "search",
+    "sync_bulk_data",
+]
@@ -0,0 +1,461 @@
+import json
+import math
+from array import array
+from collections.abc import AsyncIterable, Iterable, Iterator
+from datetime import date
+from enum import Enum
+from functools import cache
+from types import FunctionType, MethodType, NoneType, UnionType
+from typing import Any, Literal, TYPE_CHECKING, Union, get_args, get_origin
+from uuid import UUID
+
+from pydantic import TypeAdapter
+
+from scryfall.models.cards import Card
+
+if TYPE_CHECKING:
+    from scryfall.client import Scryfall
+
+LEGALITIES = ("legal", "not_legal", "restricted", "banned")
+"""Legality codes, stored as their index + 1 so 0 means the format is missing"""
+
+_INT_NONE = -(2**63)
+_FLAGS_NONE = 1 << 31
+"""Bitset of a missing list, above the bits of every option"""
+# JSON escapes of private use characters, so templates can still be parsed without filling them in. They never clash
+# with the text, as `json.dumps` writes escapes in lowercase, and keep templates ASCII, which Python stores compactly
+_ID_PLACEHOLDER = "\\uE000"
+_ORACLE_ID_PLACEHOLDER = "\\uE001"
+
+
+@cache
+def _field_adapter(name: str) -> TypeAdapter:
+    return TypeAdapter(Card.model_fields[name].annotation)
+
+
+class _Column:
+    data: Any
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        raise NotImplementedError("Derived classes need to implement this.")
+
+    def get(self, index: int) -> Any:
+        raise NotImplementedError("Derived classes need to implement this.")
+
+
+class _UUIDColumn(_Column):
+    """16 bytes per row, all zeros for None"""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        self.data += UUID(str(value)).bytes if value is not None else bytes(16)
+
+    def get(self, index: int) -> UUID | None:
+        value = bytes(self.data[index * 16 : index * 16 + 16])
+        return UUID(bytes=value) if any(value) else None
+
+    def find(self, value: UUID) -> int | None:
+        start = 0
+        while (start := self.data.find(value.bytes, start)) != -1:
+            if start % 16 == 0:
+                return start // 16
+            start += 1
+        return None
+
+
+class _IntColumn(_Column):
+    def __init__(self) -> None:
+        self.data = array("q")
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        self.data.append(_INT_NONE if value is None else value)
+
+    def get(self, index: int) -> int | None:
+        value = self.data[index]
+        return None if value == _INT_NONE else value
+
+
+class _FloatColumn(_Column):
+    def __init__(self) -> None:
+        self.data = array("d")
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        self.data.append(math.nan if value is None else value)
+
+    def get(self, index: int) -> float | None:
+        value = self.data[index]
+        return None if math.isnan(value) else value
+
+
+class _BoolColumn(_Column):
+    """0 for False, 1 for True and 2 for None"""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        self.data.append(2 if value is None else int(value))
+
+    def get(self, index: int) -> bool | None:
+        value = self.data[index]
+        return None if value == 2 else bool(value)
+
+
+class _DateColumn(_Column):
+    """Proleptic Gregorian ordinals, 0 for None"""
+
+    def __init__(self) -> None:
+        self.data = array("i")
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        if value is None:
+            self.data.append(0)
+        else:
+            self.data.append((value if isinstance(value, date) else date.fromisoformat(value)).toordinal())
+
+    def get(self, index: int) -> date | None:
+        value = self.data[index]
+        return date.fromordinal(value) if value else None
+
+
+class _StringColumn(_Column):
+    """Indexes into a table of unique values, so every distinct string is only stored once"""
+
+    def __init__(self) -> None:
+        self.data = array("I")
+        self.values: list[str | None] = [None]
+        self._codes: dict[str | None, int] = {None: 0}
+
+    def code(self, value: str | None) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        self.data.append(self.code(value))
+
+    def get(self, index: int) -> str | None:
+        return self.values[self.data[index]]
+
+
+class _FlagsColumn(_Column):
+    """Bitsets of the values in a list, such as colors or finishes"""
+
+    def __init__(self, options: tuple[Any, ...]) -> None:
+        if len(options) >= _FLAGS_NONE.bit_length():
+            raise ValueError(f"Too many options for a bitset: {len(options)}")
+        self.data = array("I")
+        self.options = options
+        self._bits = {(x.value if isinstance(x, Enum) else x): 1 << i for i, x in enumerate(options)}
+
+    def mask(self, values: Iterable[Any]) -> int:
+        mask = 0
+        for value in values:
+            mask |= self._bits[value.value if isinstance(value, Enum) else value]
+        return mask
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        self.data.append(_FLAGS_NONE if value is None else self.mask(value))
+
+    def get(self, index: int) -> list[Any] | None:
+        mask = self.data[index]
+        if mask == _FLAGS_NONE:
+            return None
+        return [x for i, x in enumerate(self.options) if mask & (1 << i)]
+
+
+class _LegalitiesColumn(_Column):
+    """A byte column per format, holding the legality code of every card"""
+
+    def __init__(self) -> None:
+        self.data: dict[str, array] = {}
+        self._length = 0
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        value = value or {}
+        for format in value:
+            if format not in self.data:
+                self.data[format] = array("B", bytes(self._length))
+        for format, column in self.data.items():
+            legality = value.get(format)
+            column.append(0 if legality is None else LEGALITIES.index(legality) + 1)
+        self._length += 1
+
+    def get(self, index: int) -> dict[str, str]:
+        return {format: LEGALITIES[code - 1] for format, column in self.data.items() if (code := column[index])}
+
+
+class _PricesColumn(_Column):
+    """A float column per currency, NaN for missing prices"""
+
+    def __init__(self) -> None:
+        self.data: dict[str, array] = {}
+        self._length = 0
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        value = value or {}
+        for key in value:
+            if key not in self.data:
+                self.data[key] = array("d", [math.nan]) * self._length
+        for key, column in self.data.items():
+            price = value.get(key)
+            column.append(math.nan if price is None else float(price))
+        self._length += 1
+
+    def get(self, index: int) -> dict[str, str | None]:
+        prices = {}
+        for key, column in self.data.items():
+            price = column[index]
+            prices[key] = None if math.isnan(price) else f"{price:.2f}"
+        return prices
+
+
+class _JSONColumn(_StringColumn):
+    """
+    Any other value, as JSON with the card's IDs swapped for placeholders.
+
+    This turns URLs and other values that embed the card's IDs into templates that are shared by many cards.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
+
+    def append(self, value: Any, row: dict[str, Any]) -> None:
+        if value is None:
+            self.data.append(0)
+            return
+        text = json.dumps(value, separators=(",", ":")).replace(str(row["id"]), _ID_PLACEHOLDER)
+        if row.get("oracle_id"):
+            text = text.replace(str(row["oracle_id"]), _ORACLE_ID_PLACEHOLDER)
+        self.data.append(self.code(text))
+
+    def get_raw(self, index: int, id: UUID, oracle_id: UUID | None) -> Any:
+        text = self.values[self.data[index]]
+        if text is None:
+            return None
+        text = text.replace(_ID_PLACEHOLDER, str(id))
+        if oracle_id is not None:
+            text = text.replace(_ORACLE_ID_PLACEHOLDER, str(oracle_id))
+        return json.loads(text)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, UnionType):
+        args = [x for x in get_args(annotation) if x is not NoneType]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _column_for(name: str, annotation: Any) -> _Column:
+    if name == "legalities":
+        return _LegalitiesColumn()
+    if name == "prices":
+        return _PricesColumn()
+
+    annotation = _unwrap_optional(annotation)
+    if annotation is UUID:
+        return _UUIDColumn()
+    if annotation is bool:
+        return _BoolColumn()
+    if annotation is int:
+        return _IntColumn()
+    if annotation is float:
+        return _FloatColumn()
+    if annotation is date:
+        return _DateColumn()
+    if annotation is str or get_origin(annotation) is Literal:
+        return _StringColumn()
+    if get_origin(annotation) is list:
+        (item,) = get_args(annotation)
+        if isinstance(item, type) and issubclass(item, Enum):
+            return _FlagsColumn(tuple(item))
+        if get_origin(item) is Literal:
+            return _FlagsColumn(get_args(item))
+    return _JSONColumn(name)
+
+
+class CardView:
+    """
+    A row of a `CardCorpus`, which behaves like a `Card`.
+
+    Fields are rebuilt from the corpus' columns every time they are accessed.
+    """
+
+    __slots__ = ("_corpus", "_row")
+
+    def __init__(self, corpus: "CardCorpus", row: int) -> None:
+        self._corpus = corpus
+        self._row = row
+
+    @property
+    def _client(self) -> "Scryfall | None":
+        return self._corpus.client
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._corpus.columns:
+            return self._corpus.get_value(self._row, name)
+        attr = getattr(Card, name)
+        if isinstance(attr, FunctionType):
+            return MethodType(attr, self)
+        return attr
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CardView):
+            return self._corpus is other._corpus and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._corpus), self._row))
+
+    def __repr__(self) -> str:
+        return f"<CardView {self.name} ({self.set} {self.collector_number})>"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Rebuild the card's raw API data."""
+        return self._corpus.get_raw(self._row)
+
+    def to_card(self) -> Card:
+        """Rebuild the full `Card` model."""
+        return Card(**self.to_dict(), _client=self._client)
+
+
+class CardCorpus:
+    """
+    Compact, columnar in-memory collection of cards.
+
+    Every field of `Card` is stored in its own column: numbers and dates in arrays, strings and enums as codes
+    into a table of unique values, color, finish and game lists as bitsets, legalities as a byte per format
+    and URLs as templates shared between cards. Cards are handed out as `CardView` rows that behave like `Card`,
+    except that colors, finishes and games are listed in a fixed order.
+
+    Args:
+        client: Client to attach to the cards, for methods such as `Card.get_set`
+
+    """
+
+    def __init__(self, client: "Scryfall | None" = None) -> None:
+        self.client = client
+        self.columns: dict[str, _Column] = {
+            name: _column_for(name, field.annotation) for name, field in Card.model_fields.items()
+        }
+        self._length = 0
+
+    @classmethod
+    async def from_bulk_data(cls, client: "Scryfall", type: str = "default_cards") -> "CardCorpus":
+        """
+        Build a corpus from a card bulk data file.
+
+        Args:
+            client: Client to download the file with, which is attached to the cards
+            type: The bulk data type. Default `default_cards`
+
+        """
+        corpus = cls(client)
+        await corpus.extend_async(client.stream_bulk_data(type))
+        return corpus
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> CardView:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Card index out of range")
+        return CardView(self, index)
+
+    def __iter__(self) -> Iterator[CardView]:
+        for index in range(self._length):
+            yield CardView(self, index)
+
+    def append(self, card: Card | dict[str, Any]) -> None:
+        """
+        Add a card.
+
+        Args:
+            card: Card or raw card data
+
+        """
+        data = card.model_dump(mode="json") if isinstance(card, Card) else card
+        for name, column in self.columns.items():
+            column.append(data.get(name), data)
+        self._length += 1
+
+    def extend(self, cards: Iterable[Card | dict[str, Any]]) -> None:
+        """
+        Add cards.
+
+        Args:
+            cards: Cards or raw card data
+
+        """
+        for card in cards:
+            self.append(card)
+
+    async def extend_async(self, cards: AsyncIterable[Card | dict[str, Any]]) -> None:
+        """
+        Add cards from an async iterable, such as `Scryfall.stream_bulk_data`.
+
+        Args:
+            cards: Cards or raw card data
+
+        """
+        async for card in cards:
+            self.append(card)
+
+    def find(self, id: str | UUID) -> CardView | None:
+        """
+        Find a card by ID.
+
+        Args:
+            id: UUID of card
+
+        """
+        column: _UUIDColumn = self.columns["id"]  # type: ignore
+        index = column.find(id if isinstance(id, UUID) else UUID(id))
+        return None if index is None else CardView(self, index)
+
+    def get_value(self, index: int, name: str) -> Any:
+        """
+        Get a field of a card.
+
+        Args:
+            index: Row of the card
+            name: Name of the field
+
+        """
+        column = self.columns[name]
+        if isinstance(column, _JSONColumn):
+            value = column.get_raw(index, self.columns["id"].get(index), self.columns["oracle_id"].get(index))
+            return None if value is None else _field_adapter(name).validate_python(value)
+        return column.get(index)
+
+    def get_raw(self, index: int) -> dict[str, Any]:
+        """
+        Rebuild the raw API data of a card.
+
+        Args:
+            index: Row of the card
+
+        """
+        id = self.columns["id"].get(index)
+        oracle_id = self.columns["oracle_id"].get(index)
+        data = {}
+        for name, column in self.columns.items():
+            if isinstance(column, _JSONColumn):
+                value = column.get_raw(index, id, oracle_id)
+            else:
+                value = column.get(index)
+                if isinstance(value, (UUID, date)):
+                    value = str(value) if isinstance(value, UUID) else value.isoformat()
+                elif isinstance(value, list):
+                    value = [x.value if isinstance(x, Enum) else x for x in value]
+            if value is not None:
+                data[name] = value
+        return data
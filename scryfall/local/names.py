@@ -0,0 +1,288 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from scryfall.models.catalogs import Catalog
+
+if TYPE_CHECKING:
+    from scryfall.client import Scryfall
+
+AUTOCOMPLETE_LIMIT = 20
+"""Max number of names returned by `NameIndex.autocomplete`, like Scryfall"""
+
+EXTRA_LAYOUTS = frozenset({"token", "double_faced_token", "emblem", "art_series", "planar", "scheme", "vanguard"})
+"""Layouts of extra cards, which are left out of autocompletion unless asked for"""
+
+_SEPARATORS = re.compile(r"[-/_]")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_AMBIGUOUS = -1
+
+
+def normalize(name: str) -> str:
+    """
+    Normalize a card name for matching, ignoring case, accents and punctuation.
+
+    Args:
+        name: Card name or search string
+
+    Returns:
+        str: The normalized name, with words separated by single spaces
+
+    """
+    name = unicodedata.normalize("NFKD", name.casefold().replace("æ", "ae"))
+    name = "".join(x for x in name if not unicodedata.combining(x))
+    return " ".join(_PUNCTUATION.sub("", _SEPARATORS.sub(" ", name)).split())
+
+
+def _trigrams(name: str) -> set[str]:
+    padded = f"  {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def levenshtein(a: str, b: str, max_distance: int | None = None) -> int:
+    """
+    Edit distance between two strings.
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Stop early once the distance is known to exceed this
+
+    Returns:
+        int: The number of insertions, deletions and substitutions to turn `a` into `b`, or `max_distance + 1` if it
+            exceeds `max_distance`
+
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    """
+    In-process index of card names for autocompletion and fuzzy lookups, imitating Scryfall's.
+
+    Autocompletion looks names up in sorted arrays, first by the start of the name, then by the start of any of
+    its words. Fuzzy lookups try an exact match, then names containing every word of the query as a prefix, then
+    the closest names by edit distance among those sharing the most trigrams with the query.
+
+    Args:
+        names: Card names to index
+        extras: Names of extra cards, such as tokens, which are only autocompleted if asked for
+
+    """
+
+    def __init__(self, names: Iterable[str] = (), extras: Iterable[str] = ()) -> None:
+        self.names: list[str] = []
+        self._extra: list[bool] = []
+        self._normalized: dict[str, int] = {}
+        self._normalized_names: list[str] = []
+        """Normalized name of every name, so lookups don't normalize the names they compare to"""
+        self._prefixes: list[tuple[str, int]] = []
+        """Normalized names, sorted"""
+        self._words: list[tuple[str, int]] = []
+        """Normalized names from every word after the first one, sorted"""
+        self._trigrams: dict[str, list[int]] = {}
+        self._dirty = False
+
+        self.update(names)
+        self.update(extras, extra=True)
+
+    @classmethod
+    async def from_catalog(cls, client: "Scryfall") -> "NameIndex":
+        """
+        Build an index from the `card-names` catalog.
+
+        Args:
+            client: Client to request the catalog with
+
+        """
+        catalog = await client.get_catalog("card-names")
+        return cls(catalog.data)
+
+    @classmethod
+    async def from_bulk_data(cls, client: "Scryfall", type: str = "oracle_cards") -> "NameIndex":
+        """
+        Build an index from a card bulk data file, including extra cards.
+
+        Args:
+            client: Client to download the file with
+            type: The bulk data type. Default `oracle_cards`
+
+        """
+        index = cls()
+        async for card in client.stream_bulk_data(type):
+            if card.get("lang", "en") == "en":
+                index.add(card["name"], extra=card.get("layout") in EXTRA_LAYOUTS)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize(name) in self._normalized
+
+    def add(self, name: str, extra: bool = False) -> None:
+        """
+        Add a name to the index. Names that are already indexed are ignored.
+
+        Args:
+            name: Card name
+            extra: If true, the name is only autocompleted if extras are included. Default False
+
+        """
+        normalized = normalize(name)
+        if normalized in self._normalized:
+            # A card that is printed as both a regular card and an extra is not an extra
+            self._extra[self._normalized[normalized]] &= extra
+            return
+        index = self._normalized[normalized] = len(self.names)
+        self.names.append(name)
+        self._normalized_names.append(normalized)
+        self._extra.append(extra)
+
+        self._prefixes.append((normalized, index))
+        start = 0
+        while (start := normalized.find(" ", start) + 1) > 0:
+            self._words.append((normalized[start:], index))
+        for trigram in _trigrams(normalized.replace(" ", "")):
+            self._trigrams.setdefault(trigram, []).append(index)
+        self._dirty = True
+
+    def update(self, names: Iterable[str], extra: bool = False) -> None:
+        """
+        Add names to the index.
+
+        Args:
+            names: Card names
+            extra: If true, the names are only autocompleted if extras are included. Default False
+
+        """
+        for name in names:
+            self.add(name, extra)
+
+    def _sort(self) -> None:
+        if self._dirty:
+            self._prefixes.sort()
+            self._words.sort()
+            self._dirty = False
+
+    @staticmethod
+    def _scan(entries: list[tuple[str, int]], prefix: str) -> Iterator[int]:
+        for i in range(bisect_left(entries, (prefix,)), len(entries)):
+            text, index = entries[i]
+            if not text.startswith(prefix):
+                return
+            yield index
+
+    def complete(self, q: str, include_extras: bool = False, limit: int = AUTOCOMPLETE_LIMIT) -> list[str]:
+        """
+        Autocomplete a partial card name.
+
+        Args:
+            q: The string to autocomplete
+            include_extras: If true, extra cards (tokens, planes, vanguards, etc) will be included. Default False
+            limit: Max number of names to return. Default 20
+
+        Returns:
+            list[str]: Names starting with the string in alphabetical order, then names with a later word starting with it
+
+        """
+        prefix = normalize(q)
+        if len(prefix) < 2:
+            return []
+        self._sort()
+        results: dict[int, None] = {}
+        for entries in (self._prefixes, self._words):
+            for index in self._scan(entries, prefix):
+                if include_extras or not self._extra[index]:
+                    results[index] = None
+                    if len(results) >= limit:
+                        return [self.names[x] for x in results]
+        return [self.names[x] for x in results]
+
+    def autocomplete(self, q: str, include_extras: bool = False) -> Catalog:
+        """
+        Returns a Catalog containing up to 20 full card names for autocomplete purposes, like `cards_autocomplete`.
+
+        Args:
+            q: The string to autocomplete
+            include_extras: If true, extra cards (tokens, planes, vanguards, etc) will be included. Default False
+
+        """
+        names = self.complete(q, include_extras)
+        return Catalog(object="catalog", total_values=len(names), data=names)
+
+    def fuzzy(self, q: str) -> str | None:
+        """
+        Find the card name a possibly misspelled or partial string refers to, like `search_cards_named(fuzzy=...)`.
+
+        Args:
+            q: Fuzzy string to search for
+
+        Returns:
+            str | None: The matching name, or None if there is no match or it is ambiguous
+
+        """
+        query = normalize(q)
+        if not query:
+            return None
+        if (index := self._normalized.get(query)) is not None:
+            return self.names[index]
+
+        index = self._match_words(query)
+        if index == _AMBIGUOUS:
+            # Like Scryfall, which reports the query as ambiguous rather than guessing at its spelling
+            return None
+        if index is not None:
+            return self.names[index]
+        return self._match_spelling(query)
+
+    def _match_words(self, query: str) -> int | None:
+        """The only name containing every word of the query as the start of a word, in order, or `_AMBIGUOUS`"""
+        self._sort()
+        first, *rest = query.split(" ")
+        candidates = dict.fromkeys((*self._scan(self._prefixes, first), *self._scan(self._words, first)))
+        matches = []
+        for index in candidates:
+            words = self._normalized_names[index].split(" ")
+            position = 0
+            for word in (first, *rest):
+                while position < len(words) and not words[position].startswith(word):
+                    position += 1
+                if position == len(words):
+                    break
+                position += 1
+            else:
+                matches.append(index)
+                if len(matches) > 1:
+                    return _AMBIGUOUS
+        return matches[0] if matches else None
+
+    def _match_spelling(self, query: str, candidates: int = 50) -> str | None:
+        """The only closest name by edit distance, ignoring spaces, if close enough"""
+        compact = query.replace(" ", "")
+        shared = Counter(index for trigram in _trigrams(compact) for index in self._trigrams.get(trigram, ()))
+        max_distance = max(1, len(compact) // 4)
+        best: list[tuple[int, int]] = []
+        for index, _ in shared.most_common(candidates):
+            distance = levenshtein(compact, self._normalized_names[index].replace(" ", ""), max_distance)
+            if distance <= max_distance:
+                best.append((distance, index))
+        best.sort()
+        if not best or (len(best) > 1 and best[0][0] == best[1][0]):
+            return None
+        return self.names[best[0][1]]
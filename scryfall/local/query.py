@@ -0,0 +1,482 @@
+import json
+import math
+import operator
+import re
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from enum import Enum
+from typing import Any, Literal
+from weakref import WeakKeyDictionary
+
+from scryfall.local.corpus import (
+    LEGALITIES,
+    CardCorpus,
+    CardView,
+    _BoolColumn,
+    _DateColumn,
+    _FlagsColumn,
+    _FloatColumn,
+    _IntColumn,
+    _JSONColumn,
+    _LegalitiesColumn,
+    _PricesColumn,
+    _StringColumn,
+    _UUIDColumn,
+    _FLAGS_NONE,
+    _INT_NONE,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+Operator = Literal["==", "!=", "<", "<=", ">", ">=", "in", "not in"]
+FlagsOperator = Literal["subset", "superset", "exact", "intersects", "disjoint"]
+
+OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+PRICE_PREFIX = "prices."
+FACES_PREFIX = "card_faces."
+
+RANKINGS: dict[str, tuple[str, ...]] = {
+    "rarity": ("common", "uncommon", "rare", "special", "mythic", "bonus"),
+}
+"""Fields compared and sorted in a fixed order, rather than as numbers or alphabetically"""
+
+_arrays: "WeakKeyDictionary[CardCorpus, dict[str, tuple[int, Any]]]" = WeakKeyDictionary()
+
+
+def _cached(corpus: CardCorpus, key: str, build: Callable[[], Any]) -> Any:
+    """Cache arrays built from a corpus until more cards are added to it."""
+    cache = _arrays.setdefault(corpus, {})
+    length, value = cache.get(key, (-1, None))
+    if length != len(corpus):
+        value = build()
+        cache[key] = (len(corpus), value)
+    return value
+
+
+class CardQuery:
+    """
+    Vectorized query over a `CardCorpus`, built with NumPy.
+
+    Filters run as mask operations over the corpus' columns, converted to NumPy arrays once and cached until more
+    cards are added. Every method returns a new query, so queries can be reused and extended.
+
+    Numeric fields (including dates and `prices.<currency>`) support comparisons, and missing values never match.
+    String and enum fields support equality and `in`, and comparisons if they hold numbers, such as `power`, or have
+    a fixed order, such as `rarity`. Color, finish and game lists are matched as sets, or compared by their length.
+    Queries over the same corpus can be combined with `&`, `|` and `~`.
+
+    Example:
+        ```py
+        cards = (
+            CardQuery(corpus)
+            .legal("commander")
+            .where("cmc", "<=", 3)
+            .flags("color_identity", "subset", "WUB")
+            .order_by("edhrec_rank")
+            .all()
+        )
+        ```
+
+    Args:
+        corpus: The corpus to query
+
+    """
+
+    def __init__(self, corpus: CardCorpus) -> None:
+        if np is None:
+            raise ImportError("CardQuery requires numpy, install it with `pip install scryfall-py[numpy]`")
+        self.corpus = corpus
+        self._filters: tuple[Callable[[], Any], ...] = ()
+        self._order: tuple[tuple[str, bool], ...] = ()
+        self._unique: str | None = None
+        self._limit: int | None = None
+
+    def _copy(self, **changes: Any) -> "CardQuery":
+        query = CardQuery.__new__(CardQuery)
+        query.__dict__.update(self.__dict__ | changes)
+        return query
+
+    def _numeric(self, field: str) -> Any:
+        """A float array of a numeric field, with NaN for missing values"""
+
+        def build() -> Any:
+            if field.startswith(PRICE_PREFIX):
+                prices: _PricesColumn = self.corpus.columns["prices"]  # type: ignore
+                column = prices.data.get(field.removeprefix(PRICE_PREFIX))
+                return np.full(len(self.corpus), np.nan) if column is None else np.array(column, dtype=np.float64)
+
+            if field.startswith(FACES_PREFIX):
+                # One column per face, as a card matches if any of its faces does
+                name = field.removeprefix(FACES_PREFIX)
+                card_faces: _JSONColumn = self.corpus.columns["card_faces"]  # type: ignore
+                faces = [
+                    [_parse_number(name, x.get(name)) for x in json.loads(value or "[]")] for value in card_faces.values
+                ]
+                table = np.full((len(faces), max(map(len, faces), default=0)), np.nan)
+                for i, numbers in enumerate(faces):
+                    table[i, : len(numbers)] = numbers
+                return table[self._codes("card_faces")]
+
+            column = self.corpus.columns[field]
+            if isinstance(column, _StringColumn) and not isinstance(column, _JSONColumn):
+                table = np.array([_parse_number(field, x) for x in column.values], dtype=np.float64)
+                return table[self._codes(field)]
+            if isinstance(column, _FlagsColumn):
+                codes = self._flag_codes(field)
+                return np.where(codes == _FLAGS_NONE, np.nan, np.bitwise_count(codes).astype(np.float64))
+            if isinstance(column, _FloatColumn):
+                return np.array(column.data, dtype=np.float64)
+            if isinstance(column, _IntColumn):
+                values = np.array(column.data, dtype=np.int64)
+                return np.where(values == _INT_NONE, np.nan, values.astype(np.float64))
+            if isinstance(column, _DateColumn):
+                values = np.array(column.data, dtype=np.float64)
+                values[values == 0] = np.nan
+                return values
+            raise ValueError(f"{field} is not a numeric field")
+
+        return _cached(self.corpus, f"numeric:{field}", build)
+
+    def _codes(self, field: str) -> Any:
+        """The raw column data of a field as an array"""
+        return _cached(self.corpus, f"codes:{field}", lambda: np.array(self.corpus.columns[field].data))
+
+    def _flag_codes(self, field: str) -> Any:
+        """The bitsets of a list field, falling back to the union of the card's faces if it is only set on them"""
+
+        def build() -> Any:
+            column: _FlagsColumn = self.corpus.columns[field]  # type: ignore
+            faces: _JSONColumn = self.corpus.columns["card_faces"]  # type: ignore
+            table = np.array([_faces_flags(column, field, x) for x in faces.values], dtype=np.uint32)
+            codes = self._codes(field)
+            return np.where(codes == _FLAGS_NONE, table[self._codes("card_faces")], codes)
+
+        return _cached(self.corpus, f"flags:{field}", build)
+
+    def _ranks(self, field: str) -> Any:
+        """The sort rank of every card's value for a string field, with numbers first in numeric order"""
+        if field in RANKINGS:
+            return self._numeric(field)
+
+        def build() -> Any:
+            column: _StringColumn = self.corpus.columns[field]  # type: ignore
+
+            def key(code: int) -> tuple[bool, float, str]:
+                value: str = column.values[code]  # type: ignore
+                number = _parse_number(field, value)
+                # Values such as `*` or `X` powers sort after the numbers, alphabetically
+                return math.isnan(number), 0.0 if math.isnan(number) else number, value.casefold()
+
+            order = sorted(range(1, len(column.values)), key=key)
+            ranks = np.full(len(column.values), np.nan)
+            ranks[order] = np.arange(len(order))
+            return ranks[self._codes(field)]
+
+        return _cached(self.corpus, f"ranks:{field}", build)
+
+    def where(self, field: str, op: Operator, value: Any) -> "CardQuery":
+        """
+        Filter on a field's value.
+
+        Args:
+            field: Name of a `Card` field, `prices.<currency>`, such as `prices.usd`, or `card_faces.<field>` for a number on any of the card's faces
+            op: Comparison operator
+            value: Value to compare to, or an iterable of values for `in` and `not in`
+
+        """
+        column = None if field.startswith((PRICE_PREFIX, FACES_PREFIX)) else self.corpus.columns[field]
+        categorical = isinstance(column, _BoolColumn) or (
+            isinstance(column, _StringColumn) and not isinstance(value, (int, float))
+        )
+
+        if op in ("in", "not in") or (op in ("==", "!=") and categorical):
+            values = [x.value if isinstance(x, Enum) else x for x in ([value] if op in ("==", "!=") else value)]
+            negate = op in ("!=", "not in")
+
+            def evaluate() -> Any:
+                if isinstance(column, _StringColumn):
+                    codes = [column._codes[x] for x in values if x in column._codes]
+                    mask = np.isin(self._codes(field), codes)
+                elif isinstance(column, _BoolColumn):
+                    mask = np.isin(self._codes(field), [2 if x is None else int(x) for x in values])
+                else:
+                    mask = _any_face(np.isin(self._numeric(field), [_parse_number(field, x) for x in values]))
+                return ~mask if negate else mask
+
+        else:
+            if op not in OPERATORS:
+                raise ValueError(f"Invalid operator: {op}")
+            if isinstance(column, _BoolColumn):
+                raise ValueError(f"{field} only supports ==, !=, in and not in")
+            compare = OPERATORS[op]
+            number = _parse_number(field, value) if isinstance(value, str) else _to_number(value)
+
+            def evaluate() -> Any:
+                values = self._numeric(field)
+                mask = compare(values, number)
+                # NaN != x is true, but missing values should never match
+                return _any_face(mask & ~np.isnan(values) if op == "!=" else mask)
+
+        return self._copy(_filters=(*self._filters, evaluate))
+
+    def flags(self, field: str, op: FlagsOperator, values: Iterable[Any] | str) -> "CardQuery":
+        """
+        Filter on a color, finish or game list as a set. Cards that only list colors on their faces use the union of them.
+
+        Args:
+            field: Name of the field, such as `colors`, `color_identity`, `finishes` or `games`
+            op: How the field's values relate to `values`
+            values: Values to compare to. Colors may also be given as a string, such as `WUB`
+
+        """
+        column = self.corpus.columns[field]
+        if not isinstance(column, _FlagsColumn):
+            raise ValueError(f"{field} is not a list of flags")
+        mask = column.mask(values)
+
+        def evaluate() -> Any:
+            codes = self._flag_codes(field)
+            present = (codes & _FLAGS_NONE) == 0
+            if op == "subset":
+                result = (codes & mask) == codes
+            elif op == "superset":
+                result = (codes & mask) == mask
+            elif op == "exact":
+                result = codes == mask
+            elif op == "intersects":
+                result = (codes & mask) != 0
+            elif op == "disjoint":
+                result = (codes & mask) == 0
+            else:
+                raise ValueError(f"Invalid operator: {op}")
+            return result & present
+
+        return self._copy(_filters=(*self._filters, evaluate))
+
+    def match(self, field: str, pattern: str | re.Pattern) -> "CardQuery":
+        """
+        Filter on a text field containing a string, ignoring case, or matching a regular expression.
+
+        Every distinct value is only tested once, and the result is cached until more cards are added.
+
+        Args:
+            field: Name of a text field or list of strings, such as `oracle_text` or `keywords`. Fields of card faces are given as `card_faces.<field>`
+            pattern: String to look for, or a compiled regular expression to search with
+
+        """
+        name, _, path = field.partition(".")
+        column = self.corpus.columns[name]
+        if not isinstance(column, _StringColumn):
+            raise ValueError(f"{field} is not a text field")
+
+        if isinstance(pattern, str):
+            needle = pattern.casefold()
+
+            def test(text: str) -> bool:
+                return needle in text.casefold()
+
+        else:
+
+            def test(text: str) -> bool:
+                return pattern.search(text) is not None
+
+        def matches(value: str | None) -> bool:
+            if value is None:
+                return False
+            if not isinstance(column, _JSONColumn):
+                return test(value)
+            items = json.loads(value)
+            for item in items if isinstance(items, list) else [items]:
+                text = item.get(path) if path and isinstance(item, dict) else item
+                if isinstance(text, str) and test(text):
+                    return True
+            return False
+
+        def build() -> Any:
+            table = np.fromiter(map(matches, column.values), dtype=bool, count=len(column.values))
+            return table[self._codes(name)]
+
+        key = f"match:{field}:{pattern!r}"
+        return self._copy(_filters=(*self._filters, lambda: _cached(self.corpus, key, build)))
+
+    def filter(self, evaluate: Callable[[], Any]) -> "CardQuery":
+        """
+        Filter with a custom function.
+
+        Args:
+            evaluate: Function returning a boolean array of which cards in the corpus match
+
+        """
+        return self._copy(_filters=(*self._filters, evaluate))
+
+    def legality(self, format: str, *legalities: Literal["legal", "not_legal", "restricted", "banned"]) -> "CardQuery":
+        """
+        Filter on a card's legality in a format.
+
+        Args:
+            format: Format name, such as `commander`
+            legalities: Allowed legalities
+
+        """
+        column: _LegalitiesColumn = self.corpus.columns["legalities"]  # type: ignore
+        codes = [LEGALITIES.index(x) + 1 for x in legalities]
+
+        def evaluate() -> Any:
+            if format not in column.data:
+                return np.zeros(len(self.corpus), dtype=bool)
+            values = _cached(self.corpus, f"legality:{format}", lambda: np.array(column.data[format], dtype=np.uint8))
+            return np.isin(values, codes)
+
+        return self._copy(_filters=(*self._filters, evaluate))
+
+    def legal(self, format: str) -> "CardQuery":
+        """
+        Filter on cards that are legal or restricted in a format.
+
+        Args:
+            format: Format name, such as `commander`
+
+        """
+        return self.legality(format, "legal", "restricted")
+
+    def order_by(self, field: str, descending: bool = False) -> "CardQuery":
+        """
+        Sort by a field, after any earlier sorts. Missing values are sorted last.
+
+        Strings holding numbers, such as `power` or `collector_number`, are sorted by value before any other strings.
+
+        Args:
+            field: Name of a numeric or string field, or `prices.<currency>`
+            descending: If true, sort from high to low. Default False
+
+        """
+        return self._copy(_order=(*self._order, (field, descending)))
+
+    def unique(self, field: str | None) -> "CardQuery":
+        """
+        Only keep the first card, in sort order, for every value of a field. Cards missing the field are all kept.
+
+        Args:
+            field: Name of the field, such as `oracle_id` or `illustration_id`, or None to keep every card
+
+        """
+        return self._copy(_unique=field)
+
+    def limit(self, limit: int | None) -> "CardQuery":
+        """
+        Limit the number of results.
+
+        Args:
+            limit: Max number of results, or None for all
+
+        """
+        return self._copy(_limit=limit)
+
+    def mask(self) -> Any:
+        """A boolean array of which cards match all filters."""
+        mask = np.ones(len(self.corpus), dtype=bool)
+        for evaluate in self._filters:
+            mask &= evaluate()
+        return mask
+
+    def indices(self) -> Any:
+        """The row indices of the matching cards, sorted and limited."""
+        indices = np.flatnonzero(self.mask())
+        if self._order:
+            keys = []
+            for field, descending in reversed(self._order):
+                column = None if field.startswith(PRICE_PREFIX) else self.corpus.columns[field]
+                values = self._ranks(field) if isinstance(column, _StringColumn) else self._numeric(field)
+                values = values[indices]
+                keys.append(-values if descending else values)
+            # NaN sorts last either way, as negating it keeps it NaN
+            indices = indices[np.lexsort(keys)]
+        if self._unique is not None:
+            indices = self._first_of_each(self._unique, indices)
+        if self._limit is not None:
+            indices = indices[: self._limit]
+        return indices
+
+    def _first_of_each(self, field: str, indices: Any) -> Any:
+        column = self.corpus.columns[field]
+        if isinstance(column, _UUIDColumn):
+            values = _cached(
+                self.corpus, f"uuid:{field}", lambda: np.array(column.data, dtype=np.uint8).reshape(-1, 16)
+            )
+            missing = ~values.any(axis=1)
+            values = values.view("V16").ravel()
+        else:
+            values = self._codes(field) if isinstance(column, (_StringColumn, _FlagsColumn)) else self._numeric(field)
+            missing = values == 0 if isinstance(column, _StringColumn) else np.isnan(values.astype(np.float64))
+        _, first = np.unique(values[indices], return_index=True)
+        keep = np.zeros(len(indices), dtype=bool)
+        keep[first] = True
+        keep |= missing[indices]
+        return indices[keep]
+
+    def count(self) -> int:
+        """The number of matching cards, ignoring the limit."""
+        return int(self.mask().sum())
+
+    def all(self) -> list[CardView]:
+        """The matching cards, sorted and limited."""
+        return [CardView(self.corpus, int(x)) for x in self.indices()]
+
+    def __iter__(self) -> Iterator[CardView]:
+        return iter(self.all())
+
+    def _combine(self, other: "CardQuery", combine: Callable[[Any, Any], Any]) -> "CardQuery":
+        if other.corpus is not self.corpus:
+            raise ValueError("Only queries over the same corpus can be combined")
+        return CardQuery(self.corpus).filter(lambda: combine(self.mask(), other.mask()))
+
+    def __and__(self, other: "CardQuery") -> "CardQuery":
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other: "CardQuery") -> "CardQuery":
+        return self._combine(other, operator.or_)
+
+    def __invert__(self) -> "CardQuery":
+        return CardQuery(self.corpus).filter(lambda: ~self.mask())
+
+
+def _any_face(mask: Any) -> Any:
+    return mask.any(axis=1) if mask.ndim == 2 else mask
+
+
+def _faces_flags(column: _FlagsColumn, field: str, value: str | None) -> int:
+    """The union of a list field over a card's faces"""
+    mask = _FLAGS_NONE
+    for face in json.loads(value) if value is not None else []:
+        if face.get(field) is not None:
+            mask = (mask & ~_FLAGS_NONE) | column.mask(face[field])
+    return mask
+
+
+def _parse_number(field: str, value: Any) -> float:
+    """Parse a value stored as a string, such as `power`, into a number, or NaN if it isn't one"""
+    if field in RANKINGS:
+        return float(RANKINGS[field].index(value)) if value in RANKINGS[field] else math.nan
+    try:
+        return _to_number(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_number(value: Any) -> float:
+    if isinstance(value, date):
+        return float(value.toordinal())
+    if isinstance(value, Enum):
+        value = value.value
+    return float(value)
@@ -0,0 +1,654 @@
+import operator
+import re
+from collections.abc import Callable
+from datetime import date
+from functools import lru_cache, reduce
+from typing import Literal, NamedTuple
+
+from scryfall.local.corpus import CardCorpus, CardView
+from scryfall.local.names import EXTRA_LAYOUTS
+from scryfall.local.query import RANKINGS, CardQuery
+
+Unique = Literal["cards", "art", "prints"]
+Order = Literal[
+    "name",
+    "set",
+    "released",
+    "rarity",
+    "color",
+    "usd",
+    "tix",
+    "eur",
+    "cmc",
+    "power",
+    "toughness",
+    "edhrec",
+    "penny",
+    "artist",
+    "review",
+]
+Direction = Literal["auto", "asc", "desc"]
+
+Node = Callable[[CardQuery], CardQuery]
+"""A compiled filter, which narrows down an unfiltered query"""
+
+_DIRECTIVE: Node = lambda query: query  # noqa: E731
+"""Stands in for directives such as `order:name` in the parse tree, which set options instead of filtering"""
+
+ORDERS: dict[str, tuple[tuple[str, bool], ...]] = {
+    "name": (("name", False),),
+    "set": (("set", False), ("collector_number", False)),
+    "released": (("released_at", True),),
+    "rarity": (("rarity", True),),
+    "color": (("colors", False),),
+    "usd": (("prices.usd", True),),
+    "tix": (("prices.tix", True),),
+    "eur": (("prices.eur", True),),
+    "cmc": (("cmc", False),),
+    "power": (("power", False),),
+    "toughness": (("toughness", False),),
+    "edhrec": (("edhrec_rank", False),),
+    "penny": (("penny_rank", False),),
+    "artist": (("artist", False),),
+    "review": (("set", False), ("collector_number", False)),
+}
+"""Fields to sort by for every `order`, and whether `dir=auto` sorts them descending"""
+
+UNIQUE_FIELDS: dict[str, str | None] = {"cards": "oracle_id", "art": "illustration_id", "prints": None}
+
+EXTRA_SET_TYPES = ("token", "memorabilia", "minigame")
+
+COLORS: dict[str, str] = {
+    "white": "W",
+    "blue": "U",
+    "black": "B",
+    "red": "R",
+    "green": "G",
+    "azorius": "WU",
+    "dimir": "UB",
+    "rakdos": "BR",
+    "gruul": "RG",
+    "selesnya": "GW",
+    "orzhov": "WB",
+    "izzet": "UR",
+    "golgari": "BG",
+    "boros": "RW",
+    "simic": "GU",
+    "bant": "GWU",
+    "esper": "WUB",
+    "grixis": "UBR",
+    "jund": "BRG",
+    "naya": "RGW",
+    "abzan": "WBG",
+    "jeskai": "URW",
+    "sultai": "BGU",
+    "mardu": "RWB",
+    "temur": "GUR",
+}
+
+RARITIES = {"c": "common", "u": "uncommon", "r": "rare", "s": "special", "m": "mythic", "b": "bonus"}
+
+COMPARISONS = {":": "==", "=": "==", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+PERMANENT_TYPES = re.compile(r"\b(Artifact|Battle|Creature|Enchantment|Land|Planeswalker)\b")
+SPELL_TYPES = re.compile(r"\b(Artifact|Battle|Creature|Enchantment|Instant|Planeswalker|Sorcery)\b")
+HISTORIC_TYPES = re.compile(r"\b(Artifact|Legendary|Saga)\b")
+LEGENDARY_CREATURE = re.compile(r"\bLegendary\b.*\bCreature\b")
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<paren>[()])
+        |(?P<negate>-)(?=\S)
+        |(?P<exact>!)(?P<name>"(?:[^"\\]|\\.)*"|[^\s()]+)
+        |(?:(?P<key>[a-zA-Z]+)(?P<op>!=|<=|>=|:|=|<|>))?
+         (?P<value>"(?:[^"\\]|\\.)*"|/(?:[^/\\]|\\.)*/|[^\s()]+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class _Token(NamedTuple):
+    kind: Literal["(", ")", "-", "or", "and", "term"]
+    position: int
+    key: str | None = None
+    op: str | None = None
+    value: str = ""
+    regex: bool = False
+
+
+class SearchPlan:
+    """
+    A compiled search query, which can be run against any number of corpora.
+
+    Args:
+        filter: Compiled filter, or None to match every card
+        unique: The strategy for omitting cards
+        order: The method to sort returned cards
+        dir: Direction to sort cards
+        include_extras: If true, extra cards (tokens, planes, etc) are included
+        include_multilingual: If true, cards in every language are included
+        include_variations: If true, rare card variants are included
+
+    """
+
+    def __init__(
+        self,
+        filter: Node | None,
+        unique: Unique = "cards",
+        order: Order = "name",
+        dir: Direction = "auto",
+        include_extras: bool = False,
+        include_multilingual: bool = False,
+        include_variations: bool = False,
+    ) -> None:
+        self.filter = filter
+        self.unique = unique
+        self.order = order
+        self.dir = dir
+        self.include_extras = include_extras
+        self.include_multilingual = include_multilingual
+        self.include_variations = include_variations
+
+    def query(self, corpus: CardCorpus) -> CardQuery:
+        """
+        Build the query over a corpus.
+
+        Args:
+            corpus: Corpus to search
+
+        Returns:
+            CardQuery: The query, which can be narrowed down further
+
+        """
+        query = CardQuery(corpus)
+        if self.filter is not None:
+            query = self.filter(query)
+        if not self.include_extras:
+            query = query.where("layout", "not in", EXTRA_LAYOUTS).where("set_type", "not in", EXTRA_SET_TYPES)
+        if not self.include_variations:
+            query = query.where("variation", "==", False)
+        if not self.include_multilingual:
+            query = query.where("lang", "==", "en")
+
+        for field, descending in ORDERS[self.order]:
+            query = query.order_by(field, descending if self.dir == "auto" else self.dir == "desc")
+        # Break ties by name, then show the most recent printing of every card
+        return query.order_by("name").order_by("released_at", descending=True).unique(UNIQUE_FIELDS[self.unique])
+
+    def execute(self, corpus: CardCorpus, limit: int | None = None) -> list[CardView]:
+        """
+        Run the search against a corpus.
+
+        Args:
+            corpus: Corpus to search
+            limit: Max number of cards to return, or None for all. Default None
+
+        Returns:
+            list[CardView]: The matching cards
+
+        """
+        return self.query(corpus).limit(limit).all()
+
+
+def compile_search(
+    q: str,
+    unique: Unique = "cards",
+    order: Order = "name",
+    dir: Direction = "auto",
+    include_extras: bool = False,
+    include_multilingual: bool = False,
+    include_variations: bool = False,
+) -> SearchPlan:
+    """
+    Compile a Scryfall search query to run against a local `CardCorpus`.
+
+    Supports names, `!"exact names"`, `t:`, `o:`, `c:`, `id:`, `mv:`/`cmc:`, `pow:`, `tou:`, `loy:`, `f:`/`legal:`,
+    `banned:`, `restricted:`, `r:`, `s:`/`e:`, `st:`, `a:`, `ft:`, `kw:`, `lang:`, `game:`, `year:`, `date:`,
+    `usd:`, `eur:`, `tix:`, `is:` and `not:`, with `and`, `or`, parentheses, `-` for negation and `/regex/` for text.
+    `order:`, `dir:`, `unique:` and `include:extras` in the query override the arguments, like on Scryfall.
+
+    Args:
+        q: A fulltext search query. Max length: 1000 Unicode characters
+        unique: The strategy for omitting cards. Default `cards`
+        order: The method to sort returned cards. Default `name`
+        dir: Direction to sort cards. Default `auto`
+        include_extras: If true, extra cards (tokens, planes, etc) will be included. Default False
+        include_multilingual: If true, cards in every language will be included. Default False
+        include_variations: If true, rare card variants will by included. Default False
+
+    Returns:
+        SearchPlan: The compiled query
+
+    """
+    if len(q) > 1000:
+        raise ValueError("Query can only be max of 1000 Unicode characters")
+    if order not in ORDERS:
+        raise ValueError(f"Invalid order: {order}")
+
+    filter, options = _parse(q)
+    settings = {
+        "unique": unique,
+        "order": order,
+        "dir": dir,
+        "include_extras": include_extras,
+        "include_multilingual": include_multilingual,
+        "include_variations": include_variations,
+    }
+    return SearchPlan(filter, **(settings | dict(options)))  # type: ignore
+
+
+def search(corpus: CardCorpus, q: str, limit: int | None = None, **kwargs) -> list[CardView]:
+    """
+    Search a local `CardCorpus` with a Scryfall search query.
+
+    Args:
+        corpus: Corpus to search
+        q: A fulltext search query
+        limit: Max number of cards to return, or None for all. Default None
+        kwargs: Any other arguments of `compile_search`, such as `order`
+
+    Returns:
+        list[CardView]: The matching cards
+
+    """
+    return compile_search(q, **kwargs).execute(corpus, limit)
+
+
+@lru_cache(maxsize=1024)
+def _parse(q: str) -> tuple[Node | None, tuple[tuple[str, str | bool], ...]]:
+    parser = _Parser(_tokenize(q))
+    node = parser.parse()
+    return node, tuple(parser.options.items())
+
+
+def _tokenize(q: str) -> list[_Token]:
+    tokens = []
+    position = 0
+    while q[position:].strip():
+        match = _TOKEN.match(q, position)
+        if match is None or not match.group(0).strip():
+            raise ValueError(f"Invalid search query at position {position}: {q[position:]}")
+        start = position + len(match.group(0)) - len(match.group(0).lstrip())
+        if match["paren"]:
+            tokens.append(_Token(match["paren"], start))  # type: ignore
+        elif match["negate"]:
+            tokens.append(_Token("-", start))
+        elif match["exact"]:
+            tokens.append(_Token("term", start, "!", ":", _unquote(match["name"])))
+        elif match["key"] is None and match["value"].lower() in ("or", "and"):
+            tokens.append(_Token(match["value"].lower(), start))  # type: ignore
+        else:
+            value = match["value"]
+            regex = match["key"] is not None and len(value) > 1 and value[0] == value[-1] == "/"
+            tokens.append(
+                _Token(
+                    "term",
+                    start,
+                    match["key"].lower() if match["key"] else None,
+                    match["op"],
+                    value[1:-1] if regex else _unquote(value),
+                    regex,
+                )
+            )
+        position = match.end()
+    return tokens
+
+
+def _unquote(value: str) -> str:
+    if len(value) > 1 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+class _Parser:
+    """Recursive descent parser, where `or` binds looser than `and`, which may be left out"""
+
+    def __init__(self, tokens: list[_Token]) -> None:
+        self.tokens = tokens
+        self.position = 0
+        self.options: dict[str, str | bool] = {}
+
+    def peek(self) -> _Token | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self) -> _Token:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self) -> Node | None:
+        if not self.tokens:
+            return None
+        node = self.parse_or()
+        if (token := self.peek()) is not None:
+            raise ValueError(f"Unexpected {token.kind!r} at position {token.position}")
+        return None if node is _DIRECTIVE else node
+
+    def parse_or(self) -> Node | None:
+        nodes = [self.parse_and()]
+        while (token := self.peek()) is not None and token.kind == "or":
+            self.next()
+            nodes.append(self.parse_and())
+        # Directives aren't filters, so `t:elf or order:name` only matches elves, rather than every card
+        nodes = [x for x in nodes if x is not _DIRECTIVE]
+        if not nodes:
+            return _DIRECTIVE
+        if len(nodes) == 1:
+            return nodes[0]
+        if None in nodes:
+            return None
+        return lambda query: reduce(operator.or_, (node(query) for node in nodes))  # type: ignore
+
+    def parse_and(self) -> Node | None:
+        nodes = [self.parse_unary()]
+        while (token := self.peek()) is not None and token.kind not in ("or", ")"):
+            if token.kind == "and":
+                self.next()
+            nodes.append(self.parse_unary())
+        nodes = [x for x in nodes if x is not _DIRECTIVE]
+        if not nodes:
+            return _DIRECTIVE
+        nodes = [x for x in nodes if x is not None]
+        if not nodes:
+            return None
+        if len(nodes) == 1:
+            return nodes[0]
+        return lambda query: reduce(operator.and_, (node(query) for node in nodes))
+
+    def parse_unary(self) -> Node | None:
+        if self.peek() is None:
+            raise ValueError("Unexpected end of query")
+        token = self.next()
+        if token.kind == "-":
+            node = self.parse_unary()
+            return node if node is None or node is _DIRECTIVE else lambda query: ~node(query)
+        if token.kind == "(":
+            node = self.parse_or()
+            if (end := self.peek()) is None or end.kind != ")":
+                raise ValueError(f"Unclosed parenthesis at position {token.position}")
+            self.next()
+            return node
+        if token.kind != "term":
+            raise ValueError(f"Unexpected {token.kind!r} at position {token.position}")
+        return self.compile_term(token)
+
+    def compile_term(self, token: _Token) -> Node | None:
+        if token.key is None:
+            return _text("name", token.value, False)
+        if token.key == "!":
+            pattern = re.compile(f"^{re.escape(token.value)}$", re.IGNORECASE)
+            return lambda query: query.match("name", pattern) | query.match("card_faces.name", pattern)
+
+        key = _ALIASES.get(token.key, token.key)
+        if key in _DIRECTIVES:
+            self.options.update(_DIRECTIVES[key](token.value.lower()))
+            return _DIRECTIVE
+        if key == "lang":
+            self.options["include_multilingual"] = True
+        if key not in _FILTERS:
+            raise ValueError(f"Unknown search keyword {token.key!r} at position {token.position}")
+        try:
+            return _FILTERS[key](token.op, token.value, token.regex)  # type: ignore
+        except ValueError as e:
+            raise ValueError(f"Invalid {token.key!r} filter at position {token.position}: {e}") from None
+
+
+def _text(field: str, value: str, regex: bool, *faces: str) -> Node:
+    pattern = re.compile(value, re.IGNORECASE) if regex else value
+    fields = (field, *faces)
+    return lambda query: reduce(operator.or_, (query.match(x, pattern) for x in fields))
+
+
+def _text_filter(field: str, faces: bool = True) -> Callable[[str, str, bool], Node]:
+    def compile(op: str, value: str, regex: bool) -> Node:
+        if op not in (":", "="):
+            raise ValueError(f"only supports : and =, not {op}")
+        return _text(field, value, regex, *((f"card_faces.{field}",) if faces else ()))
+
+    return compile
+
+
+def _number_filter(field: str, faces: bool = False) -> Callable[[str, str, bool], Node]:
+    def compile(op: str, value: str, regex: bool) -> Node:
+        number = float(value)
+        if faces:
+            return lambda query: (
+                query.where(field, COMPARISONS[op], number)  # type: ignore
+                | query.where(f"card_faces.{field}", COMPARISONS[op], number)  # type: ignore
+            )
+        return lambda query: query.where(field, COMPARISONS[op], number)  # type: ignore
+
+    return compile
+
+
+def _color_filter(field: str, default: str) -> Callable[[str, str, bool], Node]:
+    """Colors are matched as sets, where `:` means `default`, or compared by their number"""
+
+    def compile(op: str, value: str, regex: bool) -> Node:
+        value = value.lower()
+        if value.isdigit():
+            return _number_filter(field)(op, value, regex)
+        if value in ("m", "multicolor"):
+            return lambda query: query.where(field, ">=" if op in (":", "=") else "<", 2)
+        if value in ("c", "colorless"):
+            value = ""
+            op = "=" if op == ":" else op
+        colors = COLORS.get(value, value).upper()
+        if set(colors) - set("WUBRG"):
+            raise ValueError(f"unknown color {value!r}")
+
+        if op == ":":
+            op = default
+        if op == "=":
+            return lambda query: query.flags(field, "exact", colors)
+        if op == "!=":
+            return lambda query: ~query.flags(field, "exact", colors)
+        relation = "subset" if op in ("<", "<=") else "superset"
+        if op in ("<=", ">="):
+            return lambda query: query.flags(field, relation, colors)
+        return lambda query: query.flags(field, relation, colors) & ~query.flags(field, "exact", colors)
+
+    return compile
+
+
+def _equals_filter(field: str, lower: bool = True) -> Callable[[str, str, bool], Node]:
+    def compile(op: str, value: str, regex: bool) -> Node:
+        if op not in (":", "=", "!="):
+            raise ValueError(f"only supports :, = and !=, not {op}")
+        return lambda query: query.where(field, COMPARISONS[op], value.lower() if lower else value)  # type: ignore
+
+    return compile
+
+
+def _legality_filter(*legalities: str) -> Callable[[str, str, bool], Node]:
+    def compile(op: str, value: str, regex: bool) -> Node:
+        if op not in (":", "="):
+            raise ValueError(f"only supports : and =, not {op}")
+        return lambda query: query.legality(value.lower(), *legalities)  # type: ignore
+
+    return compile
+
+
+def _rarity(op: str, value: str, regex: bool) -> Node:
+    rarity = RARITIES.get(value.lower(), value.lower())
+    if rarity not in RANKINGS["rarity"]:
+        raise ValueError(f"unknown rarity {value!r}")
+    return lambda query: query.where("rarity", COMPARISONS[op], rarity)  # type: ignore
+
+
+def _lang(op: str, value: str, regex: bool) -> Node | None:
+    if value.lower() == "any":
+        return None
+    return _equals_filter("lang")(op, value, regex)
+
+
+def _year(op: str, value: str, regex: bool) -> Node:
+    year = int(value)
+    start, end = date(year, 1, 1), date(year + 1, 1, 1)
+    bounds = {
+        ":": ((">=", start), ("<", end)),
+        "=": ((">=", start), ("<", end)),
+        "<": (("<", start),),
+        "<=": (("<", end),),
+        ">": ((">=", end),),
+        ">=": ((">=", start),),
+    }
+    if op == "!=":
+        return lambda query: ~_year(":", value, regex)(query)
+
+    def node(query: CardQuery) -> CardQuery:
+        for comparison, bound in bounds[op]:
+            query = query.where("released_at", comparison, bound)  # type: ignore
+        return query
+
+    return node
+
+
+def _date(op: str, value: str, regex: bool) -> Node:
+    released = date.fromisoformat(value)
+    return lambda query: query.where("released_at", COMPARISONS[op], released)  # type: ignore
+
+
+def _game(op: str, value: str, regex: bool) -> Node:
+    return lambda query: query.flags("games", "superset", [value.lower()])
+
+
+def _keyword(op: str, value: str, regex: bool) -> Node:
+    pattern = re.compile(value if regex else f"^{re.escape(value)}$", re.IGNORECASE)
+    return lambda query: query.match("keywords", pattern)
+
+
+def _layouts(*layouts: str) -> Node:
+    return lambda query: query.where("layout", "in", layouts)
+
+
+def _flag(field: str) -> Node:
+    return lambda query: query.where(field, "==", True)
+
+
+_IS: dict[str, Node] = {
+    "foil": lambda query: query.flags("finishes", "superset", ["foil"]),
+    "nonfoil": lambda query: query.flags("finishes", "superset", ["nonfoil"]),
+    "etched": lambda query: query.flags("finishes", "superset", ["etched"]),
+    "digital": _flag("digital"),
+    "promo": _flag("promo"),
+    "reprint": _flag("reprint"),
+    "reserved": _flag("reserved"),
+    "variation": _flag("variation"),
+    "oversized": _flag("oversized"),
+    "textless": _flag("textless"),
+    "full": _flag("full_art"),
+    "fullart": _flag("full_art"),
+    "booster": _flag("booster"),
+    "spotlight": _flag("story_spotlight"),
+    "gamechanger": _flag("game_changer"),
+    "split": _layouts("split"),
+    "flip": _layouts("flip"),
+    "transform": _layouts("transform"),
+    "meld": _layouts("meld"),
+    "leveler": _layouts("leveler"),
+    "saga": _layouts("saga"),
+    "adventure": _layouts("adventure"),
+    "mdfc": _layouts("modal_dfc"),
+    "dfc": _layouts("transform", "modal_dfc", "meld", "reversible_card", "double_faced_token"),
+    "token": _layouts("token", "double_faced_token"),
+    "permanent": lambda query: query.match("type_line", PERMANENT_TYPES),
+    "spell": lambda query: query.match("type_line", SPELL_TYPES),
+    "historic": lambda query: query.match("type_line", HISTORIC_TYPES),
+    "commander": lambda query: (
+        query.match("type_line", LEGENDARY_CREATURE) | _text("oracle_text", "can be your commander", False)(query)
+    ),
+}
+
+
+def _is(op: str, value: str, regex: bool) -> Node:
+    if op != ":" or value.lower() not in _IS:
+        raise ValueError(f"unknown value {value!r}")
+    return _IS[value.lower()]
+
+
+def _not(op: str, value: str, regex: bool) -> Node:
+    node = _is(op, value, regex)
+    return lambda query: ~node(query)
+
+
+def _option(name: str, values: tuple[str, ...]) -> Callable[[str], dict[str, str | bool]]:
+    def parse(value: str) -> dict[str, str | bool]:
+        if value not in values:
+            raise ValueError(f"Invalid {name}: {value}")
+        return {name: value}
+
+    return parse
+
+
+def _include(value: str) -> dict[str, str | bool]:
+    if value != "extras":
+        raise ValueError(f"Invalid include: {value}")
+    return {"include_extras": True}
+
+
+_FILTERS: dict[str, Callable[[str, str, bool], Node | None]] = {
+    "name": _text_filter("name"),
+    "type": _text_filter("type_line", faces=False),
+    "oracle": _text_filter("oracle_text"),
+    "flavor": _text_filter("flavor_text"),
+    "artist": _text_filter("artist"),
+    "color": _color_filter("colors", ">="),
+    "identity": _color_filter("color_identity", "<="),
+    "mv": _number_filter("cmc"),
+    "power": _number_filter("power", faces=True),
+    "toughness": _number_filter("toughness", faces=True),
+    "loyalty": _number_filter("loyalty", faces=True),
+    "usd": _number_filter("prices.usd"),
+    "eur": _number_filter("prices.eur"),
+    "tix": _number_filter("prices.tix"),
+    "format": _legality_filter("legal", "restricted"),
+    "banned": _legality_filter("banned"),
+    "restricted": _legality_filter("restricted"),
+    "rarity": _rarity,
+    "set": _equals_filter("set"),
+    "settype": _equals_filter("set_type"),
+    "lang": _lang,
+    "game": _game,
+    "keyword": _keyword,
+    "year": _year,
+    "date": _date,
+    "is": _is,
+    "not": _not,
+}
+
+_DIRECTIVES: dict[str, Callable[[str], dict[str, str | bool]]] = {
+    "order": _option("order", tuple(ORDERS)),
+    "unique": _option("unique", tuple(UNIQUE_FIELDS)),
+    "dir": _option("dir", ("auto", "asc", "desc")),
+    "include": _include,
+}
+
+_ALIASES = {
+    "n": "name",
+    "t": "type",
+    "o": "oracle",
+    "ft": "flavor",
+    "a": "artist",
+    "c": "color",
+    "colour": "color",
+    "id": "identity",
+    "ci": "identity",
+    "cmc": "mv",
+    "manavalue": "mv",
+    "pow": "power",
+    "tou": "toughness",
+    "loy": "loyalty",
+    "f": "format",
+    "legal": "format",
+    "r": "rarity",
+    "s": "set",
+    "e": "set",
+    "edition": "set",
+    "st": "settype",
+    "language": "lang",
+    "kw": "keyword",
+    "direction": "dir",
+}
@@ -0,0 +1,389 @@
+import hashlib
+import json
+import os
+import sqlite3
+from collections.abc import AsyncIterable, Iterable
+from typing import Any, TYPE_CHECKING
+from uuid import UUID
+
+from scryfall.models.cards import Card
+
+if TYPE_CHECKING:
+    from scryfall.client import Scryfall
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    oracle_id TEXT,
+    arena_id INTEGER,
+    mtgo_id INTEGER,
+    mtgo_foil_id INTEGER,
+    tcgplayer_id INTEGER,
+    tcgplayer_etched_id INTEGER,
+    cardmarket_id INTEGER,
+    set_code TEXT,
+    collector_number TEXT,
+    lang TEXT,
+    released_at TEXT,
+    data TEXT NOT NULL,
+    hash TEXT
+);
+CREATE TABLE IF NOT EXISTS multiverse_ids (
+    multiverse_id INTEGER NOT NULL,
+    card_id TEXT NOT NULL REFERENCES cards (id) ON DELETE CASCADE,
+    PRIMARY KEY (multiverse_id, card_id)
+);
+CREATE TABLE IF NOT EXISTS names (
+    name TEXT NOT NULL,
+    card_id TEXT NOT NULL REFERENCES cards (id) ON DELETE CASCADE,
+    PRIMARY KEY (name, card_id)
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS cards_oracle_id ON cards (oracle_id);
+CREATE INDEX IF NOT EXISTS cards_arena_id ON cards (arena_id);
+CREATE INDEX IF NOT EXISTS cards_mtgo_id ON cards (mtgo_id);
+CREATE INDEX IF NOT EXISTS cards_mtgo_foil_id ON cards (mtgo_foil_id);
+CREATE INDEX IF NOT EXISTS cards_tcgplayer_id ON cards (tcgplayer_id);
+CREATE INDEX IF NOT EXISTS cards_tcgplayer_etched_id ON cards (tcgplayer_etched_id);
+CREATE INDEX IF NOT EXISTS cards_cardmarket_id ON cards (cardmarket_id);
+CREATE INDEX IF NOT EXISTS cards_set_collector_number ON cards (set_code, collector_number);
+CREATE INDEX IF NOT EXISTS multiverse_ids_card_id ON multiverse_ids (card_id);
+CREATE INDEX IF NOT EXISTS names_card_id ON names (card_id);
+"""
+
+SCHEMA_VERSION = 1
+
+MIGRATIONS = {
+    1: "ALTER TABLE cards ADD COLUMN hash TEXT;",
+}
+"""Statements upgrading a store to every schema version from the one before it"""
+
+# English printings first, then the most recent one
+PREFERRED_ORDER = "ORDER BY lang = 'en' DESC, released_at DESC"
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a card name for lookups.
+
+    Args:
+        name: Card name
+
+    Returns:
+        str: The case folded name with collapsed whitespace
+
+    """
+    return " ".join(name.casefold().split())
+
+
+def content_hash(data: dict[str, Any], ignore: Iterable[str] = ()) -> str:
+    """
+    Hash the content of a card, to tell whether it changed.
+
+    Args:
+        data: Raw card data
+        ignore: Fields to leave out of the hash
+
+    Returns:
+        str: Hex digest of the card's canonical JSON
+
+    """
+    ignore = {"_client", *ignore}
+    content = json.dumps({k: v for k, v in data.items() if k not in ignore}, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+class CardStore:
+    """
+    Local SQLite store of cards, usually built from bulk data.
+
+    Cards are stored as their raw API data, indexed by every ID Scryfall can look a card up by.
+    """
+
+    def __init__(self, path: str | os.PathLike = ":memory:") -> None:
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0 and self._db.execute("SELECT name FROM sqlite_master WHERE name = 'cards'").fetchone() is None:
+            # A new store gets the current schema right away
+            version = SCHEMA_VERSION
+        with self._db:
+            for step in range(version + 1, SCHEMA_VERSION + 1):
+                self._db.executescript(MIGRATIONS[step])
+            self._db.executescript(SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+
+    def add_cards(self, cards: Iterable[dict[str, Any] | Card]) -> int:
+        """
+        Add cards to the store, replacing any that are already stored.
+
+        Args:
+            cards: Cards or raw card data to add
+
+        Returns:
+            int: The number of cards added
+
+        """
+        count = 0
+        with self._db:
+            for card in cards:
+                self._add_card(card.model_dump(mode="json") if isinstance(card, Card) else card)
+                count += 1
+        return count
+
+    def upsert_cards(self, cards: Iterable[tuple[dict[str, Any], str]]) -> int:
+        """
+        Add cards with precomputed content hashes, replacing any that are already stored.
+
+        Args:
+            cards: Raw card data and its `content_hash`
+
+        Returns:
+            int: The number of cards added
+
+        """
+        count = 0
+        with self._db:
+            for data, hash in cards:
+                self._add_card(data, hash)
+                count += 1
+        return count
+
+    async def add_cards_async(self, cards: AsyncIterable[dict[str, Any] | Card], batch_size: int = 1000) -> int:
+        """
+        Add cards to the store from an async iterable, committing every `batch_size` cards.
+
+        Args:
+            cards: Cards or raw card data to add
+            batch_size: Number of cards per transaction. Default 1000
+
+        Returns:
+            int: The number of cards added
+
+        """
+        count = 0
+        batch: list[dict[str, Any] | Card] = []
+        async for card in cards:
+            batch.append(card)
+            if len(batch) >= batch_size:
+                count += self.add_cards(batch)
+                batch.clear()
+        return count + self.add_cards(batch)
+
+    async def ingest_bulk_data(self, client: "Scryfall", type: str = "default_cards") -> int:
+        """
+        Download a card bulk data file and add all of its cards to the store.
+
+        Args:
+            client: Client to download the file with
+            type: The bulk data type. Default `default_cards`
+
+        Returns:
+            int: The number of cards added
+
+        """
+        return await self.add_cards_async(client.stream_bulk_data(type))
+
+    def _add_card(self, data: dict[str, Any], hash: str | None = None) -> None:
+        data = {k: v for k, v in data.items() if k != "_client"}
+        card_id = str(data["id"])
+        self._db.execute("DELETE FROM cards WHERE id = ?", (card_id,))
+        self._db.execute(
+            "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                card_id,
+                data.get("oracle_id"),
+                data.get("arena_id"),
+                data.get("mtgo_id"),
+                data.get("mtgo_foil_id"),
+                data.get("tcgplayer_id"),
+                data.get("tcgplayer_etched_id"),
+                data.get("cardmarket_id"),
+                data.get("set"),
+                data.get("collector_number"),
+                data.get("lang"),
+                data.get("released_at"),
+                json.dumps(data, separators=(",", ":")),
+                hash if hash is not None else content_hash(data),
+            ),
+        )
+        self._db.executemany(
+            "INSERT OR IGNORE INTO multiverse_ids VALUES (?, ?)",
+            [(x, card_id) for x in data.get("multiverse_ids") or []],
+        )
+        names = {data["name"]} | {face["name"] for face in data.get("card_faces") or []}
+        self._db.executemany("INSERT OR IGNORE INTO names VALUES (?, ?)", [(normalize_name(x), card_id) for x in names])
+
+    def remove_cards(self, ids: Iterable[str | UUID]) -> int:
+        """
+        Remove cards from the store.
+
+        Args:
+            ids: UUIDs of the cards to remove
+
+        Returns:
+            int: The number of cards removed
+
+        """
+        with self._db:
+            cursor = self._db.executemany("DELETE FROM cards WHERE id = ?", [(str(x),) for x in ids])
+        return cursor.rowcount
+
+    def get_hashes(self) -> dict[str, str | None]:
+        """
+        Get the content hash of every stored card.
+
+        Returns:
+            dict[str, str | None]: Content hashes by card ID
+
+        """
+        return dict(self._db.execute("SELECT id, hash FROM cards"))
+
+    def get_metadata(self, key: str) -> str | None:
+        """
+        Get a value stored alongside the cards, such as when they were last synced.
+
+        Args:
+            key: Key of the value
+
+        """
+        row = self._db.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_metadata(self, key: str, value: str | None) -> None:
+        """
+        Store a value alongside the cards.
+
+        Args:
+            key: Key of the value
+            value: The value, or None to remove it
+
+        """
+        with self._db:
+            if value is None:
+                self._db.execute("DELETE FROM metadata WHERE key = ?", (key,))
+            else:
+                self._db.execute("INSERT OR REPLACE INTO metadata VALUES (?, ?)", (key, value))
+
+    def clear(self) -> None:
+        """Remove all cards from the store."""
+        with self._db:
+            self._db.execute("DELETE FROM cards")
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        self._db.close()
+
+    def _get(self, where: str, *args: Any) -> dict[str, Any] | None:
+        row = self._db.execute(f"SELECT data FROM cards WHERE {where} {PREFERRED_ORDER} LIMIT 1", args).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_by_id(self, id: str | UUID) -> dict[str, Any] | None:
+        """
+        Get a card by ID.
+
+        Args:
+            id: UUID of card
+
+        """
+        return self._get("id = ?", str(id))
+
+    def get_by_oracle_id(self, id: str | UUID) -> dict[str, Any] | None:
+        """
+        Get the preferred printing of a card by Oracle ID.
+
+        Args:
+            id: Oracle UUID of card
+
+        """
+        return self._get("oracle_id = ?", str(id))
+
+    def get_by_arena_id(self, id: int) -> dict[str, Any] | None:
+        """
+        Get a card by MTG Arena ID.
+
+        Args:
+            id: MTG Arena ID
+
+        """
+        return self._get("arena_id = ?", id)
+
+    def get_by_mtgo_id(self, id: int) -> dict[str, Any] | None:
+        """
+        Get a card by MTGO ID or MTGO foil ID.
+
+        Args:
+            id: MTGO ID
+
+        """
+        return self._get("(mtgo_id = ?1 OR mtgo_foil_id = ?1)", id)
+
+    def get_by_tcgplayer_id(self, id: int) -> dict[str, Any] | None:
+        """
+        Get a card by TCGPlayer ID or TCGPlayer etched ID.
+
+        Args:
+            id: TCGPlayer ID
+
+        """
+        return self._get("(tcgplayer_id = ?1 OR tcgplayer_etched_id = ?1)", id)
+
+    def get_by_cardmarket_id(self, id: int) -> dict[str, Any] | None:
+        """
+        Get a card by Cardmarket ID.
+
+        Args:
+            id: Cardmarket ID
+
+        """
+        return self._get("cardmarket_id = ?", id)
+
+    def get_by_multiverse_id(self, id: int) -> dict[str, Any] | None:
+        """
+        Get a card by Multiverse ID.
+
+        Args:
+            id: Multiverse ID
+
+        """
+        return self._get("id IN (SELECT card_id FROM multiverse_ids WHERE multiverse_id = ?)", id)
+
+    def get_by_set_code_and_collector_number(
+        self, code: str, number: str, lang: str | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Get a card by set code and collector number.
+
+        Args:
+            code: Set code
+            number: Collector number
+            lang: Card language. Defaults to the English printing
+
+        """
+        if lang is not None:
+            return self._get("set_code = ? AND collector_number = ? AND lang = ?", code.lower(), number, lang)
+        return self._get("set_code = ? AND collector_number = ?", code.lower(), number)
+
+    def get_by_name(self, name: str, set: str | None = None) -> dict[str, Any] | None:
+        """
+        Get the preferred printing of a card by its exact name, or the name of one of its faces.
+
+        Args:
+            name: Card name, case insensitive
+            set: Set code to search in
+
+        """
+        where = "id IN (SELECT card_id FROM names WHERE name = ?)"
+        if set is not None:
+            return self._get(f"{where} AND set_code = ?", normalize_name(name), set.lower())
+        return self._get(where, normalize_name(name))
@@ -0,0 +1,142 @@
+import inspect
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Literal, TYPE_CHECKING
+
+from scryfall.local.store import CardStore, content_hash
+from scryfall.models.bulk import BulkData
+
+if TYPE_CHECKING:
+    from scryfall.client import Scryfall
+
+
+@dataclass
+class CardChange:
+    """A change made to a store while syncing"""
+
+    type: Literal["insert", "update", "delete"]
+    """What happened to the card"""
+
+    id: str
+    """UUID of the card"""
+
+    data: dict[str, Any] | None = None
+    """The card's new raw data, None for deletes"""
+
+
+@dataclass
+class SyncResult:
+    """Summary of a sync"""
+
+    bulk_data: BulkData
+    """The bulk data file that was synced with"""
+
+    skipped: bool = False
+    """True if the file hadn't changed since the last sync, so it wasn't downloaded"""
+
+    inserted: int = 0
+    """Number of new cards"""
+
+    updated: int = 0
+    """Number of cards whose content changed"""
+
+    deleted: int = 0
+    """Number of cards no longer in the file"""
+
+    unchanged: int = 0
+    """Number of cards left as they were"""
+
+    changes: list[CardChange] = field(default_factory=list, repr=False)
+    """Every change made, if they were collected"""
+
+
+ChangeHandler = Callable[[CardChange], Awaitable[None] | None]
+
+
+def _metadata_key(type: str) -> str:
+    return f"bulk_data:{type}:updated_at"
+
+
+async def sync_bulk_data(
+    client: "Scryfall",
+    store: CardStore,
+    type: str = "default_cards",
+    on_change: ChangeHandler | None = None,
+    ignore: Iterable[str] = (),
+    force: bool = False,
+    collect: bool = False,
+    batch_size: int = 1000,
+) -> SyncResult:
+    """
+    Incrementally sync a store with a card bulk data file.
+
+    The file is only downloaded if its `updated_at` changed since the last sync. It is then streamed and diffed card
+    by card against the store by ID and content hash, so only new and changed cards are written, and cards that are
+    no longer in the file are removed once it was read completely. The store should only be synced with one type.
+
+    Args:
+        client: Client to download the file with
+        store: Store to sync
+        type: The bulk data type. Default `default_cards`
+        on_change: Function or coroutine function called for every change
+        ignore: Fields to leave out of the comparison, such as `prices`, so cards whose only changes are in them are not rewritten
+        force: If true, download the file even if it didn't change. Default False
+        collect: If true, collect every change in `SyncResult.changes`. Default False
+        batch_size: Number of cards written per transaction. Default 1000
+
+    Returns:
+        SyncResult: Summary of the changes
+
+    """
+    bulk_data = await client.get_bulk_data_by_type(type)
+    result = SyncResult(bulk_data)
+    updated_at = bulk_data.updated_at.isoformat()
+    if not force and store.get_metadata(_metadata_key(type)) == updated_at:
+        result.skipped = True
+        return result
+
+    ignore = tuple(ignore)
+    known = store.get_hashes()
+    batch: list[tuple[dict[str, Any], str]] = []
+    pending: list[CardChange] = []
+
+    async def emit(change: CardChange) -> None:
+        if collect:
+            result.changes.append(change)
+        if on_change is not None and inspect.isawaitable(awaitable := on_change(change)):
+            await awaitable
+
+    async def flush() -> None:
+        # Changes are only announced once they are committed
+        store.upsert_cards(batch)
+        for change in pending:
+            await emit(change)
+        batch.clear()
+        pending.clear()
+
+    async for data in client.stream_bulk_data(type):
+        id = str(data["id"])
+        hash = content_hash(data, ignore)
+        previous = known.pop(id, False)
+        if previous == hash:
+            result.unchanged += 1
+            continue
+
+        if previous is False:
+            result.inserted += 1
+            pending.append(CardChange("insert", id, data))
+        else:
+            result.updated += 1
+            pending.append(CardChange("update", id, data))
+        batch.append((data, hash))
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+
+    # Only reached once the whole file was read, so an interrupted download never deletes anything
+    result.deleted = store.remove_cards(known)
+    for id in known:
+        await emit(CardChange("delete", id))
+
+    store.set_metadata(_metadata_key(type), updated_at)
+    return result
@@ -1,9 +1,21 @@
-from .api import APIError, APIList
+from .api import APIError, APIList, CardCollection
 from .bulk import BulkData
 from .cards import Card
 from .catalogs import Catalog
+from .lazy import LazyModel
 from .rulings import Ruling
 from .sets import Set
 from .symbols import CardSymbol
 
-__all__ = ["APIError", "APIList", "BulkData", "Card", "Catalog", "Ruling", "Set", "CardSymbol"]
+__all__ = [
+    "APIError",
+    "APIList",
+    "BulkData",
+    "Card",
+    "CardCollection",
+    "CardSymbol",
+    "Catalog",
+    "LazyModel",
+    "Ruling",
+    "Set",
+]
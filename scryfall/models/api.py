@@ -1,6 +1,8 @@
-from typing import Any, Literal
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, Generic, Literal, TypeVar
 
-from pydantic import BaseModel, HttpUrl, ValidationError, model_validator
+from pydantic import BaseModel, Field, HttpUrl, model_validator
 
 from scryfall.models.base import BaseAPIModel
 from scryfall.models.cards import Card
@@ -10,6 +12,11 @@ from scryfall.models.symbols import CardSymbol
 
 CLASS_LOOKUP = {"card": Card, "card_symbol": CardSymbol, "ruling": Ruling, "set": Set}
 
+APIObject = Annotated[Card | CardSymbol | Ruling | Set, Field(discriminator="object")]
+"""Any object that can be in an `APIList`, told apart by its `object` field"""
+
+T = TypeVar("T", default=APIObject)
+
 
 class APIError(BaseModel):
     """Scryfall API error model."""
@@ -30,13 +37,18 @@ class APIError(BaseModel):
     """Any associated warnings that are not quite errors"""
 
 
-class APIList(BaseAPIModel):
-    """Scryfall API list model for paginated requests"""
+class APIList(BaseAPIModel, Generic[T]):
+    """
+    Scryfall API list model for paginated requests
+
+    Can be parametrized with the type of its items, such as `APIList[Card]`, so they are validated as that
+    type directly. Otherwise each item is validated as the type named by its `object` field.
+    """
 
     object: Literal["list"]
     """The object type, `list` in this case"""
 
-    data: list[Card | CardSymbol | Ruling | Set]
+    data: list[T]
     """The page of data, max 175 items unless it is an entire set of cards"""
 
     has_more: bool
@@ -54,19 +66,68 @@ class APIList(BaseAPIModel):
     @model_validator(mode="before")
     @classmethod
     def validate_data(cls, data: Any) -> Any:
-        if data.get("object") == "list":
-            for item in data.get("data"):
+        if isinstance(data, dict) and data.get("object") == "list":
+            for item in data.get("data", []):
                 item["_client"] = data["_client"]
-                obj = item.get("object")
-                if obj not in CLASS_LOOKUP:
-                    raise ValidationError("Item missing object field")
-                item = CLASS_LOOKUP[obj](**item)
         return data
 
-    async def get_next_page(self) -> "APIList | None":
-        """Get the next page of the query"""
+    async def get_next_page(self) -> "APIList[T] | None":
+        """Get the next page of the list"""
         if self.has_more and self.next_page is not None:
-            params = dict(self.next_page.query_params())
-            params.pop("format", None)
-            return await self._client.search_cards(**params)  # type: ignore
+            return await self._client.get_page(str(self.next_page), type(self))  # type: ignore
         return None
+
+    async def iter_all(self, limit: int | None = None) -> AsyncIterator[T]:
+        """
+        Iterate over the items of this page and all following pages.
+
+        The next page is requested in the background while the current page is being consumed.
+
+        Args:
+            limit: Max number of items to yield. Defaults to all items
+
+        """
+        page: APIList[T] | None = self
+        next_page: asyncio.Task[APIList[T] | None] | None = None
+        count = 0
+        try:
+            while page is not None:
+                if page.has_more and (limit is None or count + len(page.data) < limit):
+                    next_page = asyncio.create_task(page.get_next_page())
+                for item in page.data:
+                    if limit is not None and count >= limit:
+                        return
+                    yield item
+                    count += 1
+                page = await next_page if next_page is not None else None
+                next_page = None
+        finally:
+            # The consumer stopped early, so the page being prefetched is no longer needed
+            if next_page is not None:
+                next_page.cancel()
+                await asyncio.wait([next_page])
+                if not next_page.cancelled():
+                    next_page.exception()
+
+
+class CardCollection(BaseAPIModel):
+    """Scryfall card collection model, returned when looking up cards by identifiers"""
+
+    object: Literal["list"]
+    """The object type, `list` in this case"""
+
+    data: list[Card]
+    """The cards that were found, in the order their identifiers were given, skipping those in `not_found`"""
+
+    not_found: list[dict[str, Any]]
+    """The identifiers that could not be found"""
+
+    warnings: list[str] | None = None
+    """Warnings generated by the lookup that are not quite errors"""
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_data(cls, data: Any) -> Any:
+        for item in data.get("data", []):
+            item["_client"] = data["_client"]
+        return data
@@ -12,7 +12,14 @@ class BaseAPIModel(BaseModel):
     _client: "Scryfall"
     """Internal Scryfall client"""
 
+    _stale: bool = False
+
     def __init__(self, **data):
         client: "Scryfall" = data["_client"]
         super().__init__(**data)
         self._client = client
+
+    @property
+    def stale(self) -> bool:
+        """If the model was built from an expired cached response, because Scryfall was slow or unreachable"""
+        return self._stale
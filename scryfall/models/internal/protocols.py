@@ -1,9 +1,14 @@
 import typing
+from contextlib import AbstractAsyncContextManager
 from typing import Protocol, Any, TypeVar
 
+from httpx import Response
+from pydantic import BaseModel
+
 from scryfall.client.route import Route
 
 T_co = TypeVar("T", covariant=True)  # type: ignore
+M = TypeVar("M", bound=BaseModel)
 
 
 @typing.runtime_checkable
@@ -15,3 +20,9 @@ class CanRequest(Protocol[T_co]):
         **kwargs: dict,
     ) -> dict[str, Any]:
         raise NotImplementedError("Derived classes need to implement this.")
+
+    def stream(self, url: str, **kwargs: dict) -> AbstractAsyncContextManager[Response]:
+        raise NotImplementedError("Derived classes need to implement this.")
+
+    def _build(self, model: type[M], data: dict[str, Any]) -> M:
+        raise NotImplementedError("Derived classes need to implement this.")
@@ -0,0 +1,77 @@
+from functools import cache
+from types import FunctionType, MethodType
+from typing import Any, Generic, TypeVar, TYPE_CHECKING
+
+from pydantic import BaseModel, TypeAdapter
+
+from scryfall.models.base import BaseAPIModel
+
+if TYPE_CHECKING:
+    from scryfall.client import Scryfall
+
+T = TypeVar("T", bound=BaseModel)
+
+_MISSING = object()
+
+
+@cache
+def _field_adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+class LazyModel(Generic[T]):
+    """
+    Thin read-only view over raw API data that only validates fields when they are accessed.
+
+    Behaves like the model it wraps: fields are validated and cached on first access, and model methods
+    such as `Card.get_set` can be called as usual.
+    """
+
+    __slots__ = ("_cache", "_client", "_data", "_model", "_stale")
+
+    def __init__(self, model: type[T], data: dict[str, Any], client: "Scryfall | None" = None) -> None:
+        self._model = model
+        self._data = data
+        self._client = client
+        self._cache: dict[str, Any] = {}
+        self._stale = False
+
+    def __getattr__(self, name: str) -> Any:
+        field = self._model.model_fields.get(name)
+        if field is None:
+            attr = getattr(self._model, name)
+            if isinstance(attr, FunctionType):
+                return MethodType(attr, self)
+            return attr
+
+        value = self._cache.get(name, _MISSING)
+        if value is _MISSING:
+            raw = self._data.get(name, _MISSING)
+            value = (
+                field.get_default(call_default_factory=True)
+                if raw is _MISSING
+                else _field_adapter(self._model, name).validate_python(raw)
+            )
+            self._cache[name] = value
+        return value
+
+    def __repr__(self) -> str:
+        return f"<Lazy{self._model.__name__} {self._data.get('id', self._data.get('name', ''))}>"
+
+    @property
+    def stale(self) -> bool:
+        """If the model was built from an expired cached response, because Scryfall was slow or unreachable"""
+        return self._stale
+
+    @property
+    def raw(self) -> dict[str, Any]:
+        """The raw API data"""
+        return self._data
+
+    def to_model(self) -> T:
+        """Validate all fields into the full model."""
+        if issubclass(self._model, BaseAPIModel):
+            model = self._model(**self._data, _client=self._client)
+            model._stale = self._stale
+            return model
+        return self._model(**self._data)
@@ -8,6 +8,7 @@ from scryfall.models.base import BaseAPIModel
 
 if TYPE_CHECKING:
     from scryfall.models.api import APIList
+    from scryfall.models.cards import Card
 
 
 class Set(BaseAPIModel):
@@ -33,7 +34,7 @@ class Set(BaseAPIModel):
     icon_svg_uri: HttpUrl
     search_uri: HttpUrl
 
-    async def get_cards(self) -> "APIList":
+    async def get_cards(self) -> "APIList[Card]":
         """Get a list of cards from the set."""
         params = dict(self.search_uri.query_params())
         return await self._client.search_cards(**params)  # type: ignore
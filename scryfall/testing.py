@@ -0,0 +1,337 @@
+import asyncio
+import copy
+import hashlib
+import json
+import random
+import re
+import uuid
+from collections import Counter, deque
+from collections.abc import Callable, Iterable
+from typing import Any
+from urllib.parse import quote, quote_plus
+
+import httpx
+
+API_HOST = "api.scryfall.com"
+DATA_HOST = "data.scryfall.io"
+IMAGE_HOST = "cards.scryfall.io"
+
+Latency = float | tuple[float, float] | Callable[[httpx.Request], float]
+
+Scripted = int | httpx.Response | Exception
+"""A scripted answer to an API request: a status code, a response, or an exception to raise"""
+
+
+def make_cards(template: dict[str, Any], count: int, vary: bool = False, seed: int = 0) -> list[dict[str, Any]]:
+    """
+    Make distinct cards out of a recorded one, for fixtures of any size.
+
+    Every copy gets its own ID, name and collector number, and the cards are split into sets of 250. Other values
+    are copied as they are, so copies share their URLs, marketplace IDs and prices, unlike real cards.
+
+    Args:
+        template: Raw API data of a card
+        count: Number of cards to make
+        vary: If true, also give every card its own oracle ID, random ID, marketplace IDs and prices, and the URLs
+            that embed them, such as image URLs with their own timestamp, like in bulk data. Default False
+        seed: Seed for the random values of `vary`
+
+    Returns:
+        list[dict[str, Any]]: The cards
+
+    """
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        card = copy.deepcopy(template)
+        card["id"] = str(uuid.UUID(int=rng.getrandbits(128), version=4) if vary else uuid.UUID(int=i + 1))
+        card["name"] = f"{template['name']} {i + 1}"
+        card["collector_number"] = str(i % 250 + 1)
+        card["set"] = f"{template['set']}{i // 250}" if count > 250 else template["set"]
+        card["set_id"] = str(uuid.UUID(int=(1 << 64) + i // 250))
+        card["uri"] = f"https://{API_HOST}/cards/{card['id']}"
+        if "image_uris" in card:
+            card["image_uris"] = {k: v.replace(template["id"], card["id"]) for k, v in card["image_uris"].items()}
+        if vary:
+            _vary(card, template, rng)
+        cards.append(card)
+    return cards
+
+
+def _vary(card: dict[str, Any], template: dict[str, Any], rng: random.Random) -> None:
+    id = card["id"]
+    replacements = {template["id"]: id, quote_plus(template["name"]): quote_plus(card["name"])}
+    for field in ("multiverse_ids", "tcgplayer_id", "cardmarket_id", "mtgo_id", "mtgo_foil_id", "arena_id"):
+        if isinstance(value := template.get(field), int):
+            card[field] = rng.randrange(1, 10**6)
+            replacements[str(value)] = str(card[field])
+        elif value:
+            card[field] = [rng.randrange(1, 10**6) for _ in value]
+            replacements |= {str(x): str(y) for x, y in zip(value, card[field], strict=True)}
+    if template.get("oracle_id"):
+        card["oracle_id"] = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        replacements[template["oracle_id"]] = card["oracle_id"]
+
+    def replace(value: str) -> str:
+        for old, new in replacements.items():
+            value = value.replace(old, new)
+        return value
+
+    for field in ("rulings_uri", "prints_search_uri"):
+        if field in card:
+            card[field] = replace(card[field])
+    for field in ("related_uris", "purchase_uris"):
+        if field in card:
+            card[field] = {k: replace(v) for k, v in card[field].items()}
+    if "image_uris" in card:
+        # Images are stored under the first characters of the ID, and versioned with their upload time
+        timestamp = rng.randrange(1_500_000_000, 1_750_000_000)
+        card["image_uris"] = {
+            k: re.sub(
+                r"/front/\w/\w/[^?]+\?\d+",
+                f"/front/{id[0]}/{id[1]}/{id}.{'png' if k == 'png' else 'jpg'}?{timestamp}",
+                v,
+            )
+            for k, v in card["image_uris"].items()
+        }
+    slug = "-".join(re.findall(r"\w+", card["name"].lower()))
+    card["scryfall_uri"] = f"https://scryfall.com/card/{card['set']}/{card['collector_number']}/{slug}?utm_source=api"
+    card["prices"] = {k: None if v is None else f"{rng.uniform(0.01, 100):.2f}" for k, v in card["prices"].items()}
+
+
+def make_set(card: dict[str, Any], card_count: int = 0) -> dict[str, Any]:
+    """
+    Make the raw API data of the set a card belongs to.
+
+    Args:
+        card: Raw API data of a card
+        card_count: Number of cards in the set
+
+    Returns:
+        dict[str, Any]: The set
+
+    """
+    code = card["set"]
+    return {
+        "object": "set",
+        "id": card["set_id"],
+        "code": code,
+        "name": card["set_name"],
+        "set_type": card["set_type"],
+        "released_at": card.get("released_at"),
+        "card_count": card_count,
+        "digital": card.get("digital", False),
+        "foil_only": False,
+        "nonfoil_only": False,
+        "scryfall_uri": f"https://scryfall.com/sets/{code}",
+        "uri": f"https://{API_HOST}/sets/{card['set_id']}",
+        "icon_svg_uri": f"https://svgs.scryfall.io/sets/{code}.svg",
+        "search_uri": f"https://{API_HOST}/cards/search?order=set&q={quote(f'e:{code}')}&unique=prints",
+    }
+
+
+def _error(status: int, code: str, details: str, headers: dict[str, str] | None = None) -> httpx.Response:
+    return httpx.Response(
+        status,
+        json={"object": "error", "status": status, "code": code, "details": details},
+        headers=headers,
+    )
+
+
+class MockScryfall(httpx.MockTransport):
+    """
+    Fake Scryfall API serving fixture cards, for tests and benchmarks that must not touch the network.
+
+    Pass it as the `transport` of a client. It serves cards by ID, by set and collector number, by exact name and at
+    random, paginated searches (which match every card, or every card of a set for `e:` and `set:` queries), collections,
+    sets, a `default_cards` bulk data file holding every card, and made up card images. Requests to the API can be
+    delayed, and answered with 429 or 5xx errors at random, to reproduce a slow or struggling server, or answered
+    with scripted responses queued with `enqueue`.
+
+    Args:
+        cards: Raw API data of the cards to serve
+        latency: Seconds each API request takes, as a fixed value, a `(min, max)` range or a function of the request
+        rate_limit_rate: Fraction of API requests answered with a 429. Default 0
+        error_rate: Fraction of API requests answered with a 503. Default 0
+        retry_after: `Retry-After` header of 429 responses, if any
+        page_size: Max cards per search page. Default 175
+        seed: Seed for the random latency and errors, for reproducible runs
+
+    """
+
+    def __init__(
+        self,
+        cards: Iterable[dict[str, Any]],
+        latency: Latency = 0.0,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float | None = None,
+        page_size: int = 175,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(self.handle)
+        self.cards: dict[str, dict[str, Any]] = {card["id"]: card for card in cards}
+        self.latency = latency
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.random = random.Random(seed)
+
+        self.requests: list[httpx.Request] = []
+        """Every request received"""
+        self.statuses: Counter[int] = Counter()
+        """Number of responses sent by status code"""
+        self.queued: deque[Scripted] = deque()
+        """Scripted answers to the next API requests"""
+
+        self._by_number = {(card["set"], card["collector_number"], card["lang"]): card for card in self.cards.values()}
+        self._by_name = {card["name"].casefold(): card for card in self.cards.values()}
+        self._by_set: dict[str, list[dict[str, Any]]] = {}
+        for card in self.cards.values():
+            self._by_set.setdefault(card["set"], []).append(card)
+        self.sets = {code: make_set(cards[0], len(cards)) for code, cards in self._by_set.items()}
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = await self._respond(request)
+        self.statuses[response.status_code] += 1
+        return response
+
+    def _delay(self, request: httpx.Request) -> float:
+        if callable(self.latency):
+            return self.latency(request)
+        if isinstance(self.latency, tuple):
+            return self.random.uniform(*self.latency)
+        return self.latency
+
+    async def _respond(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == DATA_HOST:
+            return self._download(request.url.path)
+        if request.url.host == IMAGE_HOST:
+            return self._image(request)
+
+        if (delay := self._delay(request)) > 0:
+            await asyncio.sleep(delay)
+        if self.queued:
+            answer = self.queued.popleft()
+            if isinstance(answer, Exception):
+                raise answer
+            if isinstance(answer, httpx.Response):
+                return answer
+            if answer != 200:
+                return self._fault(answer)
+            return self._route(request)
+
+        roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            return self._fault(429)
+        if roll < self.rate_limit_rate + self.error_rate:
+            return self._fault(503)
+        return self._route(request)
+
+    def enqueue(self, *answers: Scripted) -> None:
+        """
+        Script the answers to the next API requests, which take precedence over random faults.
+
+        Args:
+            answers: Status codes, answered with a Scryfall error (or served as usual for 200), responses to send
+                as they are, or exceptions to raise, such as `httpx.ConnectError`
+
+        """
+        self.queued.extend(answers)
+
+    def _fault(self, status: int) -> httpx.Response:
+        reason = httpx.codes.get_reason_phrase(status)
+        headers = {"Retry-After": str(self.retry_after)} if status == 429 and self.retry_after is not None else None
+        return _error(status, reason.lower().replace(" ", "_"), reason, headers)
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/")
+        params = request.url.params
+        match request.method, parts:
+            case "GET", ["cards", "search"]:
+                return self._search(params)
+            case "GET", ["cards", "named"]:
+                card = self._by_name.get((params.get("exact") or params.get("fuzzy") or "").casefold())
+            case "POST", ["cards", "collection"]:
+                return self._collection(json.loads(request.content))
+            case "GET", ["cards", "random"]:
+                card = self.random.choice(list(self.cards.values()))
+            case "GET", ["cards", id, "rulings"]:
+                return httpx.Response(200, json={"object": "list", "has_more": False, "data": []})
+            case "GET", ["cards", id]:
+                card = self.cards.get(id)
+            case "GET", ["cards", code, number, *lang]:
+                card = self._by_number.get((code, number, lang[0] if lang else "en"))
+            case "GET", ["sets"]:
+                return httpx.Response(200, json={"object": "list", "has_more": False, "data": list(self.sets.values())})
+            case "GET", ["sets", code]:
+                card = next((x for x in self.sets.values() if code in (x["code"], x["id"])), None)
+            case "GET", ["bulk-data", type]:
+                return httpx.Response(200, json=self._bulk_data(type))
+            case _:
+                card = None
+
+        if card is None:
+            return _error(404, "not_found", f"No object found at {request.url.path}")
+        return httpx.Response(200, json=card)
+
+    def _search(self, params: httpx.QueryParams) -> httpx.Response:
+        q = params.get("q", "")
+        code = q.split(":", 1)[1] if q.startswith(("e:", "set:")) else None
+        cards = self._by_set.get(code, []) if code is not None else list(self.cards.values())
+        if not cards:
+            return _error(404, "not_found", "Your query didn't match any cards")
+
+        page = int(params.get("page", 1))
+        data: dict[str, Any] = {
+            "object": "list",
+            "total_cards": len(cards),
+            "has_more": page * self.page_size < len(cards),
+            "data": cards[(page - 1) * self.page_size : page * self.page_size],
+        }
+        if data["has_more"]:
+            next_params = dict(params) | {"page": str(page + 1)}
+            data["next_page"] = f"https://{API_HOST}/cards/search?{httpx.QueryParams(next_params)}"
+        return httpx.Response(200, json=data)
+
+    def _collection(self, body: dict[str, Any]) -> httpx.Response:
+        data, not_found = [], []
+        for identifier in body["identifiers"]:
+            card = self.cards.get(identifier.get("id", "")) or self._by_name.get(identifier.get("name", "").casefold())
+            if card is None:
+                not_found.append(identifier)
+            else:
+                data.append(card)
+        return httpx.Response(200, json={"object": "list", "not_found": not_found, "data": data})
+
+    def _bulk_data(self, type: str) -> dict[str, Any]:
+        return {
+            "object": "bulk_data",
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, type)),
+            "type": type,
+            "updated_at": "2025-01-01T00:00:00+00:00",
+            "uri": f"https://{API_HOST}/bulk-data/{type}",
+            "name": type,
+            "description": f"Every mock card as {type}",
+            "size": 0,
+            "download_uri": f"https://{DATA_HOST}/{type}.json",
+            "content_type": "application/json",
+            "content_encoding": "gzip",
+        }
+
+    def _download(self, path: str) -> httpx.Response:
+        if not path.endswith(".json"):
+            return httpx.Response(404)
+        content = b"[\n" + b",\n".join(json.dumps(card).encode() for card in self.cards.values()) + b"\n]"
+        return httpx.Response(200, content=content, headers={"Content-Type": "application/json"})
+
+    def _image(self, request: httpx.Request) -> httpx.Response:
+        # 1KiB of made up image data, the same for every request of an image
+        digest = hashlib.sha256(request.url.path.encode()).digest()
+        content = digest * 32
+        headers = {"Content-Type": "image/jpeg", "Content-Length": str(len(content)), "ETag": f'"{digest.hex()[:16]}"'}
+        if request.method == "HEAD":
+            return httpx.Response(200, headers=headers)
+        return httpx.Response(200, content=content, headers=headers)
@@ -1,3 +1,65 @@
+import json
 import re
+from typing import Any
 
 UUID_CHECK = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", flags=re.I)
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayDecoder:
+    """
+    Incrementally decodes the items of a top-level JSON array of objects.
+
+    Text is fed in as it arrives, and every complete item is returned as soon as it can be decoded,
+    so the full document never has to be held in memory at once.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+
+    def feed(self, text: str) -> list[Any]:
+        """
+        Feed more text into the decoder.
+
+        Args:
+            text: The next chunk of the document
+
+        Returns:
+            list[Any]: All items completed by this chunk
+
+        """
+        buffer = self._buffer + text
+        items = []
+        pos = 0
+        end = len(buffer)
+        while pos < end and not self._finished:
+            char = buffer[pos]
+            if char in _WHITESPACE:
+                pos += 1
+            elif not self._started:
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                self._started = True
+                pos += 1
+            elif char == ",":
+                pos += 1
+            elif char == "]":
+                self._finished = True
+                pos += 1
+            else:
+                try:
+                    item, pos = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break
+                items.append(item)
+        self._buffer = buffer[pos:]
+        return items
+
+    def close(self) -> None:
+        """Ensure the whole array was decoded."""
+        if not self._finished or self._buffer.strip(_WHITESPACE):
+            raise ValueError("Incomplete or invalid JSON array")
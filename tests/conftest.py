@@ -0,0 +1,62 @@
+import inspect
+import json
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from scryfall import Scryfall
+from scryfall.client.ratelimit import TokenBucket
+from scryfall.client.retry import RetryPolicy
+from scryfall.testing import MockScryfall, make_cards
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def card_data() -> dict[str, Any]:
+    """Raw API data of Arcades, the Strategist (M19)"""
+    return json.loads((DATA_DIR / "card.json").read_text())
+
+
+@pytest.fixture
+def cards(card_data) -> list[dict[str, Any]]:
+    """400 distinct copies of `card_data`, in two sets"""
+    return make_cards(card_data, 400)
+
+
+@pytest.fixture
+def mock_scryfall(cards) -> MockScryfall:
+    """Mock Scryfall serving `cards`, whose 429s ask to retry right away"""
+    return MockScryfall(cards, retry_after=0)
+
+
+@pytest_asyncio.fixture
+async def make_client(mock_scryfall) -> AsyncIterator[Callable[..., Scryfall]]:
+    """
+    Factory of clients for `mock_scryfall` or another transport, without any waiting on rate limits or backoffs.
+
+    Keyword arguments are passed on to the client, and `RetryPolicy` arguments to its retry policy.
+    """
+    clients: list[Scryfall] = []
+
+    def make(transport: httpx.AsyncBaseTransport | None = None, **kwargs: Any) -> Scryfall:
+        policy = {k: kwargs.pop(k) for k in inspect.signature(RetryPolicy).parameters if k in kwargs}
+        client = Scryfall(
+            transport=transport if transport is not None else mock_scryfall,
+            **{
+                "rate_limiter": TokenBucket(rate=1000, burst=1000),
+                "image_rate_limiter": TokenBucket(rate=1000, burst=1000),
+                "retry_policy": RetryPolicy(**({"backoff": 0.001} | policy)),
+            }
+            | kwargs,
+        )
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        await client.close()
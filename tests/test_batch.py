@@ -0,0 +1,75 @@
+import asyncio
+from functools import partial
+
+import httpx
+import pytest
+
+from scryfall.client.batch import gather_requests
+from scryfall.client.error import NotFound
+
+
+@pytest.mark.asyncio
+async def test_gather_requests():
+    running = 0
+    peak = 0
+
+    async def call(x: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (x % 3))
+        running -= 1
+        if x == 5:
+            raise ValueError(x)
+        return x * 2
+
+    results = [r async for r in gather_requests((partial(call, x) for x in range(20)), concurrency=4, ordered=True)]
+    assert peak == 4
+    assert [r.index for r in results] == list(range(20))
+    assert [r.value for r in results if r.ok] == [x * 2 for x in range(20) if x != 5]
+    assert isinstance(results[5].error, ValueError)
+    with pytest.raises(ValueError):
+        results[5].result()
+
+    results = [r async for r in gather_requests((partial(call, x) for x in range(9)), concurrency=9)]
+    assert [r.index % 3 for r in results[:3]] == [0, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_gather_requests_stop_early():
+    started = []
+
+    async def call(x: int) -> int:
+        started.append(x)
+        await asyncio.sleep(0.01)
+        return x
+
+    batch = gather_requests((partial(call, x) for x in range(100)), concurrency=2)
+    async for _ in batch:
+        break
+    await batch.aclose()  # type: ignore
+    await asyncio.sleep(0.05)
+    assert len(started) <= 4
+
+
+@pytest.mark.asyncio
+async def test_client_map(make_client, card_data):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        if request.url.path.endswith("/404"):
+            return httpx.Response(404, json={"object": "error", "status": 404, "code": "not_found", "details": ""})
+        return httpx.Response(200, json=card_data | {"collector_number": request.url.path.split("/")[-1]})
+
+    client = make_client(httpx.MockTransport(handler))
+    assert client._default_concurrency() == 20
+    numbers = ["1", "2", "404", "3"]
+    results = [
+        r
+        async for r in client.map(client.get_card_by_set_code_and_collector_number, ["m19"] * 4, numbers, ordered=True)
+    ]
+    assert [r.item for r in results] == [("m19", x) for x in numbers]
+    assert [r.value.collector_number for r in results if r.ok] == ["1", "2", "3"]  # type: ignore
+    assert isinstance(results[2].error, NotFound)
+
+    results = [r async for r in client.map(client.get_card_by_id, [card_data["id"]])]
+    assert results[0].item == card_data["id"]
@@ -0,0 +1,27 @@
+import pytest
+
+from scryfall import Scryfall
+
+
+@pytest.mark.asyncio
+async def test_get_bulk_data():
+    client = Scryfall()
+
+    bulk_data = await client.get_bulk_data()
+    assert any(x.type == "default_cards" for x in bulk_data)
+
+    default_cards = await client.get_bulk_data_by_type("default_cards")
+    assert (await client.get_bulk_data_by_id(default_cards.id)).type == "default_cards"
+
+
+@pytest.mark.asyncio
+async def test_stream_bulk_data():
+    client = Scryfall()
+
+    rulings = []
+    async for ruling in client.stream_bulk_data("rulings"):
+        rulings.append(ruling)
+        if len(rulings) >= 10:
+            break
+
+    assert all(x["object"] == "ruling" for x in rulings)
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+
+from scryfall.client.cache import CacheBackend, CacheEntry, MemoryCache, ResponseCache
+from scryfall.client.error import NotFound, ScryfallError
+from scryfall.client.route import Route
+
+
+class FakeBackend(CacheBackend):
+    """Stand-in for an external cache backend, such as Redis."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, CacheEntry] = {}
+        self.ttls: dict[str, float] = {}
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        self.entries[key] = entry
+        self.ttls[key] = ttl
+
+    async def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self.entries.clear()
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_lru():
+    cache = MemoryCache(maxsize=2)
+    entry = CacheEntry(content=b"{}", expires_at=time.time() + 60)
+
+    await cache.set("a", entry, 60)
+    await cache.set("b", entry, 60)
+    assert await cache.get("a") is entry
+    await cache.set("c", entry, 60)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") is entry
+    assert await cache.get("c") is entry
+
+    await cache.set("d", entry, 0)
+    assert await cache.get("d") is None
+
+
+@pytest.mark.asyncio
+async def test_response_cache():
+    backend = FakeBackend()
+    cache = ResponseCache(backend, ttl=60, route_ttls={"/sets": 120})
+
+    route = Route("GET", "/cards/named")
+    key = cache.key(route, {"exact": "Arcades, the Strategist", "set": None})
+    assert key == cache.key(route, {"set": None, "exact": "Arcades, the Strategist"})
+
+    assert await cache.get(key) is None
+    await cache.set(key, route, b"{}")
+    assert await cache.get(key) == b"{}"
+    assert backend.ttls[key] == 60
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+    backend.entries[key].expires_at = time.time() - 1
+    assert await cache.get(key) is None
+
+    assert cache.get_ttl(Route("GET", "/sets/m19")) == 120
+    assert not cache.is_cacheable(Route("GET", "/cards/random"))
+    assert not cache.is_cacheable(Route("POST", "/cards/collection"))
+
+
+def expire(cache: ResponseCache, seconds: float) -> None:
+    for _, entry in cache.backend._entries.values():  # type: ignore
+        entry.expires_at = time.time() - seconds
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate(make_client, mock_scryfall, cards):
+    cache = ResponseCache(ttl=60, stale_while_revalidate=300)
+    client = make_client(cache=cache)
+    card_data = mock_scryfall.cards[cards[0]["id"]]
+    card_data["name"] = "Response 1"
+    card = await client.get_card_by_id(card_data["id"])
+    assert not card.stale
+
+    card_data["name"] = "Response 2"
+    expire(cache, 10)
+    card = await client.get_card_by_id(card_data["id"])
+    assert card.name == "Response 1"
+    assert card.stale
+    await asyncio.sleep(0.05)
+    assert len(mock_scryfall.requests) == 2
+    card = await client.get_card_by_id(card_data["id"])
+    assert card.name == "Response 2"
+    assert not card.stale
+
+    card_data["name"] = "Response 3"
+    expire(cache, 600)
+    card = await client.get_card_by_id(card_data["id"])
+    assert card.name == "Response 3"
+
+
+@pytest.mark.asyncio
+async def test_stale_if_error(make_client, mock_scryfall, cards):
+    cache = ResponseCache(ttl=60, stale_if_error=300)
+    client = make_client(cache=cache, model_mode="lazy", error_retries=0, rate_limit_retries=0)
+    card_data = mock_scryfall.cards[cards[0]["id"]]
+    card_data["name"] = "Response 1"
+    await client.get_card_by_id(card_data["id"])
+
+    card_data["name"] = "Response 2"
+    mock_scryfall.enqueue(503, 429, 404)
+    expire(cache, 10)
+    for _ in range(2):
+        card = await client.get_card_by_id(card_data["id"])
+        assert card.name == "Response 1"
+        assert card.stale
+        assert card.to_model().stale
+    with pytest.raises(NotFound):
+        await client.get_card_by_id(card_data["id"])
+    assert len(mock_scryfall.requests) == 4
+
+    expire(cache, 600)
+    mock_scryfall.enqueue(503)
+    with pytest.raises(ScryfallError):
+        await make_client(cache=cache, error_retries=0).get_card_by_id(card_data["id"])
@@ -85,3 +85,30 @@ async def test_card_set():
     card_set = await card.get_set()
 
     assert card_set.code == "m19"
+
+
+@pytest.mark.asyncio
+async def test_get_card_collection():
+    client = Scryfall()
+
+    with pytest.raises(ValueError):
+        _ = await client.get_card_collection([{"set": "m19"}])
+
+    identifiers = [{"id": test_card_uuid}, {"name": "Lightning Bolt"}, {"set": "m19", "collector_number": "212"}]
+    identifiers += [{"name": "Not A Real Card Name"}]
+    collection = await client.get_card_collection(identifiers * 30)
+
+    assert len(collection.data) == 90
+    assert len(collection.not_found) == 30
+    assert str(collection.data[0].id) == test_card_uuid
+    assert collection.data[1].name == "Lightning Bolt"
+    assert str(collection.data[2].id) == test_card_uuid
+
+
+@pytest.mark.asyncio
+async def test_iter_search_cards():
+    client = Scryfall()
+
+    cards = [card async for card in client.iter_search_cards(q="angel", limit=200)]
+    assert len(cards) == 200
+    assert len({card.id for card in cards}) == 200
@@ -0,0 +1,210 @@
+import asyncio
+import gc
+import uuid
+
+import httpx
+import pytest
+
+from scryfall import Scryfall
+from scryfall.client.cache import ResponseCache
+from scryfall.client.decoder import StdlibDecoder, get_decoder
+from scryfall.client.error import NotFound
+from scryfall.client.route import Route
+from scryfall.models.sets import Set
+
+
+@pytest.mark.asyncio
+async def test_client_transport(make_client, card_data):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=card_data)
+
+    client = make_client(
+        httpx.MockTransport(handler),
+        cache=ResponseCache(),
+        limits=httpx.Limits(max_connections=4, keepalive_expiry=60),
+        timeout=2.0,
+    )
+    card = await client.get_card_by_id(card_data["id"])
+    assert card.name == card_data["name"]
+    await client.get_card_by_id(card_data["id"])
+    assert len(requests) == 1
+    assert requests[0].url.path == f"/cards/{card_data['id']}"
+    assert requests[0].extensions["timeout"]["connect"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_client_http2():
+    pytest.importorskip("h2")
+    client = Scryfall(http2=True)
+    assert client._get_client()._transport._pool._http2  # type: ignore
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_conditional_requests(make_client, card_data):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json=card_data, headers={"ETag": '"v1"', "Last-Modified": "Sat, 01 Mar 2025 00:00:00 GMT"}
+        )
+
+    cache = ResponseCache()
+    client = make_client(httpx.MockTransport(handler), cache=cache)
+    await client.get_card_by_id(card_data["id"])
+
+    key = cache.key(Route("GET", f"/cards/{card_data['id']}"))
+    entry = await cache.lookup(key)
+    assert entry is not None
+    assert entry.etag == '"v1"'
+    entry.expires_at = 0
+
+    card = await client.get_card_by_id(card_data["id"])
+    assert card.name == card_data["name"]
+    assert len(requests) == 2
+    assert requests[1].headers["If-Modified-Since"] == "Sat, 01 Mar 2025 00:00:00 GMT"
+    assert (await cache.lookup(key)).fresh  # type: ignore
+
+    await client.get_card_by_id(card_data["id"])
+    assert len(requests) == 2
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_json_decoder(name):
+    if name != "json":
+        pytest.importorskip(name)
+    decoder = get_decoder(name)
+    assert decoder.name == name
+    assert decoder.loads(b'{"name": "\\u00c6ther Vial", "cmc": 1.0}') == {"name": "Æther Vial", "cmc": 1.0}
+    assert decoder.loads('[1, null, "a"]') == [1, None, "a"]
+
+
+@pytest.mark.asyncio
+async def test_client_json_decoder(make_client, card_data):
+    client = make_client(httpx.MockTransport(lambda _: httpx.Response(200, json=card_data)), json_decoder="json")
+    assert isinstance(client.json_decoder, StdlibDecoder)
+    card = await client.get_card_by_id(card_data["id"])
+    assert card.name == card_data["name"]
+
+    with pytest.raises(ValueError):
+        Scryfall(json_decoder="yaml")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_client_card_collection(make_client, mock_scryfall, cards):
+    client = make_client()
+    missing = {"id": str(uuid.uuid4())}
+    identifiers = [{"id": card["id"]} for card in cards[:160]]
+    identifiers.insert(80, missing)
+    collection = await client.get_card_collection(identifiers)
+    assert len(mock_scryfall.requests) == 3
+    assert [str(card.id) for card in collection.data] == [card["id"] for card in cards[:160]]
+    assert collection.not_found == [missing]
+
+
+@pytest.mark.asyncio
+async def test_client_iter_all(make_client, mock_scryfall, cards):
+    client = make_client()
+    page = await client.search_cards("e:m190")
+    assert [str(card.id) async for card in page.iter_all()] == [card["id"] for card in cards if card["set"] == "m190"]
+    assert len(mock_scryfall.requests) == 2
+
+    # Stopping early cancels the prefetch, and a prefetch that failed doesn't leave an unretrieved error
+    errors = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+    for latency in (0.05, 0):
+        page = await client.search_cards("e:m190")
+        mock_scryfall.latency = latency
+        mock_scryfall.enqueue(404)
+        iterator = page.iter_all()
+        await anext(iterator)
+        await asyncio.sleep(0.01)
+        await iterator.aclose()
+        assert not any(task.get_coro().__qualname__ == "APIList.get_next_page" for task in asyncio.all_tasks())
+    del iterator
+    gc.collect()
+    assert not errors
+
+
+@pytest.mark.asyncio
+async def test_client_iter_all_other_lists(make_client, mock_scryfall, cards):
+    sets = list(mock_scryfall.sets.values())
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", 1))
+        data = {"object": "list", "has_more": page == 1, "data": [sets[page - 1]]}
+        if page == 1:
+            data["next_page"] = "https://api.scryfall.com/sets?page=2"
+        return httpx.Response(200, json=data)
+
+    client = make_client(httpx.MockTransport(handler))
+    page = await client.get_all_sets()
+    assert [s.code async for s in page.iter_all()] == [s["code"] for s in sets]
+    assert isinstance((await page.get_next_page()).data[0], Set)
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_requests(make_client, mock_scryfall, cards):
+    mock_scryfall.latency = 0.05
+    client = make_client()
+    results = await asyncio.gather(*(client.get_card_by_id(cards[0]["id"]) for _ in range(5)))
+    assert {str(card.id) for card in results} == {cards[0]["id"]}
+    assert len(mock_scryfall.requests) == 1
+
+    # Requests that differ in their query string are sent separately, and so is every POST request
+    mock_scryfall.requests.clear()
+    await asyncio.gather(
+        client.search_cards_named(exact=cards[0]["name"]),
+        client.search_cards_named(exact=cards[1]["name"]),
+        client.search_cards_named(exact=cards[1]["name"]),
+        client.get_card_collection([{"id": cards[0]["id"]}]),
+        client.get_card_collection([{"id": cards[1]["id"]}]),
+        client.get_card_collection([{"id": cards[1]["id"]}]),
+    )
+    assert len(mock_scryfall.requests) == 5
+    assert not client._in_flight
+
+
+@pytest.mark.asyncio
+async def test_client_random_not_coalesced(make_client, mock_scryfall):
+    mock_scryfall.latency = 0.05
+    client = make_client()
+    results = await asyncio.gather(*(client.get_random_card() for _ in range(10)))
+    assert len(mock_scryfall.requests) == 10
+    assert len({card.id for card in results}) > 1
+    assert not client._in_flight
+
+
+@pytest.mark.asyncio
+async def test_client_coalesced_cancel(make_client, mock_scryfall, cards):
+    mock_scryfall.latency = 0.05
+    client = make_client()
+    first = asyncio.create_task(client.get_card_by_id(cards[0]["id"]))
+    others = [asyncio.create_task(client.get_card_by_id(cards[0]["id"])) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert [str((await task).id) for task in others] == [cards[0]["id"]] * 2
+    assert first.cancelled()
+    assert len(mock_scryfall.requests) == 1
+    assert not client._in_flight
+
+
+@pytest.mark.asyncio
+async def test_client_coalesced_error(make_client, mock_scryfall, cards):
+    mock_scryfall.latency = 0.05
+    mock_scryfall.enqueue(404)
+    client = make_client()
+    results = await asyncio.gather(*(client.get_card_by_id(cards[0]["id"]) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, NotFound) for result in results)
+    assert len(mock_scryfall.requests) == 1
+    assert not client._in_flight
+
+    # The failed request isn't remembered, so the next call is sent again
+    assert str((await client.get_card_by_id(cards[0]["id"])).id) == cards[0]["id"]
+    assert len(mock_scryfall.requests) == 2
@@ -0,0 +1,141 @@
+import asyncio
+import copy
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+import pytest
+
+from scryfall import SyncScryfall
+from scryfall.client.error import LibraryException
+from scryfall.client.images import image_files
+from scryfall.models.cards import Card
+from scryfall.testing import IMAGE_HOST
+
+
+@pytest.fixture
+def double_faced(card_data) -> dict[str, Any]:
+    card = copy.deepcopy(card_data)
+    card["id"] = str(uuid.uuid4())
+    uris = card.pop("image_uris")
+    illustration_id = card.pop("illustration_id")
+    card["card_faces"] = [
+        {"name": "Front", "illustration_id": illustration_id, "image_uris": uris},
+        {
+            "name": "Back",
+            "illustration_id": str(uuid.uuid4()),
+            "image_uris": {k: v.replace("/front/", "/back/") for k, v in uris.items()},
+        },
+    ]
+    return card
+
+
+def test_image_files(card_data, cards, double_faced, tmp_path):
+    cards = cards[:3]
+    files = list(image_files([*cards, double_faced, cards[0]], "png", tmp_path))
+    assert [f.path.name for f in files] == [
+        *(f"{card['id']}.png" for card in cards),
+        f"{double_faced['id']}-0.png",
+        f"{double_faced['id']}-1.png",
+    ]
+    assert "/back/" in files[-1].url
+
+    # Copies share the illustration of the template, and so does the front face
+    files = list(image_files([*cards, double_faced], "normal", tmp_path, dedupe=True))
+    assert [f.path.name for f in files] == [
+        f"{card_data['illustration_id']}.jpg",
+        f"{double_faced['card_faces'][1]['illustration_id']}.jpg",
+    ]
+    assert files[1].face == 1
+
+
+@pytest.mark.asyncio
+async def test_download_images(make_client, mock_scryfall, cards, double_faced, tmp_path):
+    cards = cards[:10]
+    client = make_client()
+    models = [client._build(Card, copy.deepcopy(card)) for card in cards[:5]]
+
+    results = [r async for r in client.download_images([*models, *cards[5:], double_faced], tmp_path)]
+    assert len(results) == 12
+    assert all(r.result() for r in results)
+    assert len(list(tmp_path.glob("*.jpg"))) == 12
+    assert not list(tmp_path.glob(".*.part"))
+    file = results[0].item
+    assert file.path.stat().st_size == 1024
+    assert file.etag_path.read_text().startswith('"')
+    image_request = next(r for r in mock_scryfall.requests if r.url.host == IMAGE_HOST)
+    assert image_request.headers["Accept"].startswith("image/")
+    assert "Content-Type" not in image_request.headers
+
+    # Files on disk are checked with a HEAD request, or trusted without verifying them
+    mock_scryfall.requests.clear()
+    file.path.write_bytes(b"truncated")
+    results = [r async for r in client.download_images(cards, tmp_path, ordered=True)]
+    assert [r.value for r in results] == [r.item == file for r in results]
+    assert sum(r.method == "HEAD" for r in mock_scryfall.requests) == 10
+    assert sum(r.method == "GET" for r in mock_scryfall.requests) == 1
+    assert file.path.stat().st_size == 1024
+
+    mock_scryfall.requests.clear()
+    results = [r async for r in client.download_images(cards, tmp_path, verify=False)]
+    assert not any(r.value for r in results)
+    assert not mock_scryfall.requests
+
+    with SyncScryfall(client=make_client()) as sync:
+        results = list(sync.download_images(cards, tmp_path / "dedupe", size="art_crop", dedupe=True))
+    assert [r.value for r in results] == [True]
+
+
+@pytest.mark.asyncio
+async def test_download_images_errors(make_client, cards, tmp_path):
+    cards = cards[:3]
+    attempts: dict[str, int] = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts[request.url.path] = attempts.get(request.url.path, 0) + 1
+        if cards[0]["id"] in request.url.path and attempts[request.url.path] == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        if cards[1]["id"] in request.url.path:
+            return httpx.Response(404)
+        return httpx.Response(200, content=b"image")
+
+    client = make_client(httpx.MockTransport(handler), backoff=0)
+    results = [r async for r in client.download_images(cards, tmp_path, size="small", ordered=True)]
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, LibraryException)
+    assert sorted(attempts.values()) == [1, 1, 2]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(f"{cards[i]['id']}.jpg" for i in (0, 2))
+
+    with pytest.raises(ValueError):
+        client.download_images(cards, tmp_path, size="huge")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_download_images_cancelled(make_client, cards, tmp_path):
+    started = asyncio.Event()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield b"new"
+        started.set()
+        await asyncio.sleep(10)
+        yield b"image"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"ETag": '"new"', "Content-Length": "8"}
+        return httpx.Response(200, headers=headers, content=b"" if request.method == "HEAD" else body())
+
+    client = make_client(httpx.MockTransport(handler))
+    (file,) = image_files(cards[:1], "normal", tmp_path)
+    file.path.write_bytes(b"old image")
+    file.etag_path.write_text('"old"')
+
+    # A download cancelled halfway leaves the image and its ETag as they were, and no partial file
+    task = asyncio.create_task(anext(client.download_images(cards[:1], tmp_path)))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert sorted(p.name for p in tmp_path.iterdir()) == [file.path.name, file.etag_path.name]
+    assert file.path.read_bytes() == b"old image"
+    assert file.etag_path.read_text() == '"old"'
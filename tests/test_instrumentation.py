@@ -0,0 +1,215 @@
+import asyncio
+
+import httpx
+import pytest
+
+from scryfall.client.cache import ResponseCache
+from scryfall.client.error import NotFound, ScryfallError
+from scryfall.client.instrumentation import Instrumentation, MetricsCollector, RequestInfo
+from scryfall.client.route import Route
+from scryfall.models.cards import Card
+
+
+class Recorder(Instrumentation):
+    def __init__(self) -> None:
+        self.events: list[tuple] = []
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        self.events.append(("start", info.route.path))
+
+    def on_rate_limit_wait(self, info: RequestInfo, seconds: float) -> None:
+        self.events.append(("wait",))
+
+    def on_response(self, info, response, seconds) -> None:
+        self.events.append(("response", response.status_code))
+
+    def on_retry(self, info: RequestInfo, reason: str, delay: float | None) -> None:
+        self.events.append(("retry", reason))
+
+    def on_request_end(self, info: RequestInfo, seconds: float, error: BaseException | None) -> None:
+        self.events.append(("end", info.attempts, info.cached, type(error).__name__ if error else None))
+
+    def on_parse_complete(self, model: type, seconds: float) -> None:
+        self.events.append(("parse", model))
+
+
+def test_route_template():
+    route = Route("GET", "/cards/{code}/{number}", code="m19", number="12★")
+    assert route.path == "/cards/{code}/{number}"
+    assert route.resolved_path == "/cards/m19/12%E2%98%85"
+    assert route.resolved_endpoint == "GET /cards/m19/12%E2%98%85"
+
+
+@pytest.mark.asyncio
+async def test_instrumentation_events(make_client, cards):
+    responses = iter([httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, json=cards[0])])
+    recorder = Recorder()
+    client = make_client(
+        httpx.MockTransport(lambda _: next(responses)), cache=ResponseCache(), instrumentation=[recorder]
+    )
+    await client.get_card_by_id(cards[0]["id"])
+    assert recorder.events == [
+        ("start", "/cards/{id}"),
+        ("wait",),
+        ("response", 429),
+        ("retry", "rate_limited"),
+        ("wait",),
+        ("response", 200),
+        ("end", 2, False, None),
+        ("parse", Card),
+    ]
+
+    recorder.events.clear()
+    await client.get_card_by_id(cards[0]["id"])
+    assert recorder.events == [("start", "/cards/{id}"), ("end", 0, True, None), ("parse", Card)]
+
+    client = make_client(instrumentation=[recorder])
+    with pytest.raises(NotFound):
+        await client.get_card_by_id("missing")
+    assert recorder.events[-1] == ("end", 1, False, "NotFound")
+
+
+@pytest.mark.asyncio
+async def test_metrics_collector(make_client, cards):
+    metrics = MetricsCollector()
+    client = make_client(cache=ResponseCache(), instrumentation=[metrics])
+    for card in cards[:3]:
+        await client.get_card_by_id(card["id"])
+    await client.get_card_by_id(cards[0]["id"])
+    await client.get_set_by_code(cards[0]["set"])
+
+    assert metrics.get("scryfall_requests_total") == 5
+    assert metrics.get("scryfall_requests_total", route="/cards/{id}") == 4
+    assert metrics.get("scryfall_responses_total", status=200) == 4
+    assert metrics.get("scryfall_cache_hits_total") == 1
+    assert metrics.get("scryfall_requests_in_flight") == 0
+
+    text = metrics.render()
+    assert "# TYPE scryfall_request_duration_seconds histogram" in text
+    assert 'scryfall_requests_total{method="GET",route="/cards/{id}"} 4' in text
+    assert 'scryfall_request_duration_seconds_bucket{method="GET",route="/sets/{code}",le="+Inf"} 1' in text
+    assert 'scryfall_parse_duration_seconds_count{model="Card"} 4' in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_retries_and_errors(make_client, mock_scryfall, cards):
+    metrics = MetricsCollector()
+    client = make_client(instrumentation=[metrics], error_retries=1)
+    mock_scryfall.enqueue(429, 503, 200)
+    await client.get_card_by_id(cards[0]["id"])
+    mock_scryfall.enqueue(503, 503)
+    with pytest.raises(ScryfallError):
+        await client.get_card_by_id(cards[1]["id"])
+    with pytest.raises(NotFound):
+        await client.get_card_by_id("missing")
+
+    lines = metrics.render().splitlines()
+    route = 'method="GET",route="/cards/{id}"'
+    for line in [
+        "# TYPE scryfall_retries_total counter",
+        f'scryfall_retries_total{{{route},reason="rate_limited"}} 1',
+        f'scryfall_retries_total{{{route},reason="server_error"}} 2',
+        f'scryfall_responses_total{{{route},status="200"}} 1',
+        f'scryfall_responses_total{{{route},status="429"}} 1',
+        f'scryfall_responses_total{{{route},status="503"}} 3',
+        f'scryfall_responses_total{{{route},status="404"}} 1',
+        "# TYPE scryfall_errors_total counter",
+        f'scryfall_errors_total{{{route},error="ScryfallError"}} 1',
+        f'scryfall_errors_total{{{route},error="NotFound"}} 1',
+        f"scryfall_requests_total{{{route}}} 3",
+        f"scryfall_requests_in_flight{{{route}}} 0",
+        f"scryfall_request_duration_seconds_count{{{route}}} 3",
+        f"scryfall_network_duration_seconds_count{{{route}}} 6",
+    ]:
+        assert line in lines
+    assert not any(line.startswith("scryfall_cache_hits_total") for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_opentelemetry(make_client, mock_scryfall, cards):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.trace import StatusCode
+
+    from scryfall.client.instrumentation import OpenTelemetryInstrumentation
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    client = make_client(instrumentation=[OpenTelemetryInstrumentation(provider.get_tracer("test"))])
+    await client.get_card_by_id(cards[0]["id"])
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["GET /cards/{id}"].attributes["http.response.status_code"] == 200
+    assert "parse Card" in spans
+
+    # A retried request, then a failed one
+    exporter.clear()
+    mock_scryfall.enqueue(503, 200)
+    await client.get_card_by_id(cards[1]["id"])
+    with pytest.raises(NotFound):
+        await client.get_card_by_id("missing")
+    retried, failed = [span for span in exporter.get_finished_spans() if span.name == "GET /cards/{id}"]
+    assert retried.attributes["http.request.resend_count"] == 1
+    assert retried.attributes["http.response.status_code"] == 200
+    assert [event.name for event in retried.events].count("retry") == 1
+    assert (
+        retried.events[[event.name for event in retried.events].index("retry")].attributes["reason"] == "server_error"
+    )
+    assert retried.status.status_code == StatusCode.UNSET
+    assert failed.attributes["http.response.status_code"] == 404
+    assert failed.status.status_code == StatusCode.ERROR
+    assert failed.status.description == "NotFound"
+    assert any(event.name == "exception" for event in failed.events)
+
+
+class SpanRecorder(Instrumentation):
+    """Keeps per-request state in `info.data`, like `OpenTelemetryInstrumentation`"""
+
+    def __init__(self) -> None:
+        self.ended: list[RequestInfo] = []
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        info.data["span"] = []
+
+    def on_rate_limit_wait(self, info: RequestInfo, seconds: float) -> None:
+        info.data["span"].append("wait")
+
+    def on_response(self, info, response, seconds) -> None:
+        info.data["span"].append(response.status_code)
+
+    def on_request_end(self, info: RequestInfo, seconds: float, error: BaseException | None) -> None:
+        info.data.pop("span")
+        self.ended.append(info)
+
+
+class Failing(Instrumentation):
+    def on_response(self, info, response, seconds) -> None:
+        raise RuntimeError("broken hook")
+
+
+@pytest.mark.asyncio
+async def test_instrumentation_cancelled_caller(make_client, mock_scryfall, cards):
+    mock_scryfall.latency = 0.05
+    metrics = MetricsCollector()
+    spans = SpanRecorder()
+    client = make_client(instrumentation=[metrics, spans, Failing()])
+    first = asyncio.create_task(client.get_card_by_id(cards[0]["id"]))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(client.get_card_by_id(cards[0]["id"]))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    # The shared request keeps going, without reporting to the cancelled caller that started it
+    assert str((await second).id) == cards[0]["id"]
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert [(info.ended, info.coalesced) for info in spans.ended] == [(True, False), (True, True)]
+    assert metrics.get("scryfall_requests_total") == 2
+    assert metrics.get("scryfall_coalesced_requests_total") == 1
+    assert metrics.get("scryfall_errors_total", error="CancelledError") == 1
+    assert metrics.get("scryfall_requests_in_flight") == 0
+
+    # A failing hook is logged instead of failing the request
+    assert str((await client.get_card_by_id(cards[1]["id"])).id) == cards[1]["id"]
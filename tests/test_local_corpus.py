@@ -0,0 +1,64 @@
+import uuid
+from datetime import date
+
+from scryfall import Scryfall
+from scryfall.local import CardCorpus
+from scryfall.local.corpus import _FlagsColumn
+from scryfall.models.cards import Card
+
+
+def test_corpus_round_trip(card_data):
+    client = Scryfall()
+    corpus = CardCorpus(client)
+    corpus.append(card_data)
+    corpus.append(Card(**card_data | {"id": str(uuid.uuid4()), "prices": {"usd": None}}, _client=client))
+    assert len(corpus) == 2
+
+    view = corpus[0]
+    assert view.name == card_data["name"]
+    assert view.id == uuid.UUID(card_data["id"])
+    assert view.released_at == date(2018, 7, 13)
+    assert view.legalities == card_data["legalities"]
+    assert view.prices == card_data["prices"]
+    assert str(view.image_uris["png"]) == card_data["image_uris"]["png"]
+    assert view.get_set.__self__ is view
+    assert view._client is client
+
+    card = view.to_card()
+    expected = Card(**card_data, _client=client)
+    for field in ("colors", "color_identity", "finishes", "games"):
+        assert sorted(getattr(card, field), key=str) == sorted(getattr(expected, field), key=str)
+    assert card.model_dump(exclude={"colors", "color_identity", "finishes", "games"}) == expected.model_dump(
+        exclude={"colors", "color_identity", "finishes", "games"}
+    )
+
+    assert corpus[1].prices["usd"] is None
+    assert corpus[-1] == corpus[1]
+
+
+def test_corpus_find(card_data):
+    corpus = CardCorpus()
+    corpus.extend(card_data | {"id": str(uuid.uuid4())} for _ in range(10))
+    corpus.append(card_data)
+
+    assert corpus.find(card_data["id"]) == corpus[10]
+    assert corpus.find(uuid.uuid4()) is None
+
+
+def test_corpus_many_formats(card_data):
+    # More formats than fit in one packed integer, and a new one showing up after the first cards
+    legalities = {f"format{i}": "legal" if i % 2 else "banned" for i in range(40)}
+    corpus = CardCorpus()
+    corpus.append(card_data | {"legalities": legalities})
+    corpus.append(card_data | {"id": str(uuid.uuid4()), "legalities": legalities | {"new": "restricted"}})
+    assert corpus[0].legalities == legalities
+    assert corpus[1].legalities == legalities | {"new": "restricted"}
+
+
+def test_corpus_flags_none():
+    options = tuple(f"option{i}" for i in range(16))
+    column = _FlagsColumn(options)
+    column.append(options, {})
+    column.append(None, {})
+    column.append([], {})
+    assert [column.get(i) for i in range(3)] == [list(options), None, []]
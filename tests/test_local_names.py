@@ -0,0 +1,85 @@
+import pytest
+
+from scryfall import Scryfall
+from scryfall.local import CardStore, NameIndex
+from scryfall.local.names import levenshtein, normalize
+
+NAMES = [
+    "Lightning Bolt",
+    "Lightning Helix",
+    "Chain Lightning",
+    "Austere Command",
+    "Delver of Secrets // Insectile Aberration",
+    "Jace, the Mind Sculptor",
+    "Lim-Dûl's Vault",
+    "Æther Vial",
+]
+
+
+def test_normalize():
+    assert normalize("  Lim-Dûl's   VAULT ") == "lim duls vault"
+    assert normalize("Æther Vial") == "aether vial"
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("kitten", "sitting", max_distance=1) == 2
+
+
+def test_autocomplete():
+    index = NameIndex(NAMES, extras=["Lightning Token"])
+    assert len(index) == 9
+    assert "lightning bolt" in index
+
+    catalog = index.autocomplete("light")
+    assert catalog.data == ["Lightning Bolt", "Lightning Helix", "Chain Lightning"]
+    assert catalog.total_values == 3
+    assert index.complete("light", include_extras=True)[:3] == ["Lightning Bolt", "Lightning Helix", "Lightning Token"]
+    assert index.complete("insect") == ["Delver of Secrets // Insectile Aberration"]
+    assert index.complete("aether") == ["Æther Vial"]
+    assert index.complete("l") == []
+    assert len(index.complete("li", limit=2)) == 2
+
+
+@pytest.mark.parametrize(
+    ("q", "expected"),
+    [
+        ("lightning bolt", "Lightning Bolt"),
+        ("aust com", "Austere Command"),
+        ("jace mind", "Jace, the Mind Sculptor"),
+        ("insectile", "Delver of Secrets // Insectile Aberration"),
+        ("lim dul's vault", "Lim-Dûl's Vault"),
+        ("ligtning helx", "Lightning Helix"),
+        ("lightning", None),
+        ("xyzzy", None),
+    ],
+)
+def test_fuzzy(q: str, expected: str | None):
+    assert NameIndex(NAMES).fuzzy(q) == expected
+
+
+def test_fuzzy_ambiguous():
+    # Every Lightning name starts with the query, which is also Lighten but for one letter
+    index = NameIndex([*NAMES, "Lighten"])
+    assert index.fuzzy("lightn") is None
+    assert index.fuzzy("lightn bo") == "Lightning Bolt"
+    assert index.fuzzy("lighen") == "Lighten"
+
+
+def test_fuzzy_normalizes_only_the_query(monkeypatch):
+    index = NameIndex(NAMES)
+    calls = []
+    monkeypatch.setattr("scryfall.local.names.normalize", lambda name: calls.append(name) or normalize(name))
+    assert index.fuzzy("aust com") == "Austere Command"
+    assert index.fuzzy("ligtning helx") == "Lightning Helix"
+    assert calls == ["aust com", "ligtning helx"]
+
+
+@pytest.mark.asyncio
+async def test_client_uses_name_index(card_data):
+    store = CardStore()
+    store.add_cards([card_data])
+    client = Scryfall(store=store, name_index=NameIndex([card_data["name"], *NAMES]))
+
+    catalog = await client.cards_autocomplete("arca")
+    assert catalog.data == [card_data["name"]]
+
+    card = await client.search_cards_named(fuzzy="arcades strat")
+    assert str(card.id) == card_data["id"]
@@ -0,0 +1,81 @@
+import uuid
+from datetime import date
+from typing import Any
+
+import pytest
+
+from scryfall.local import CardCorpus, CardQuery
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def corpus(card_data: dict[str, Any]) -> CardCorpus:
+    corpus = CardCorpus()
+    corpus.extend(
+        card_data
+        | {
+            "id": str(uuid.uuid4()),
+            "name": f"Card {i}",
+            "cmc": float(i),
+            "color_identity": ["W", "U", "B", "R", "G"][: i % 4],
+            "rarity": "common" if i % 2 else "rare",
+            "edhrec_rank": None if i == 3 else 100 - i,
+            "prices": card_data["prices"] | {"usd": None if i == 0 else f"{i}.00"},
+            "legalities": card_data["legalities"] | {"commander": "banned" if i == 5 else "legal"},
+        }
+        for i in range(8)
+    )
+    return corpus
+
+
+def test_query_filters(corpus, card_data):
+    query = CardQuery(corpus)
+    assert query.count() == 8
+    assert [x.name for x in query.where("cmc", "<=", 2)] == ["Card 0", "Card 1", "Card 2"]
+    assert query.where("rarity", "==", "rare").count() == 4
+    assert query.where("rarity", "in", ["rare", "mythic"]).where("cmc", ">=", 4).count() == 2
+    assert query.where("edhrec_rank", "!=", 99).count() == 6
+    assert query.where("prices.usd", ">=", 6).count() == 2
+    assert query.where("released_at", "==", date(2018, 7, 13)).count() == 8
+    assert query.legal("commander").count() == 7
+    assert query.legality("commander", "banned").all()[0].name == "Card 5"
+    assert query.legal("unknown").count() == 0
+    assert query.flags("color_identity", "subset", "WU").count() == 6
+    assert query.flags("color_identity", "superset", "WU").count() == 4
+    assert query.flags("color_identity", "exact", "").count() == 2
+
+    corpus.append(card_data | {"id": str(uuid.uuid4()), "legalities": {f"format{i}": "legal" for i in range(30)}})
+    assert query.legal("format29").count() == 1
+    assert query.legal("commander").count() == 7
+
+
+def test_query_order(corpus):
+    query = CardQuery(corpus).order_by("edhrec_rank")
+    assert [x.name for x in query.limit(3)] == ["Card 7", "Card 6", "Card 5"]
+    assert query.all()[-1].name == "Card 3"
+    assert [x.name for x in CardQuery(corpus).order_by("prices.usd", descending=True).limit(2)] == ["Card 7", "Card 6"]
+    assert CardQuery(corpus).order_by("name", descending=True).all()[0].name == "Card 7"
+    assert [x.name for x in CardQuery(corpus).order_by("rarity").order_by("cmc", descending=True).limit(2)] == [
+        "Card 7",
+        "Card 5",
+    ]
+
+
+def test_query_order_numeric_strings(card_data):
+    corpus = CardCorpus()
+    corpus.extend(
+        card_data | {"id": str(uuid.uuid4()), "name": f"Card {power}", "power": power}
+        for power in ("2", "10", "*", "1", "3", None, "1.5")
+    )
+    query = CardQuery(corpus)
+    assert [x.power for x in query.order_by("power")] == ["1", "1.5", "2", "3", "10", "*", None]
+    assert [x.power for x in query.where("power", ">=", 2).order_by("power", descending=True)] == ["10", "3", "2"]
+    assert [x.name for x in query.order_by("name")][:3] == ["Card *", "Card 1", "Card 1.5"]
+
+
+def test_query_cache_invalidation(corpus, card_data):
+    query = CardQuery(corpus).where("cmc", ">=", 7)
+    assert query.count() == 1
+    corpus.append(card_data | {"id": str(uuid.uuid4()), "cmc": 9.0})
+    assert query.count() == 2
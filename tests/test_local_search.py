@@ -0,0 +1,148 @@
+import uuid
+from typing import Any
+
+import pytest
+
+from scryfall.local import CardCorpus
+from scryfall.local.search import compile_search, search
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def corpus(card_data: dict[str, Any]) -> CardCorpus:
+    bolt = {
+        "name": "Lightning Bolt",
+        "type_line": "Instant",
+        "oracle_text": "Lightning Bolt deals 3 damage to any target.",
+        "colors": ["R"],
+        "color_identity": ["R"],
+        "cmc": 1.0,
+        "rarity": "common",
+        "power": None,
+        "toughness": None,
+        "keywords": [],
+        "oracle_id": str(uuid.uuid4()),
+    }
+    delver = {
+        "name": "Delver of Secrets // Insectile Aberration",
+        "type_line": "Creature — Human Wizard // Creature — Human Insect",
+        "layout": "transform",
+        "oracle_text": None,
+        "colors": None,
+        "color_identity": ["U"],
+        "cmc": 1.0,
+        "rarity": "common",
+        "power": None,
+        "toughness": None,
+        "keywords": ["Flying"],
+        "image_uris": None,
+        "oracle_id": str(uuid.uuid4()),
+        "card_faces": [
+            {"object": "card_face", "name": "Delver of Secrets", "mana_cost": "{U}", "colors": ["U"], "power": "1"},
+            {"object": "card_face", "name": "Insectile Aberration", "mana_cost": "", "colors": ["U"], "power": "3"},
+        ],
+    }
+    corpus = CardCorpus()
+    corpus.extend(
+        card_data | {"id": str(uuid.uuid4())} | changes
+        for changes in (
+            {},
+            bolt | {"set": "lea", "released_at": "1993-08-05"},
+            bolt | {"set": "m10", "released_at": "2009-07-17", "rarity": "uncommon"},
+            delver,
+            {"name": "Arcades Token", "layout": "token", "oracle_id": str(uuid.uuid4())},
+            {"lang": "fr"},
+        )
+    )
+    return corpus
+
+
+@pytest.mark.parametrize(
+    ("q", "expected"),
+    [
+        ("bolt", ["Lightning Bolt"]),
+        ("t:instant", ["Lightning Bolt"]),
+        ("o:damage -t:instant", ["Arcades, the Strategist"]),
+        ("o:/^flying,/", ["Arcades, the Strategist"]),
+        ("c:u", ["Arcades, the Strategist", "Delver of Secrets // Insectile Aberration"]),
+        ("c=u", ["Delver of Secrets // Insectile Aberration"]),
+        ("id<=simic", ["Delver of Secrets // Insectile Aberration"]),
+        ("c:m or c:r", ["Arcades, the Strategist", "Lightning Bolt"]),
+        ("mv<=1 pow>=3", ["Delver of Secrets // Insectile Aberration"]),
+        ("r>=uncommon", ["Arcades, the Strategist", "Lightning Bolt"]),
+        ('!"lightning bolt"', ["Lightning Bolt"]),
+        ("!delver", []),
+        ("-(t:creature or kw:flying)", ["Lightning Bolt"]),
+        ("f:commander is:dfc", ["Delver of Secrets // Insectile Aberration"]),
+        ("s:LEA", ["Lightning Bolt"]),
+        ("lang:fr", ["Arcades, the Strategist"]),
+        ("token include:extras", ["Arcades Token"]),
+        ("bolt or order:cmc", ["Lightning Bolt"]),
+        ("(order:cmc or dir:desc) or -unique:prints bolt", ["Lightning Bolt", "Lightning Bolt"]),
+        (
+            "order:cmc or dir:desc",
+            ["Arcades, the Strategist", "Delver of Secrets // Insectile Aberration", "Lightning Bolt"],
+        ),
+    ],
+)
+def test_search(corpus: CardCorpus, q: str, expected: list[str]):
+    assert [x.name for x in search(corpus, q)] == expected
+
+
+def test_search_unique_and_order(corpus: CardCorpus):
+    assert [x.set for x in search(corpus, "bolt")] == ["m10"]
+    assert [x.set for x in search(corpus, "bolt", unique="prints")] == ["m10", "lea"]
+    assert [x.set for x in search(corpus, "bolt unique:prints order:released dir:asc")] == ["lea", "m10"]
+    assert [x.set for x in search(corpus, "bolt unique:prints order:rarity")] == ["m10", "lea"]
+    assert [x.name for x in search(corpus, "mv<=4", order="cmc", dir="desc", limit=1)] == ["Arcades, the Strategist"]
+
+    plan = compile_search("t:creature", order="name")
+    assert plan.query(corpus).count() == 2
+    assert [x.name for x in plan.execute(corpus)] == [
+        "Arcades, the Strategist",
+        "Delver of Secrets // Insectile Aberration",
+    ]
+
+
+@pytest.mark.parametrize("q", ["(t:elf", "t:elf)", "foo:bar", "c:xyz", "mv:abc", "order:foo", "is:unknown", "t<elf"])
+def test_search_invalid(q: str):
+    with pytest.raises(ValueError):
+        compile_search(q)
+
+
+def test_search_faces_with_images(card_data: dict[str, Any]):
+    # Face image URIs embed the card's ID, which the corpus swaps for a placeholder in the shared card_faces template
+    id = str(uuid.uuid4())
+    faces = [
+        {"name": "Huntmaster of the Fells", "oracle_text": "Trample", "colors": ["G"], "power": "2", "side": "front"},
+        {"name": "Ravager of the Fells", "oracle_text": "Trample", "colors": ["R"], "power": "4", "side": "back"},
+    ]
+    corpus = CardCorpus()
+    corpus.extend(
+        [
+            card_data | {"id": str(uuid.uuid4())},
+            card_data
+            | {
+                "id": id,
+                "oracle_id": str(uuid.uuid4()),
+                "name": "Huntmaster of the Fells // Ravager of the Fells",
+                "layout": "transform",
+                "oracle_text": None,
+                "colors": None,
+                "power": None,
+                "image_uris": None,
+                "card_faces": [
+                    {k: v for k, v in face.items() if k != "side"}
+                    | {"image_uris": {"normal": f"https://cards.scryfall.io/normal/{face['side']}/{id[0]}/{id}.jpg"}}
+                    for face in faces
+                ],
+            },
+        ]
+    )
+    huntmaster = ["Huntmaster of the Fells // Ravager of the Fells"]
+    assert [x.name for x in search(corpus, "o:trample")] == huntmaster
+    assert [x.name for x in search(corpus, "c:r")] == huntmaster
+    assert [x.name for x in search(corpus, "pow>=4")] == huntmaster
+    assert [x.name for x in search(corpus, "t:creature")] == ["Arcades, the Strategist", *huntmaster]
+    assert id in corpus[1].to_dict()["card_faces"][1]["image_uris"]["normal"]
@@ -0,0 +1,45 @@
+import pytest
+
+from scryfall.local import CardStore
+from scryfall.testing import MockScryfall
+
+
+def test_store_lookups(card_data):
+    store = CardStore()
+    assert store.add_cards([card_data]) == 1
+
+    assert store.get_by_id(card_data["id"])["name"] == card_data["name"]
+    assert store.get_by_oracle_id(card_data["oracle_id"]) is not None
+    assert store.get_by_arena_id(card_data["arena_id"]) is not None
+    assert store.get_by_mtgo_id(card_data["mtgo_foil_id"]) is not None
+    assert store.get_by_tcgplayer_id(card_data["tcgplayer_id"]) is not None
+    assert store.get_by_cardmarket_id(card_data["cardmarket_id"]) is not None
+    assert store.get_by_multiverse_id(card_data["multiverse_ids"][0]) is not None
+    assert store.get_by_set_code_and_collector_number("M19", "212") is not None
+    assert store.get_by_set_code_and_collector_number("m19", "212", lang="de") is None
+    assert store.get_by_name("arcades,  THE strategist", set="m19") is not None
+    assert store.get_by_name("arcades, the strategist", set="dom") is None
+
+    assert store.remove_cards([card_data["id"]]) == 1
+    assert len(store) == 0
+    assert store.get_by_multiverse_id(card_data["multiverse_ids"][0]) is None
+
+
+@pytest.mark.asyncio
+async def test_client_uses_store(card_data, cards, make_client):
+    store = CardStore()
+    store.add_cards([card_data])
+    # The mock only serves other cards, so the stored card can't come from it
+    transport = MockScryfall(cards[:2])
+    client = make_client(transport, store=store)
+
+    card = await client.get_card_by_id(card_data["id"])
+    assert card.name == card_data["name"]
+    card = await client.search_cards_named(exact=card_data["name"])
+    assert str(card.id) == card_data["id"]
+    assert not transport.requests
+
+    # Cards missing from the store are requested
+    card = await client.get_card_by_id(cards[0]["id"])
+    assert card.name == cards[0]["name"]
+    assert [request.url.path for request in transport.requests] == [f"/cards/{cards[0]['id']}"]
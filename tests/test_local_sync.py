@@ -0,0 +1,99 @@
+import sqlite3
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from scryfall.local import CardChange, CardStore, sync_bulk_data
+from scryfall.models.bulk import BulkData
+
+
+class FakeClient:
+    """Stand-in for `Scryfall`, serving a bulk data file from memory."""
+
+    def __init__(self, cards: list[dict[str, Any]]) -> None:
+        self.cards = cards
+        self.updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.downloads = 0
+
+    async def get_bulk_data_by_type(self, type: str) -> BulkData:
+        return BulkData(
+            id=uuid.uuid4(),
+            uri="https://api.scryfall.com/bulk-data/default-cards",
+            type=type,
+            name="Default Cards",
+            description="",
+            download_uri="https://data.scryfall.io/default-cards.json",
+            updated_at=self.updated_at,
+            size=0,
+            content_type="application/json",
+            content_encoding="gzip",
+        )
+
+    async def stream_bulk_data(self, type: str) -> AsyncIterator[dict[str, Any]]:
+        self.downloads += 1
+        for card in self.cards:
+            yield card
+
+
+@pytest.mark.asyncio
+async def test_sync(card_data):
+    cards = [card_data | {"id": str(uuid.uuid4()), "collector_number": str(i)} for i in range(5)]
+    client = FakeClient(cards)
+    store = CardStore()
+
+    result = await sync_bulk_data(client, store, batch_size=2)  # type: ignore
+    assert (result.inserted, result.updated, result.deleted, result.unchanged) == (5, 0, 0, 0)
+    assert len(store) == 5
+
+    result = await sync_bulk_data(client, store)  # type: ignore
+    assert result.skipped
+    assert client.downloads == 1
+
+    client.updated_at = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    client.cards = [*cards[1:4], cards[4] | {"name": "Renamed"}, card_data | {"id": str(uuid.uuid4())}]
+    client.cards[0] = client.cards[0] | {"prices": {"usd": "99.00"}}
+    changes: list[CardChange] = []
+
+    async def on_change(change: CardChange) -> None:
+        assert change.type == "delete" or store.get_by_id(change.id) is not None
+        changes.append(change)
+
+    result = await sync_bulk_data(client, store, on_change=on_change, ignore=["prices"])  # type: ignore
+    assert (result.inserted, result.updated, result.deleted, result.unchanged) == (1, 4, 1, 0)
+    assert sorted(x.type for x in changes) == ["delete", "insert", "update", "update", "update", "update"]
+    assert store.get_by_id(cards[0]["id"]) is None
+    assert store.get_by_id(cards[4]["id"])["name"] == "Renamed"
+
+    # The first sync with `ignore` rewrites every card once, after that price changes are skipped
+    client.updated_at = datetime(2025, 1, 3, tzinfo=timezone.utc)
+    client.cards[1] = client.cards[1] | {"prices": {"usd": "1.00"}}
+    result = await sync_bulk_data(client, store, ignore=["prices"], collect=True)  # type: ignore
+    assert (result.inserted, result.updated, result.deleted, result.unchanged) == (0, 0, 0, 5)
+    assert result.changes == []
+
+
+def test_store_migration(tmp_path, card_data):
+    path = tmp_path / "cards.db"
+    db = sqlite3.connect(path)
+    db.executescript(
+        """
+        CREATE TABLE cards (
+            id TEXT PRIMARY KEY, oracle_id TEXT, arena_id INTEGER, mtgo_id INTEGER, mtgo_foil_id INTEGER,
+            tcgplayer_id INTEGER, tcgplayer_etched_id INTEGER, cardmarket_id INTEGER, set_code TEXT,
+            collector_number TEXT, lang TEXT, released_at TEXT, data TEXT NOT NULL
+        );
+        INSERT INTO cards (id, data) VALUES ('a', '{}');
+        """
+    )
+    db.close()
+
+    store = CardStore(path)
+    assert store.get_hashes() == {"a": None}
+    store.add_cards([card_data])
+    assert store.get_hashes()[card_data["id"]] is not None
+    store.set_metadata("key", "value")
+    assert store.get_metadata("key") == "value"
+    store.close()
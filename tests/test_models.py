@@ -0,0 +1,65 @@
+from uuid import UUID
+
+import pytest
+from pydantic import ValidationError
+
+from scryfall import Scryfall
+from scryfall.models.api import APIList
+from scryfall.models.cards import Card
+from scryfall.models.enums import Color
+from scryfall.models.lazy import LazyModel
+
+
+def test_lazy_model(card_data):
+    client = Scryfall()
+    card = LazyModel(Card, card_data, client)
+
+    assert card.name == card_data["name"]
+    assert card.id == UUID(card_data["id"])
+    assert Color.Green in card.color_identity
+    assert card.card_faces is None
+    assert card.get_set.__self__ is card
+    assert card.to_model() == Card(**card_data, _client=client)
+
+    with pytest.raises(AttributeError):
+        _ = card.not_a_field
+
+
+@pytest.mark.parametrize("mode", ["validated", "lazy", "raw"])
+def test_model_modes(card_data, mode):
+    client = Scryfall(model_mode=mode)
+
+    card = client._build(Card, dict(card_data))
+    assert card.name == card_data["name"]
+    assert card._client is client
+
+    cards = client._build(APIList, {"object": "list", "has_more": False, "data": [dict(card_data)]})
+    assert cards.data[0].name == card_data["name"]
+    assert cards.data[0]._client is client
+
+
+def test_invalid_model_mode():
+    with pytest.raises(ValueError):
+        Scryfall(model_mode="fast")  # type: ignore
+
+
+def test_api_list_parsing(card_data):
+    client = Scryfall()
+    ruling = {
+        "object": "ruling",
+        "oracle_id": card_data["oracle_id"],
+        "source": "wotc",
+        "published_at": "2018-07-13",
+        "comment": "A ruling.",
+    }
+
+    items = APIList(object="list", has_more=False, data=[dict(card_data), ruling], _client=client)
+    assert isinstance(items.data[0], Card)
+    assert items.data[0]._client is client
+    assert items.data[1].comment == "A ruling."
+
+    cards = APIList[Card](object="list", has_more=False, data=[dict(card_data)], _client=client)
+    assert isinstance(cards.data[0], Card)
+
+    with pytest.raises(ValidationError):
+        APIList(object="list", has_more=False, data=[{"object": "unknown"}], _client=client)
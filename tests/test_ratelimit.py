@@ -0,0 +1,139 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from scryfall.client.ratelimit import FileRateLimiter, RedisRateLimiter, TokenBucket, parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("invalid") is None
+    assert parse_retry_after("3") == 3
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_rate():
+    limiter = TokenBucket(rate=100, burst=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        await limiter.wait()
+    assert time.monotonic() - start < 0.01
+
+    for _ in range(10):
+        await limiter.wait()
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_fifo():
+    limiter = TokenBucket(rate=200, burst=1)
+    order = []
+
+    async def waiter(i: int) -> None:
+        await limiter.wait()
+        order.append(i)
+
+    await asyncio.gather(*(waiter(i) for i in range(20)))
+    assert order == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_rate_limited():
+    limiter = TokenBucket(rate=100, burst=10, adaptive=True)
+
+    await limiter.on_rate_limited(0.1)
+    assert limiter.rate == 50
+
+    start = time.monotonic()
+    await limiter.wait()
+    await limiter.wait()
+    assert time.monotonic() - start >= 0.11
+
+    for _ in range(2000):
+        await limiter.on_success()
+    assert limiter.rate == 100
+
+
+class FakeRedis:
+    """Stand-in for a Redis server, implementing the commands used by RedisRateLimiter."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+        self.expires: dict[str, float] = {}
+
+    def _expire(self, name: str) -> None:
+        if name in self.expires and self.expires[name] <= time.time():
+            self.values.pop(name, None)
+            self.expires.pop(name, None)
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        self._expire(name)
+        self.values[name] = self.values.get(name, 0) + amount
+        return self.values[name]
+
+    async def pexpire(self, name: str, time_: int) -> bool:
+        self.expires[name] = time.time() + time_ / 1000
+        return True
+
+    async def pttl(self, name: str) -> int:
+        self._expire(name)
+        if name not in self.values:
+            return -2
+        return int((self.expires[name] - time.time()) * 1000)
+
+    async def set(self, name: str, value: int, px: int | None = None) -> bool:
+        self.values[name] = value
+        if px is not None:
+            self.expires[name] = time.time() + px / 1000
+        return True
+
+
+@pytest.mark.asyncio
+async def test_file_rate_limiter_shared(tmp_path):
+    path = tmp_path / "ratelimit"
+    limiters = [FileRateLimiter(path, rate=100, burst=2) for _ in range(4)]
+
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.wait() for limiter in limiters for _ in range(3)))
+    # 12 requests shared by every limiter, 2 of them in the initial burst
+    assert time.monotonic() - start >= 0.09
+
+    await limiters[0].on_rate_limited(0.1)
+    start = time.monotonic()
+    await limiters[1].wait()
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_redis_rate_limiter_shared():
+    redis = FakeRedis()
+    limiters = [RedisRateLimiter(redis, rate=100) for _ in range(4)]  # type: ignore
+
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.wait() for limiter in limiters for _ in range(3)))
+    assert time.monotonic() - start >= 0.1
+
+    await limiters[0].on_rate_limited(0.1)
+    start = time.monotonic()
+    await limiters[1].wait()
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_redis_rate_limiter_concurrent_waiters():
+    redis = FakeRedis()
+    limiter = RedisRateLimiter(redis, rate=10)  # type: ignore
+    await limiter.wait()
+
+    waiters = [asyncio.create_task(limiter.wait()) for _ in range(3)]
+    await asyncio.sleep(0.02)
+    # Every waiter claimed its slot, and sleeps until it starts without holding up the others
+    assert len(redis.values) == 4
+    assert not limiter._lock.locked()
+    await asyncio.gather(*waiters)
@@ -0,0 +1,107 @@
+import httpx
+import pytest
+
+from scryfall.client.error import CircuitOpenError, HTTPException, ScryfallError
+from scryfall.client.retry import CircuitBreaker, RetryBudget, RetryPolicy
+
+
+def test_retry_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=5)
+    assert all(0 <= policy.get_delay(1) <= 1 for _ in range(100))
+    assert all(0 <= policy.get_delay(3) <= 4 for _ in range(100))
+    assert all(policy.get_delay(10) <= 5 for _ in range(100))
+    assert policy.get_delay(1, retry_after=3) == 3
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    assert budget.try_retry()
+    assert not budget.try_retry()
+    for _ in range(4):
+        budget.record_request()
+    assert budget.try_retry()
+    assert budget.try_retry()
+    assert not budget.try_retry()
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    breaker.check()
+    breaker.record_failure()
+    breaker.reset_timeout = 60
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_errors(make_client, mock_scryfall, cards):
+    client = make_client()
+    mock_scryfall.enqueue(httpx.ConnectError("reset"), httpx.ReadTimeout("slow"))
+    card = await client.get_card_by_id(cards[0]["id"])
+    assert card.name == cards[0]["name"]
+    assert len(mock_scryfall.requests) == 3
+
+    mock_scryfall.requests.clear()
+    mock_scryfall.enqueue(*[httpx.ConnectError("reset")] * 3)
+    with pytest.raises(httpx.ConnectError):
+        await client.get_card_by_id(cards[0]["id"])
+    assert len(mock_scryfall.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_separate_budgets(make_client, mock_scryfall, cards):
+    # Errors that aren't JSON, such as the HTML pages of a proxy, are retried too
+    mock_scryfall.enqueue(429, 503, 429, httpx.Response(502, text="<html>Bad gateway</html>"), 429)
+    await make_client().get_card_by_id(cards[0]["id"])
+    assert len(mock_scryfall.requests) == 6
+
+    mock_scryfall.requests.clear()
+    mock_scryfall.enqueue(503, 503, 503)
+    with pytest.raises(ScryfallError) as e:
+        await make_client(error_retries=2).get_card_by_id(cards[0]["id"])
+    assert e.value.status == 503
+    assert len(mock_scryfall.requests) == 3
+
+    mock_scryfall.requests.clear()
+    mock_scryfall.enqueue(429, 429)
+    with pytest.raises(HTTPException):
+        await make_client(rate_limit_retries=1).get_card_by_id(cards[0]["id"])
+    assert len(mock_scryfall.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_exhausted(make_client, mock_scryfall, cards):
+    client = make_client(budget=RetryBudget(ratio=0, min_retries=1))
+    mock_scryfall.enqueue(*[503] * 10)
+    with pytest.raises(ScryfallError):
+        await client.get_card_by_id(cards[0]["id"])
+    assert len(mock_scryfall.requests) == 2
+    with pytest.raises(ScryfallError):
+        await client.get_card_by_id(cards[0]["id"])
+    assert len(mock_scryfall.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_circuit_breaker(make_client, mock_scryfall, cards):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    client = make_client(circuit_breaker=breaker)
+    mock_scryfall.enqueue(503, 503, 503)
+    with pytest.raises(ScryfallError):
+        await client.get_card_by_id(cards[0]["id"])
+    assert len(mock_scryfall.requests) == 3
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        await client.get_card_by_id(cards[0]["id"])
+    assert len(mock_scryfall.requests) == 3
+
+    breaker.reset_timeout = 0
+    card = await client.get_card_by_id(cards[0]["id"])
+    assert card.name == cards[0]["name"]
+    assert breaker.state == "closed"
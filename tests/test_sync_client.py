@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from scryfall import Scryfall, SyncScryfall
+from scryfall.client.error import NotFound
+from scryfall.client.ratelimit import TokenBucket
+
+
+@pytest.fixture
+def sync_client(card_data):
+    threads: set[int] = set()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        threads.add(threading.get_ident())
+        if request.url.path == "/cards/search":
+            page = int(request.url.params.get("page", 1))
+            data = {"object": "list", "data": [card_data] * 2, "has_more": page < 3}
+            if page < 3:
+                data["next_page"] = f"https://api.scryfall.com/cards/search?q=a&page={page + 1}"
+            return httpx.Response(200, json=data)
+        if request.url.path.endswith("/404"):
+            return httpx.Response(404, json={"object": "error", "status": 404, "code": "not_found", "details": ""})
+        return httpx.Response(200, json=card_data)
+
+    client = SyncScryfall(transport=httpx.MockTransport(handler), rate_limiter=TokenBucket(rate=1000, burst=1000))
+    client.threads = threads  # type: ignore
+    yield client
+    client.close()
+
+
+def test_sync_client(sync_client, card_data):
+    card = sync_client.get_card_by_id(card_data["id"])
+    assert card.name == card_data["name"]
+    assert sync_client.run(sync_client.client.get_card_by_id(card_data["id"])) == card
+    with pytest.raises(NotFound):
+        sync_client.get_card_by_set_code_and_collector_number("m19", "404")
+
+    cards = list(sync_client.iter_search_cards("a"))
+    assert len(cards) == 6
+    iterator = sync_client.iter_search_cards("a")
+    assert next(iterator).name == card_data["name"]
+    iterator.close()
+
+    results = list(
+        sync_client.map(
+            sync_client.get_card_by_set_code_and_collector_number, ["m19"] * 3, ["1", "404", "2"], ordered=True
+        )
+    )
+    assert [r.ok for r in results] == [True, False, True]
+
+
+def test_sync_client_threads(sync_client, card_data):
+    with ThreadPoolExecutor(8) as pool:
+        cards = list(pool.map(lambda _: sync_client.get_card_by_id(card_data["id"]), range(32)))
+    assert all(card.name == card_data["name"] for card in cards)
+    # Every request went through the one event loop thread, and so the one connection pool
+    assert sync_client.threads == {sync_client._thread.ident}
+
+
+def test_sync_client_close():
+    client = Scryfall()
+    with SyncScryfall(client) as sync_client:
+        assert sync_client.client is client
+    assert not sync_client._thread.is_alive()
+    sync_client.close()
+    with pytest.raises(RuntimeError):
+        sync_client.get_card_by_id("id")
@@ -0,0 +1,44 @@
+import pytest
+
+from scryfall.client.error import NotFound
+from scryfall.testing import MockScryfall, make_cards
+
+
+@pytest.mark.asyncio
+async def test_mock_scryfall(make_client, cards):
+    client = make_client()
+    card = cards[260]
+    assert (await client.get_card_by_id(card["id"])).name == card["name"]
+    assert str((await client.get_card_by_set_code_and_collector_number(card["set"], "11")).id) == card["id"]
+    assert str((await client.search_cards_named(exact=card["name"])).id) == card["id"]
+    with pytest.raises(NotFound):
+        await client.search_cards_named(exact="Missing")
+
+    assert len([x async for x in client.iter_search_cards("a")]) == 400
+    set = await client.get_set_by_code(card["set"])
+    assert set.card_count == 150
+    assert len((await set.get_cards()).data) == 150
+    assert len([x async for x in client.stream_bulk_cards()]) == 400
+
+
+@pytest.mark.asyncio
+async def test_mock_scryfall_faults(make_client, cards):
+    transport = MockScryfall(cards, rate_limit_rate=0.3, error_rate=0.3, retry_after=0, seed=1)
+    client = make_client(transport, rate_limit_retries=0, error_retries=0)
+    results = [r async for r in client.map(client.get_card_by_id, [card["id"] for card in cards[:50]])]
+    assert transport.statuses[429] > 0
+    assert transport.statuses[503] > 0
+    assert sum(r.ok for r in results) == transport.statuses[200]
+    assert len(transport.requests) == 50
+
+
+def test_make_cards_vary(card_data):
+    cards = make_cards(card_data, 3, vary=True)
+    assert len({card["id"] for card in cards}) == 3
+    assert len({card["oracle_id"] for card in cards}) == 3
+    for card in cards:
+        assert card["id"] in card["image_uris"]["normal"]
+        assert card["oracle_id"] in card["prints_search_uri"]
+        assert f"multiverseid={card['multiverse_ids'][0]}" in card["related_uris"]["gatherer"]
+    assert len({card["image_uris"]["png"].split("?")[1] for card in cards}) == 3
+    assert make_cards(card_data, 3, vary=True) == cards